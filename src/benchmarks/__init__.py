@@ -0,0 +1,12 @@
+"""
+
+File: benchmarks/__init__.py
+
+Description: Offline benchmarks and performance checks for the Gameplay Database bot.
+
+Each module of this package can be run from the `src/` directory with
+`python -m benchmarks.<module>` and never needs a Discord token or network access.
+
+Author: cobalt
+
+"""
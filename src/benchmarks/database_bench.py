@@ -0,0 +1,173 @@
+"""
+
+File: database_bench.py
+
+Description: Reproducible benchmark of `database.py` and `utilities/recovery.py` on synthetic data.
+
+For each requested scale, a temporary database is filled by `benchmarks.datagen` and the
+following operations are timed:
+    - synchronize_data (first pass on fresh data, then steady-state passes)
+    - get_creator_by_name, get_layout_by_name, get_collab_by_name, get_music_by_name,
+      get_artist_by_name (random existing names)
+    - get_oldest_request
+    - recovery.create_save and recovery.load_save
+
+Everything runs offline in a temporary directory (database file and saves). Results are
+written as JSON so that runs can be compared with `--compare`.
+
+Usage:
+    python -m benchmarks.database_bench [--scales 1,5,20] [--repeat 5] [--lookups 200]
+                                        [--output results.json] [--compare baseline.json]
+
+Author: cobalt
+
+"""
+
+# --- Standard imports ---
+from datetime import datetime
+from pathlib import Path
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+# --- Local imports ---
+from benchmarks import datagen
+
+def summarize(samples: list[float]) -> dict:
+
+    """Returns min/median/mean/p95/max of duration samples (seconds), in milliseconds."""
+
+    ordered = sorted(samples)
+    return {
+        "n": len(ordered),
+        "min_ms": round(ordered[0] * 1000, 4),
+        "median_ms": round(statistics.median(ordered) * 1000, 4),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 4),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 4),
+        "max_ms": round(ordered[-1] * 1000, 4),
+    }
+
+def timed(function, *args) -> float:
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+def run_scale(database, recovery, factor: int, repeat: int, lookups: int, seed: int) -> list[dict]:
+
+    """Populates the database at the given scale and times every benchmarked operation."""
+
+    scale = datagen.Scale.from_factor(factor)
+    datagen.reset(database.connection)
+    names = datagen.populate(database.connection, scale, seed)
+    rng = random.Random(seed)
+    results = []
+
+    def add(name, samples):
+        results.append({"scale": factor, "rows": scale.as_dict(), "benchmark": name, **summarize(samples)})
+        print(f"  {name:<28} median {results[-1]['median_ms']:>10.3f}ms  p95 {results[-1]['p95_ms']:>10.3f}ms  (n={len(samples)})")
+
+    print(f"Scale x{factor} : {scale.as_dict()}")
+
+    add("synchronize_data_first", [timed(database.synchronize_data)])
+    add("synchronize_data", [timed(database.synchronize_data) for _ in range(repeat)])
+
+    for table in datagen.OFFICIAL_TABLES:
+        lookup = getattr(database, f"get_{table}_by_name")
+        keys = [rng.choice(names[table]) for _ in range(lookups)] if names[table] else []
+        if keys:
+            add(f"get_{table}_by_name", [timed(lookup, key) for key in keys])
+
+    if scale.requests:
+        add("get_oldest_request", [timed(database.get_oldest_request) for _ in range(lookups)])
+
+    saves = []
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        saves.append(recovery.create_save())
+        samples.append(time.perf_counter() - start)
+        time.sleep(1.01 - min(1.0, samples[-1]))  # backups are named with a one-second resolution
+    add("create_save", samples)
+
+    add("load_save", [timed(recovery.load_save, saves[-1].name) for _ in range(repeat)])
+    return results
+
+def compare(current: dict, baseline_path: Path):
+
+    """Prints the median ratio of every (scale, benchmark) pair against a baseline run."""
+
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    previous = {(r["scale"], r["benchmark"]): r for r in baseline["results"]}
+    print(f"\nComparison with {baseline_path} (median, lower is better):")
+    for result in current["results"]:
+        old = previous.get((result["scale"], result["benchmark"]))
+        if old is None or not old["median_ms"]:
+            continue
+        ratio = result["median_ms"] / old["median_ms"]
+        print(f"  x{result['scale']:<4} {result['benchmark']:<28} {old['median_ms']:>10.3f}ms -> {result['median_ms']:>10.3f}ms  ({ratio:.2f}x)")
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Gameplay Database benchmark on synthetic data")
+    parser.add_argument("--scales", default="1,5,20", help="Comma-separated scale factors (x1 = 50 creators, 200 layouts, ...)")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions of sync, save and load per scale")
+    parser.add_argument("--lookups", type=int, default=200, help="Lookups per get_* benchmark")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed of the generated data")
+    parser.add_argument("--output", type=Path, default=None, help="Result file (default database-bench-<timestamp>.json)")
+    parser.add_argument("--compare", type=Path, default=None, help="Previous result file to compare against")
+    args = parser.parse_args()
+
+    timestamp = datetime.today().strftime("%Y-%m-%d%H%M%S")
+    output = (args.output or Path(f"database-bench-{timestamp}.json")).resolve()
+    baseline = args.compare.resolve() if args.compare else None
+
+    # Measure raw costs: no query budget, no slow query log, quiet logs
+    os.environ.setdefault("GPDB_LOG_LEVEL", "WARNING")
+    os.environ["GPDB_SLOW_QUERY_MS"] = "1e9"
+    os.environ["GPDB_INTERACTIVE_QUERY_MS"] = "0"
+    os.environ["GPDB_INTERACTIVE_QUERY_STEPS"] = "0"
+    os.environ["GPDB_MAINTENANCE_QUERY_SECONDS"] = "0"
+
+    with tempfile.TemporaryDirectory(prefix="gpdb-bench-") as tmp:
+        os.chdir(tmp)
+        os.environ["GPDB_DATABASE"] = str(Path(tmp) / "gpdb.db")
+
+        import database
+        from utilities import recovery
+
+        recovery.SAVE_DIR = Path(tmp) / "saves"
+        database.initialize()
+
+        results = []
+        for factor in (int(f) for f in args.scales.split(",")):
+            results.extend(run_scale(database, recovery, factor, args.repeat, args.lookups, args.seed))
+
+        database.connection.close()
+
+    report = {
+        "meta": {
+            "timestamp": timestamp,
+            "python": sys.version.split()[0],
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "lookups": args.lookups,
+        },
+        "results": results,
+    }
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"\nResults written to {output}")
+
+    if baseline:
+        compare(report, baseline)
+
+if __name__ == "__main__":
+    main()
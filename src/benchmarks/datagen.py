@@ -0,0 +1,170 @@
+"""
+
+File: datagen.py
+
+Description: Generates realistic synthetic Gameplay Database datasets for benchmarks.
+
+The generated data respects the relations `database.synchronize_data` relies on: every
+layout and collab references an existing creator, music and artist (by name), every music
+references an existing artist, and a share of layouts belongs to a masterlevel (collab).
+Pending requests are spread over the five request tables with increasing submission dates.
+
+Generation is deterministic for a given `Scale` and seed.
+
+Author: cobalt
+
+"""
+
+# --- Standard imports ---
+from dataclasses import dataclass, asdict
+from datetime import datetime, timedelta
+import random
+import sqlite3
+
+OFFICIAL_TABLES = ("creator", "layout", "collab", "music", "artist")
+REQUEST_TABLES = ("requestcreator", "requestlayout", "requestcollab", "requestmusic", "requestartist")
+
+LAYOUT_TYPES = ("speedcore", "atmospheric", "flow", "experimental", "effect", "classic")
+NATIONALITIES = ("France", "USA", "Germany", "Brazil", "Korea", "Poland", "Spain", "Canada")
+
+@dataclass(frozen=True)
+class Scale:
+
+    """
+
+    Row counts of a synthetic dataset.
+
+    Attributes
+    ----------
+    creators, layouts, collabs, musics, artists : int
+        Number of rows in each official table.
+    requests : int
+        Number of pending requests, spread over the request tables.
+    masterlevel_ratio : float
+        Share of layouts which are parts of a collab (masterlevel set).
+
+    """
+
+    creators: int
+    layouts: int
+    collabs: int
+    musics: int
+    artists: int
+    requests: int
+    masterlevel_ratio: float = 0.3
+
+    @classmethod
+    def from_factor(cls, factor: int) -> "Scale":
+
+        """Scale proportional to a small production catalogue (factor 1)."""
+
+        return cls(creators=50 * factor, layouts=200 * factor, collabs=20 * factor,
+                   musics=80 * factor, artists=30 * factor, requests=25 * factor)
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+def _date(rng: random.Random, origin: datetime) -> str:
+    return (origin + timedelta(seconds=rng.randrange(0, 3 * 365 * 86400))).strftime('%Y-%m-%d %H:%M:%S')
+
+def _length(rng: random.Random) -> str:
+    seconds = rng.randrange(10, 300)
+    return f"{seconds // 60}min{seconds % 60}s" if seconds >= 60 else f"{seconds}s"
+
+def reset(connection: sqlite3.Connection):
+
+    """Deletes every row from the official and request tables and resets autoincrement counters."""
+
+    # Referencing tables first, so that foreign keys are never violated
+    for table in ("layout", "collab", "music", "creator", "artist") + REQUEST_TABLES:
+        connection.execute(f"DELETE FROM {table};")
+    connection.execute("DELETE FROM sqlite_sequence;")
+    connection.commit()
+
+def populate(connection: sqlite3.Connection, scale: Scale, seed: int = 0) -> dict[str, list[str]]:
+
+    """
+
+    Inserts a synthetic dataset into an initialized (and empty) database.
+
+    Parameters
+    ----------
+    connection : sqlite3.Connection
+        Connection to a database created by `database.initialize`.
+    scale : Scale
+        Row counts to generate.
+    seed : int, optional
+        Random seed.
+
+    Returns
+    -------
+    dict[str, list[str]]
+        Names of the generated entities per official table, used to pick lookup keys.
+
+    """
+
+    rng = random.Random(seed)
+    origin = datetime(2022, 1, 1)
+    recorder = "benchmark"
+
+    artists = [f"Artist {i}" for i in range(scale.artists)]
+    connection.executemany('''INSERT INTO artist (name, yt, soundcloud, registration_date, recorder_name, recorder_notes)
+                              VALUES (?,?,?,?,?,?);''',
+                           [(name, f"https://www.youtube.com/channel/UC{i:022d}", None, _date(rng, origin), recorder, None)
+                            for i, name in enumerate(artists)])
+
+    musics = [(f"Song {i}", rng.choice(artists)) for i in range(scale.musics)]
+    connection.executemany('''INSERT INTO music (name, artist, length, type, yt, soundcloud, ngid, registration_date, recorder_name, recorder_notes)
+                              VALUES (?,?,?,?,?,?,?,?,?,?);''',
+                           [(name, artist, _length(rng), "electronic", None, None, rng.randrange(100000, 1300000),
+                             _date(rng, origin), recorder, None) for name, artist in musics])
+
+    creators = [f"Creator {i}" for i in range(scale.creators)]
+    connection.executemany('''INSERT INTO creator (username, nationality, discord, discord_uid, yt, registration_date, recorder_name)
+                              VALUES (?,?,?,?,?,?,?);''',
+                           [(name, rng.choice(NATIONALITIES), f"creator_{i}", str(10**17 + i), None, _date(rng, origin), recorder)
+                            for i, name in enumerate(creators)])
+
+    collabs = [f"Collab {i}" for i in range(scale.collabs)]
+    collab_rows = []
+    for name in collabs:
+        music, artist = rng.choice(musics)
+        collab_rows.append((rng.choice(creators), name, str(rng.randrange(2, 30)), _length(rng), f"https://youtu.be/c{rng.getrandbits(40):x}",
+                            rng.randrange(100000, 1300000), music, artist, rng.randrange(10**6, 10**8), _date(rng, origin), recorder, None))
+    connection.executemany('''INSERT INTO collab (host_name, name, builders_number, length, yt, music_ngid, music_name, music_artist,
+                              igid, registration_date, recorder_name, recorder_notes) VALUES (?,?,?,?,?,?,?,?,?,?,?,?);''', collab_rows)
+
+    layouts = [f"Layout {i}" for i in range(scale.layouts)]
+    layout_rows = []
+    for name in layouts:
+        music, artist = rng.choice(musics)
+        masterlevel = rng.choice(collabs) if collabs and rng.random() < scale.masterlevel_ratio else None
+        layout_rows.append((rng.choice(creators), rng.choice(LAYOUT_TYPES), name, _length(rng), f"https://youtu.be/l{rng.getrandbits(40):x}",
+                            rng.randrange(100000, 1300000), music, artist, rng.randrange(10**6, 10**8), _date(rng, origin), recorder, None, masterlevel))
+    connection.executemany('''INSERT INTO layout (creator_name, type, name, length, yt, music_ngid, music_name, music_artist, igid,
+                              registration_date, recorder_name, recorder_notes, masterlevel) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?);''', layout_rows)
+
+    for i in range(scale.requests):
+        date = _date(rng, origin)
+        match i % 5:
+            case 0:
+                connection.execute('''INSERT INTO requestcreator (username, nationality, discord, discord_uid, yt, registration_date, recorder_name)
+                                      VALUES (?,?,?,?,?,?,?);''', (f"Pending creator {i}", rng.choice(NATIONALITIES), f"pending_{i}", str(2 * 10**17 + i), None, date, recorder))
+            case 1:
+                connection.execute('''INSERT INTO requestlayout (creator_name, type, name, length, yt, music_ngid, music_name, music_artist, igid,
+                                      registration_date, recorder_name, recorder_notes, masterlevel) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?);''',
+                                   (rng.choice(creators), rng.choice(LAYOUT_TYPES), f"Pending layout {i}", _length(rng), None, None,
+                                    *rng.choice(musics), None, date, recorder, None, None))
+            case 2:
+                connection.execute('''INSERT INTO requestcollab (host_name, name, builders_number, length, yt, music_ngid, music_name, music_artist,
+                                      igid, registration_date, recorder_name, recorder_notes) VALUES (?,?,?,?,?,?,?,?,?,?,?,?);''',
+                                   (rng.choice(creators), f"Pending collab {i}", "4", _length(rng), None, None, *rng.choice(musics), None, date, recorder, None))
+            case 3:
+                connection.execute('''INSERT INTO requestmusic (name, artist, length, type, yt, soundcloud, ngid, registration_date, recorder_name, recorder_notes)
+                                      VALUES (?,?,?,?,?,?,?,?,?,?);''', (f"Pending song {i}", rng.choice(artists), _length(rng), None, None, None, None, date, recorder, None))
+            case 4:
+                connection.execute('''INSERT INTO requestartist (name, yt, soundcloud, registration_date, recorder_name, recorder_notes)
+                                      VALUES (?,?,?,?,?,?);''', (f"Pending artist {i}", None, None, date, recorder, None))
+
+    connection.commit()
+    return {"creator": creators, "layout": layouts, "collab": collabs, "music": [name for name, _ in musics], "artist": artists}
@@ -0,0 +1,192 @@
+"""
+
+File: gateway_profile.py
+
+Description: Measures RSS and time-to-ready of each gateway profile (`utilities.gateway`)
+against a stubbed gateway.
+
+No connection to Discord is made. For each profile, a fresh process builds the bot client
+with the profile's options and feeds its connection state the events Discord would send
+for synthetic guilds under those intents:
+    - GUILD_CREATE, with the member sample and presences only when the `members` and
+      `presences` intents are requested
+    - GUILD_MEMBERS_CHUNK responses (1000 members each) when the profile chunks guilds
+      at startup
+
+Time-to-ready is the processing time of these events plus a modelled round-trip per member
+chunk (`--chunk-latency-ms`), since chunking is paced by the gateway, not by the CPU.
+
+Usage:
+    python -m benchmarks.gateway_profile [--guilds 3] [--members 20000] [--online 0.2]
+                                         [--chunk-latency-ms 40] [--output gateway.json]
+
+Author: cobalt
+
+"""
+
+# --- Standard imports ---
+from datetime import datetime
+from pathlib import Path
+import argparse
+import asyncio
+import gc
+import json
+import os
+import subprocess
+import sys
+import time
+
+CHUNK_SIZE = 1000
+LARGE_THRESHOLD = 250
+
+def _user(user_id: int) -> dict:
+    return {"id": str(user_id), "username": f"user{user_id}", "discriminator": "0", "avatar": None, "global_name": None}
+
+def _member(user_id: int, role_ids: list[str]) -> dict:
+    return {"user": _user(user_id), "roles": role_ids, "joined_at": "2024-05-01T12:00:00+00:00",
+            "deaf": False, "mute": False, "flags": 0}
+
+def _presence(user_id: int) -> dict:
+    return {"user": {"id": str(user_id)}, "status": "online", "client_status": {"desktop": "online"},
+            "activities": [{"name": "Geometry Dash", "type": 0}]}
+
+def guild_create(guild_id: int, members: int, online: float, intents) -> dict:
+
+    """Returns the GUILD_CREATE payload of one synthetic guild, as sent under `intents`."""
+
+    roles = [{"id": str(guild_id), "name": "@everyone", "permissions": "0", "position": 0, "color": 0,
+              "hoist": False, "managed": False, "mentionable": False}]
+    roles += [{"id": str(guild_id * 100 + i), "name": f"role{i}", "permissions": "0", "position": i, "color": 0,
+               "hoist": False, "managed": False, "mentionable": False} for i in range(1, 21)]
+    channels = [{"id": str(guild_id * 1000 + i), "type": 0, "name": f"channel{i}", "position": i,
+                 "permission_overwrites": []} for i in range(40)]
+
+    base = guild_id * 10_000_000
+    sample = []
+    presences = []
+    if intents.members:
+        sample = [_member(base + i, _roles(guild_id, i)) for i in range(1, min(members, LARGE_THRESHOLD) + 1)]
+    if intents.presences:
+        presences = [_presence(base + i) for i in range(1, int(members * online) + 1)]
+
+    return {"id": str(guild_id), "name": f"guild{guild_id}", "owner_id": str(base + 1), "member_count": members,
+            "large": members > LARGE_THRESHOLD, "roles": roles, "channels": channels, "emojis": [], "stickers": [],
+            "features": [], "threads": [], "voice_states": [], "stage_instances": [], "guild_scheduled_events": [],
+            "members": sample + [_member(1, [])], "presences": presences}
+
+def member_chunks(guild_id: int, members: int, online: float, intents):
+
+    """Yields the GUILD_MEMBERS_CHUNK payloads answering a request for every member of a guild."""
+
+    base = guild_id * 10_000_000
+    online_until = int(members * online)
+    count = (members + CHUNK_SIZE - 1) // CHUNK_SIZE
+    for index in range(count):
+        part = range(index * CHUNK_SIZE + 1, min(members, (index + 1) * CHUNK_SIZE) + 1)
+        yield {"guild_id": str(guild_id), "chunk_index": index, "chunk_count": count,
+               "members": [_member(base + i, _roles(guild_id, i)) for i in part],
+               "presences": [_presence(base + i) for i in part if i <= online_until] if intents.presences else []}
+
+def _roles(guild_id: int, i: int) -> list[str]:
+    return [str(guild_id * 100 + 1 + (i + k) % 20) for k in range(3)]
+
+async def measure(profile: str, guilds: int, members: int, online: float, chunk_latency: float) -> dict:
+
+    """
+
+    Feeds the stubbed gateway events to a client built with `profile`.
+
+    Runs in a fresh process, so that the RSS growth is the client's only. Payloads are
+    generated one event at a time, outside of the timed sections.
+
+    """
+
+    import discord
+    from discord.state import ChunkRequest
+    from utilities import gateway
+    from utilities import memprofiler
+
+    client = discord.Client(**gateway.client_options(profile))
+    state = client._connection
+    state.user = discord.ClientUser(state=state, data={**_user(1), "bot": True})
+
+    gc.collect()
+    rss_start = memprofiler.rss()
+
+    processing = 0.0
+    chunk_requests = 0
+    chunks_received = 0
+    for guild_id in range(1, guilds + 1):
+        create = guild_create(guild_id, members, online, state._intents)
+        start = time.perf_counter()
+        guild = state._add_guild_from_data(create)
+        needs_chunking = state._guild_needs_chunking(guild)
+        processing += time.perf_counter() - start
+        del create
+        if not needs_chunking:
+            continue
+
+        request = ChunkRequest(guild.id, 0, asyncio.get_running_loop(), state._get_guild, cache=state.member_cache_flags.joined)
+        state._chunk_requests[request.nonce] = request
+        chunk_requests += 1
+        for chunk in member_chunks(guild_id, members, online, state._intents):
+            chunk["nonce"] = request.nonce
+            start = time.perf_counter()
+            state.parse_guild_members_chunk(chunk)
+            processing += time.perf_counter() - start
+            chunks_received += 1
+        request.buffer.clear()
+
+    gc.collect()
+    rss_end = memprofiler.rss()
+
+    return {
+        "profile": profile,
+        "guilds": guilds,
+        "members_per_guild": members,
+        "chunk_requests": chunk_requests,
+        "chunks_received": chunks_received,
+        "cached_members": sum(len(guild.members) for guild in client.guilds),
+        "processing_ms": round(processing * 1000, 1),
+        "time_to_ready_ms": round((processing + chunks_received * chunk_latency) * 1000, 1),
+        "rss_growth_mb": round((rss_end - rss_start) / 2 ** 20, 1),
+    }
+
+def main():
+
+    parser = argparse.ArgumentParser(description="RSS and time-to-ready of the bot gateway profiles (stubbed gateway)")
+    parser.add_argument("--guilds", type=int, default=3, help="Number of guilds the bot is in")
+    parser.add_argument("--members", type=int, default=20000, help="Members per guild")
+    parser.add_argument("--online", type=float, default=0.2, help="Share of members with a presence")
+    parser.add_argument("--chunk-latency-ms", type=float, default=40, help="Modelled gateway round-trip per member chunk")
+    parser.add_argument("--output", type=Path, default=None, help="Result file (default gateway-profile-<timestamp>.json)")
+    parser.add_argument("--profile", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.profile:
+        result = asyncio.run(measure(args.profile, args.guilds, args.members, args.online, args.chunk_latency_ms / 1000))
+        print(json.dumps(result))
+        return
+
+    from utilities.gateway import PROFILES
+
+    timestamp = datetime.today().strftime("%Y-%m-%d%H%M%S")
+    output = (args.output or Path(f"gateway-profile-{timestamp}.json")).resolve()
+
+    results = []
+    print(f"{args.guilds} guilds x {args.members} members, {args.online:.0%} online, {args.chunk_latency_ms}ms per chunk")
+    for profile in PROFILES:
+        command = [sys.executable, "-m", "benchmarks.gateway_profile", "--profile", profile, "--guilds", str(args.guilds),
+                   "--members", str(args.members), "--online", str(args.online), "--chunk-latency-ms", str(args.chunk_latency_ms)]
+        env = {**os.environ, "GPDB_LOG_LEVEL": "WARNING"}
+        completed = subprocess.run(command, capture_output=True, text=True, env=env, cwd=Path(__file__).parent.parent, check=True)
+        results.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+        r = results[-1]
+        print(f"  {profile:<8} RSS +{r['rss_growth_mb']:>7.1f}MB  ready {r['time_to_ready_ms']:>9.1f}ms  "
+              f"(processing {r['processing_ms']}ms, {r['chunks_received']} chunks, {r['cached_members']} cached members)")
+
+    output.write_text(json.dumps({"meta": {"timestamp": timestamp, **vars(args)}, "results": results}, indent=2, default=str), encoding="utf-8")
+    print(f"\nResults written to {output}")
+
+if __name__ == "__main__":
+    main()
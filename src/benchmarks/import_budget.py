@@ -0,0 +1,104 @@
+"""
+
+File: import_budget.py
+
+Description: Import-time budget check of the bot entry point.
+
+Runs `python -X importtime` on `main` and on the cog extensions it loads at startup
+(`main.EXTENSIONS`) in fresh processes, keeps the fastest of several runs to filter out
+noise, and fails if the cumulative import time exceeds the budget. The slowest modules
+(by self time) are listed to show where a regression comes from, and modules which must
+stay lazy (`LAZY_MODULES`) are checked not to be imported at startup.
+
+The process exits with status 1 if the budget is exceeded or a lazy module is imported,
+so the check can gate CI or a pre-commit hook.
+
+Usage:
+    python -m benchmarks.import_budget [--budget-ms 600] [--runs 5] [--top 10]
+
+The budget can also be set through the GPDB_IMPORT_BUDGET_MS environment variable.
+
+Author: cobalt
+
+"""
+
+# --- Standard imports ---
+from pathlib import Path
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+# Rarely used or heavy modules, imported on first use only
+LAZY_MODULES = ("requests", "utilities.recovery", "views.requestview")
+
+# Imports performed by the bot before connecting to Discord (`__import__` rather than
+# `importlib.import_module`, which `-X importtime` does not report)
+STARTUP = "import main; [__import__(extension) for extension in main.EXTENSIONS]"
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+def measure() -> dict[str, tuple[int, int, int]]:
+
+    """
+
+    Imports the startup modules in a fresh interpreter.
+
+    Returns
+    -------
+    dict
+        Module name -> (self µs, cumulative µs, nesting level), for every imported module.
+
+    """
+
+    src = Path(__file__).parent.parent
+    with tempfile.TemporaryDirectory(prefix="gpdb-import-") as tmp:
+        env = {**os.environ, "PYTHONPATH": str(src), "PYTHONDONTWRITEBYTECODE": "1", "GPDB_LOG_LEVEL": "WARNING"}
+        completed = subprocess.run([sys.executable, "-X", "importtime", "-c", STARTUP],
+                                   capture_output=True, text=True, cwd=tmp, env=env, check=True)
+
+    modules = {}
+    for line in completed.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            modules[match.group(4)] = (int(match.group(1)), int(match.group(2)), len(match.group(3)) // 2)
+    return modules
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Import-time budget check of the bot entry point")
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("GPDB_IMPORT_BUDGET_MS", 600)),
+                        help="Maximum cumulative import time of the startup modules")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters measured; the fastest run is kept")
+    parser.add_argument("--top", type=int, default=10, help="Slowest modules (self time) listed")
+    args = parser.parse_args()
+
+    runs = [measure() for _ in range(args.runs)]
+    total = lambda modules: sum(cumulative for _, cumulative, level in modules.values() if level == 0)
+    best = min(runs, key=total)
+    elapsed = total(best) / 1000
+
+    print(f"Startup imports : {elapsed:.1f}ms (fastest of {args.runs} runs, budget {args.budget_ms:.0f}ms)")
+    for name in ("main",) + tuple(name for name in best if name.startswith("cogs.")):
+        if name in best:
+            print(f"  {name:<28} {best[name][1] / 1000:>8.1f}ms cumulative")
+
+    print(f"\nSlowest modules (self time):")
+    for name, (own, cumulative, _) in sorted(best.items(), key=lambda item: item[1][0], reverse=True)[:args.top]:
+        print(f"  {name:<40} {own / 1000:>8.1f}ms")
+
+    failed = False
+    eager = [name for name in LAZY_MODULES if name in best]
+    if eager:
+        failed = True
+        print(f"\nFAIL : modules which must be imported lazily were imported at startup : {', '.join(eager)}")
+    if elapsed > args.budget_ms:
+        failed = True
+        print(f"\nFAIL : startup imports take {elapsed:.1f}ms, over the {args.budget_ms:.0f}ms budget")
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+"""
+
+File: loadtest.py
+
+Description: Offline load test driving the cogs with simulated Discord interactions.
+
+The harness instantiates `RegistrationCog`, `RequestRegistrationCog`, `QueryCog`, `ReviewCog`
+and `ReviewRequestView` with a fake bot and fake `discord.Interaction` objects, then fires a
+concurrent mixed workload (requests, lookups, direct registrations, reviews with accept or
+reject clicks) against a temporary database populated by `benchmarks.datagen`, with
+`database_worker` running as in production.
+
+Latency is measured from the invocation of a handler to its response (`send_message`,
+`edit_message` or `defer`). Throughput and p50/p95/p99 latency are reported per command and
+overall, as well as the time needed to drain `database_queue` at the end of the run.
+
+No network access or Discord token is needed: artists are generated without YouTube links
+so `/get_artist_by_name` never calls the YouTube API.
+
+Usage:
+    python -m benchmarks.loadtest [--users 20] [--duration 10] [--scale 5] [--sync-interval 5]
+                                  [--output results.json]
+
+Author: cobalt
+
+"""
+
+# --- Standard imports ---
+from pathlib import Path
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+import types
+
+# --- Third-party imports ---
+import discord
+
+# --- Local imports ---
+from benchmarks import datagen
+
+MOD_ID = 1
+WORKLOAD = {
+    # command name : weight
+    "request_creator": 4, "request_layout": 8, "request_collab": 2, "request_music": 3, "request_artist": 2,
+    "get_creator_by_name": 10, "get_layout_by_name": 20, "get_collab_by_name": 5, "get_music_by_name": 8, "get_artist_by_name": 5,
+    "add_layout": 2, "review_next_request": 4,
+}
+
+# -------------------- FAKE DISCORD OBJECTS --------------------
+
+class FakeUser:
+
+    """Stand-in for `discord.User` / `discord.Member` with the attributes the cogs use."""
+
+    def __init__(self, uid: int, name: str):
+        self.id = uid
+        self.name = name
+        self.global_name = name
+        self.display_name = name
+        self.avatar = None
+        self.display_avatar = types.SimpleNamespace(url=None)
+        self.roles = ()
+
+class FakeResponse:
+
+    """Stand-in for `discord.InteractionResponse`, recording when the handler answered."""
+
+    def __init__(self, interaction: "FakeInteraction"):
+        self.interaction = interaction
+
+    def _done(self, **kwargs):
+        if self.interaction.responded_at is None:
+            self.interaction.responded_at = time.perf_counter()
+        self.interaction.payload = kwargs
+
+    async def send_message(self, content=None, **kwargs):
+        self._done(content=content, **kwargs)
+
+    async def edit_message(self, **kwargs):
+        self._done(**kwargs)
+
+    async def defer(self, **kwargs):
+        self._done(**kwargs)
+
+class FakeInteraction:
+
+    """Stand-in for `discord.Interaction` for a slash command or a component click."""
+
+    def __init__(self, user: FakeUser, command: str, options: dict):
+        self.user = user
+        self.command = types.SimpleNamespace(name=command)
+        self.data = {"options": [{"name": key, "value": value} for key, value in options.items()]}
+        self.created_at = discord.utils.utcnow()
+        self.response = FakeResponse(self)
+        self.followup = types.SimpleNamespace(send=self.response.send_message)
+        self.responded_at = None
+        self.payload = None
+
+class FakeBot:
+
+    """Minimal bot exposing the `user` attribute used by embeds."""
+
+    def __init__(self):
+        self.user = FakeUser(0, "Gameplay Database")
+
+# -------------------- WORKLOAD --------------------
+
+class LoadTest:
+
+    """
+
+    Mixed workload runner.
+
+    Each virtual user picks commands according to `WORKLOAD` weights and runs them back
+    to back until the deadline (closed loop).
+
+    """
+
+    def __init__(self, names: dict[str, list[str]], seed: int):
+        from cogs.registration import RegistrationCog
+        from cogs.req_registration import RequestRegistrationCog
+        from cogs.query import QueryCog
+        from cogs.review import ReviewCog
+
+        bot = FakeBot()
+        self.registration = RegistrationCog(bot)
+        self.requests = RequestRegistrationCog(bot)
+        self.query = QueryCog(bot)
+        self.review = ReviewCog(bot)
+        self.names = names
+        self.rng = random.Random(seed)
+        self.counter = itertools.count(10**6)
+        self.latencies = {command: [] for command in WORKLOAD}
+        self.latencies["review_click"] = []
+        self.errors = {}
+
+    async def call(self, command: str, cog, user: FakeUser, /, **options) -> FakeInteraction:
+
+        """Invokes the callback of a cog's app command and records its latency."""
+
+        interaction = FakeInteraction(user, command, options)
+        start = time.perf_counter()
+        try:
+            await getattr(cog, command).callback(cog, interaction, **options)
+        except Exception as e:
+            self.errors[f"{command}: {type(e).__name__}"] = self.errors.get(f"{command}: {type(e).__name__}", 0) + 1
+            return interaction
+        self.latencies[command].append((interaction.responded_at or time.perf_counter()) - start)
+        return interaction
+
+    async def step(self, user: FakeUser, moderator: FakeUser):
+        from views.requestview import ReviewRequestView
+
+        rng, names, n = self.rng, self.names, next(self.counter)
+        command = rng.choices(list(WORKLOAD), weights=list(WORKLOAD.values()))[0]
+        music = rng.choice(names["music"])
+        artist = rng.choice(names["artist"])
+
+        match command:
+            case "request_creator":
+                await self.call(command, self.requests, user, user=FakeUser(n, f"Load creator {n}"), nationality="France")
+            case "request_layout":
+                await self.call(command, self.requests, user, creator=FakeUser(n, rng.choice(names["creator"])), name=f"Load layout {n}",
+                                length="1min2s", yt="https://youtu.be/load", music_name=music, music_artist=artist)
+            case "request_collab":
+                await self.call(command, self.requests, user, host_name=rng.choice(names["creator"]), name=f"Load collab {n}",
+                                builders_number=4, length="2min", yt="https://youtu.be/load", music_name=music, music_artist=artist)
+            case "request_music":
+                await self.call(command, self.requests, user, name=f"Load song {n}", artist=artist, length="3min")
+            case "request_artist":
+                await self.call(command, self.requests, user, name=f"Load artist {n}")
+            case "get_creator_by_name":
+                await self.call(command, self.query, user, user=FakeUser(n, rng.choice(names["creator"])))
+            case "get_layout_by_name" | "get_collab_by_name" | "get_music_by_name" | "get_artist_by_name":
+                table = command.removeprefix("get_").removesuffix("_by_name")
+                await self.call(command, self.query, user, name=rng.choice(names[table]))
+            case "add_layout":
+                await self.call(command, self.registration, moderator, creator=FakeUser(n, rng.choice(names["creator"])),
+                                name=f"Load layout {n}", length="45s", yt="https://youtu.be/load", music_name=music, music_artist=artist)
+            case "review_next_request":
+                interaction = await self.call(command, self.review, moderator)
+                view = (interaction.payload or {}).get("view")
+                if isinstance(view, ReviewRequestView):
+                    click = FakeInteraction(moderator, "review_click", {})
+                    start = time.perf_counter()
+                    button = ReviewRequestView.accept if rng.random() < 0.7 else ReviewRequestView.reject
+                    await button(view, click, None)
+                    self.latencies["review_click"].append((click.responded_at or time.perf_counter()) - start)
+
+    async def virtual_user(self, index: int, deadline: float):
+        user, moderator = FakeUser(10**5 + index, f"user{index}"), FakeUser(MOD_ID, "moderator")
+        while time.perf_counter() < deadline:
+            await self.step(user, moderator)
+            await asyncio.sleep(0)
+
+def percentile(ordered: list[float], q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))] * 1000
+
+def report(latencies: dict[str, list[float]], elapsed: float) -> list[dict]:
+    rows = []
+    everything = sorted(itertools.chain.from_iterable(latencies.values()))
+    for command, samples in list(latencies.items()) + [("ALL", everything)]:
+        if not samples:
+            continue
+        ordered = sorted(samples)
+        rows.append({"command": command, "count": len(ordered), "throughput": round(len(ordered) / elapsed, 2),
+                     "mean_ms": round(statistics.fmean(ordered) * 1000, 3), "p50_ms": round(percentile(ordered, 0.50), 3),
+                     "p95_ms": round(percentile(ordered, 0.95), 3), "p99_ms": round(percentile(ordered, 0.99), 3)})
+    return rows
+
+async def run(args, database, names) -> dict:
+
+    loadtest = LoadTest(names, args.seed)
+    worker = asyncio.create_task(database.database_worker())
+
+    async def periodic_sync():
+        while True:
+            await asyncio.sleep(args.sync_interval)
+            await database.database_queue.put((database.synchronize_data, (), {}))
+
+    sync = asyncio.create_task(periodic_sync()) if args.sync_interval else None
+
+    start = time.perf_counter()
+    await asyncio.gather(*(loadtest.virtual_user(i, start + args.duration) for i in range(args.users)))
+    elapsed = time.perf_counter() - start
+
+    if sync:
+        sync.cancel()
+    drain_start = time.perf_counter()
+    await database.database_queue.join()
+    drain = time.perf_counter() - drain_start
+    worker.cancel()
+
+    return {"users": args.users, "duration_s": round(elapsed, 3), "queue_drain_s": round(drain, 3),
+            "errors": loadtest.errors, "commands": report(loadtest.latencies, elapsed)}
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Offline load test of the Gameplay Database cogs")
+    parser.add_argument("--users", type=int, default=20, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=10, help="Duration of the run in seconds")
+    parser.add_argument("--scale", type=int, default=5, help="Scale factor of the initial dataset (see benchmarks.datagen)")
+    parser.add_argument("--sync-interval", type=float, default=5, help="Seconds between queued synchronize_data jobs (0 disables)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--output", type=Path, default=None, help="Optional JSON result file")
+    args = parser.parse_args()
+
+    output = args.output.resolve() if args.output else None
+    os.environ.setdefault("GPDB_LOG_LEVEL", "ERROR")
+    os.environ.setdefault("GPDB_METRICS_PORT", "0")
+
+    with tempfile.TemporaryDirectory(prefix="gpdb-loadtest-") as tmp:
+        os.chdir(tmp)
+        os.environ["GPDB_DATABASE"] = str(Path(tmp) / "gpdb.db")
+
+        whitelist = Path(tmp) / "mod_whitelist.json"
+        whitelist.write_text(json.dumps({"mods": [MOD_ID]}), encoding="utf-8")
+
+        import database
+        from utilities import tools
+
+        tools.mod_whitelist = tools.ModWhitelist(whitelist)
+        database.initialize()
+        names = datagen.populate(database.connection, datagen.Scale.from_factor(args.scale), args.seed)
+        database.connection.execute("UPDATE artist SET yt = NULL;")
+        database.connection.commit()
+        database.synchronize_data()
+        database.refresh_replica(force=True)
+
+        result = asyncio.run(run(args, database, names))
+        database.connection.close()
+
+    print(f"{args.users} users, {result['duration_s']}s, queue drained in {result['queue_drain_s']}s")
+    print(f"{'command':<22} {'count':>7} {'req/s':>8} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for row in result["commands"]:
+        print(f"{row['command']:<22} {row['count']:>7} {row['throughput']:>8} {row['mean_ms']:>9} {row['p50_ms']:>9} {row['p95_ms']:>9} {row['p99_ms']:>9}")
+    for error, count in result["errors"].items():
+        print(f"error {error} x{count}")
+
+    if output:
+        output.write_text(json.dumps(result, indent=2), encoding="utf-8")
+
+if __name__ == "__main__":
+    main()
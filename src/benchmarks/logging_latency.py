@@ -0,0 +1,120 @@
+"""
+
+File: logging_latency.py
+
+Description: Measures the latency of a single log call as seen by the event loop.
+
+Two pipelines are compared:
+- "sync" : the former setup, a `StreamHandler` and a `FileHandler` writing directly
+  from the calling coroutine.
+- "queue" : the current `AppLogger` setup, a `QueueHandler` feeding a background
+  `QueueListener` which formats and writes the records.
+
+Console output is redirected to /dev/null and the log files are written to a
+temporary directory.
+
+Usage:
+    python -m benchmarks.logging_latency [--calls N]
+
+Author: cobalt
+
+"""
+
+# --- Standard imports ---
+import argparse
+import asyncio
+import logging
+import logging.handlers
+import os
+import queue
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+# --- Local imports ---
+from utilities.applogger import DeferredQueueHandler, CompressedRotatingFileHandler, LOG_FORMAT
+
+def sync_pipeline(log_dir: Path, devnull) -> tuple[logging.Logger, callable]:
+
+    """Builds a logger writing synchronously to the console and a plain file."""
+
+    logger = logging.getLogger("bench.sync")
+    logger.propagate = False
+    formatter = logging.Formatter(LOG_FORMAT)
+
+    console_handler = logging.StreamHandler(devnull)
+    file_handler = logging.FileHandler(log_dir / "sync.log", encoding="utf-8")
+    for handler in (console_handler, file_handler):
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+
+    def close():
+        for handler in (console_handler, file_handler):
+            logger.removeHandler(handler)
+            handler.close()
+
+    return logger, close
+
+def queue_pipeline(log_dir: Path, devnull) -> tuple[logging.Logger, callable]:
+
+    """Builds a logger handing records to a background `QueueListener`."""
+
+    logger = logging.getLogger("bench.queue")
+    logger.propagate = False
+    formatter = logging.Formatter(LOG_FORMAT)
+
+    console_handler = logging.StreamHandler(devnull)
+    file_handler = CompressedRotatingFileHandler(log_dir / "queue.log")
+    for handler in (console_handler, file_handler):
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = DeferredQueueHandler(log_queue)
+    logger.addHandler(queue_handler)
+    listener = logging.handlers.QueueListener(log_queue, console_handler, file_handler)
+    listener.start()
+
+    def close():
+        listener.stop()
+        logger.removeHandler(queue_handler)
+        for handler in (console_handler, file_handler):
+            handler.close()
+
+    return logger, close
+
+async def measure(logger: logging.Logger, calls: int) -> list[int]:
+
+    """Logs `calls` debug messages from a coroutine and returns each call duration in ns."""
+
+    logger.setLevel(logging.DEBUG)
+    samples = []
+    for i in range(calls):
+        start = time.perf_counter_ns()
+        logger.debug(f"user{i} used get_layout_by_name within the following args: ['name=Layout {i}']")
+        samples.append(time.perf_counter_ns() - start)
+        if i % 100 == 0:
+            await asyncio.sleep(0)
+    return samples
+
+def summarize(name: str, samples: list[int]) -> str:
+    ordered = sorted(samples)
+    pct = lambda p: ordered[min(len(ordered) - 1, int(len(ordered) * p))] / 1000
+    return (f"{name:<6} mean={statistics.fmean(ordered) / 1000:8.2f}us "
+            f"p50={pct(0.50):8.2f}us p95={pct(0.95):8.2f}us p99={pct(0.99):8.2f}us max={ordered[-1] / 1000:8.2f}us")
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Per-log-call latency on the event loop")
+    parser.add_argument("--calls", type=int, default=20000, help="Number of log calls per pipeline")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as devnull:
+        for name, build in (("sync", sync_pipeline), ("queue", queue_pipeline)):
+            logger, close = build(Path(tmp), devnull)
+            samples = asyncio.run(measure(logger, args.calls))
+            close()
+            print(summarize(name, samples))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+
+File: query_plans.py
+
+Description: Query-plan regression check of every lookup, sync, request-queue and delete
+statement of `database.py`.
+
+The check populates a temporary database with `benchmarks.datagen`, runs the functions of
+`database.py` while capturing the statements they execute (`set_trace_callback`), and runs
+`EXPLAIN QUERY PLAN` on each of them. A statement fails the check if its plan contains:
+    - a full table scan (`SCAN <table>` without an index), or
+    - a temporary B-tree (`USE TEMP B-TREE FOR ORDER BY / GROUP BY / DISTINCT`)
+
+Statements which have to read a whole table (full dumps, sync passes over every row) are
+listed in `EXPECTED_SCANS` and only allowed to scan the tables listed there.
+
+The process exits with status 1 if any statement regressed, so the check can gate CI or
+a pre-commit hook.
+
+Usage:
+    python -m benchmarks.query_plans [--scale 2] [--verbose]
+
+Author: cobalt
+
+"""
+
+# --- Standard imports ---
+from pathlib import Path
+import argparse
+import os
+import re
+import sys
+import tempfile
+
+# --- Local imports ---
+from benchmarks import datagen
+
+# Statements which legitimately scan a table, as (statement pattern, allowed tables)
+EXPECTED_SCANS = (
+    (r"^SELECT \* FROM (creator|layout|collab|music|artist);$", {"creator", "layout", "collab", "music", "artist"}),
+    (r"FROM layout WHERE creator_id IS NULL", {"layout"}),
+    (r"FROM collab WHERE host_id IS NULL", {"collab"}),
+    (r"FROM music WHERE artist_id IS NULL", {"music"}),
+    (r"^SELECT id FROM music;$", {"music"}),
+    (r"^SELECT id, name FROM artist;$", {"artist"}),
+)
+
+_SCAN = re.compile(r"\bSCAN (?!CONSTANT ROW)(\w+)(?! USING)(?:\s|$)")
+_TEMP_BTREE = re.compile(r"USE TEMP B-TREE")
+
+def capture(database, calls) -> list[tuple[str, str]]:
+
+    """
+
+    Runs every (label, function, args) call and returns the distinct (label, statement)
+    pairs executed by SQLite, in execution order.
+
+    The trace callback receives statements with their parameters expanded; they are
+    normalized by `sqlstats.normalize` so that each statement is checked once, with
+    placeholders.
+
+    """
+
+    from utilities import sqlstats
+
+    statements = {}
+    label = None
+
+    def trace(statement):
+        statement = sqlstats.normalize(statement)
+        if statement.split(" ", 1)[0].upper() in ("SELECT", "UPDATE", "DELETE"):
+            statements.setdefault(statement, label)
+
+    database.connection.set_trace_callback(trace)
+    try:
+        for label, function, args in calls:
+            function(*args)
+    finally:
+        database.connection.set_trace_callback(None)
+    return [(label, statement) for statement, label in statements.items()]
+
+def check(database, label: str, statement: str) -> tuple[list[str], list[str]]:
+
+    """Returns the plan of a statement and the list of problems found in it."""
+
+    explain = database.connection.execute(f"EXPLAIN QUERY PLAN {statement}", (None,) * statement.count("?"))
+    plan = [row[3] for row in explain]
+    allowed = set()
+    for pattern, tables in EXPECTED_SCANS:
+        if re.search(pattern, statement):
+            allowed |= tables
+
+    problems = []
+    for detail in plan:
+        for table in _SCAN.findall(detail):
+            if table not in allowed:
+                problems.append(f"full table scan of {table}")
+        if _TEMP_BTREE.search(detail):
+            problems.append(detail.strip())
+    return plan, problems
+
+def build_calls(database, names: dict) -> list:
+
+    """Calls covering every read, sync, request-queue and delete statement of `database.py`."""
+
+    calls = [(f"get_{table}_by_name", getattr(database, f"get_{table}_by_name"), (names[table][0],))
+             for table in datagen.OFFICIAL_TABLES]
+    calls += [(f"get_{table}s", getattr(database, f"get_{table}s"), ()) for table in datagen.OFFICIAL_TABLES]
+    calls.append(("synchronize_data", database.synchronize_data, ()))
+    calls.append(("get_oldest_request", database.get_oldest_request, ()))
+
+    for table in datagen.REQUEST_TABLES:
+        type_ = table.removeprefix("request")
+        rowid = database.connection.execute(f"SELECT min(rowid) FROM {table}").fetchone()[0]
+        if rowid is not None:
+            calls.append(("get_request_details", database.get_request_details, (type_, rowid)))
+            calls.append(("delete_request", database.delete_request, (type_, rowid)))
+    return calls
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Gameplay Database query-plan regression check")
+    parser.add_argument("--scale", type=int, default=2, help="Scale factor of the fixture database")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed of the fixture data")
+    parser.add_argument("--verbose", action="store_true", help="Print the plan of every statement")
+    args = parser.parse_args()
+
+    # Plans only: no query budget, no slow query log, quiet logs
+    os.environ.setdefault("GPDB_LOG_LEVEL", "WARNING")
+    os.environ["GPDB_SLOW_QUERY_MS"] = "1e9"
+    os.environ["GPDB_INTERACTIVE_QUERY_MS"] = "0"
+    os.environ["GPDB_INTERACTIVE_QUERY_STEPS"] = "0"
+    os.environ["GPDB_MAINTENANCE_QUERY_SECONDS"] = "0"
+    # Statements are captured on the shared connection, so lookups must not go to the replica
+    os.environ["GPDB_READ_REPLICA"] = "0"
+
+    failures = 0
+    with tempfile.TemporaryDirectory(prefix="gpdb-plans-") as tmp:
+        os.chdir(tmp)
+        os.environ["GPDB_DATABASE"] = str(Path(tmp) / "gpdb.db")
+
+        import database
+
+        database.initialize()
+        names = datagen.populate(database.connection, datagen.Scale.from_factor(args.scale), args.seed)
+
+        statements = capture(database, build_calls(database, names))
+        for label, statement in statements:
+            plan, problems = check(database, label, statement)
+            if problems:
+                failures += 1
+            if problems or args.verbose:
+                status = "FAIL" if problems else "ok"
+                print(f"[{status}] {label} : {statement}")
+                for detail in plan:
+                    print(f"         {detail}")
+                for problem in problems:
+                    print(f"         -> {problem}")
+
+        database.connection.close()
+        os.chdir(Path(__file__).parent)
+
+    print(f"{len(statements)} statements checked, {failures} regressed")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
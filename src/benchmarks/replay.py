@@ -0,0 +1,246 @@
+"""
+
+File: replay.py
+
+Description: Replays a captured SQL workload (`utilities.workload`) against a copy of a backup.
+
+The backup (an SQL dump from `saves/`, see `utilities.recovery`) is restored into a
+temporary database, optional setup scripts and pragmas are applied to it (e.g. a new index
+or a different journal mode), then every captured statement and commit is re-executed
+in order, at the original pace, accelerated, or as fast as possible.
+
+The report gives the latency distribution (execution and fetch of all rows) of the whole
+replay and of each normalized statement, the statements which failed, and how far the
+replay fell behind the captured schedule. Results are written as JSON so that runs can be
+compared with `--compare`.
+
+Redacted captures replay with placeholder values: lookups by name find no row, so their
+latencies are those of the index probe only.
+
+Usage:
+    python -m benchmarks.replay logs/workload.jsonl [more captures ...]
+                                [--backup gpdb-backup2025-10-14213045.sql] [--speed 1]
+                                [--setup new_indexes.sql] [--pragma journal_mode=WAL]
+                                [--output replay.json] [--compare baseline.json]
+
+Author: cobalt
+
+"""
+
+# --- Standard imports ---
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+import argparse
+import gzip
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+# --- Local imports ---
+from benchmarks.database_bench import summarize
+
+# Backup directory of the bot (same as `recovery.SAVE_DIR`)
+SAVE_DIR = Path(__file__).parent.parent.parent / "saves"
+
+def read_capture(paths: list[Path]) -> list[dict]:
+
+    """Reads captured statements from plain or gzip-compressed files, ordered by timestamp."""
+
+    records = []
+    for path in paths:
+        opener = gzip.open if path.suffix == ".gz" else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            records.extend(json.loads(line) for line in f if line.strip())
+    records.sort(key=lambda record: record["ts"])
+    return records
+
+def resolve_backup(name: str | None) -> Path:
+
+    """Returns the backup path given as a path or a file name in `saves/`, or the latest backup."""
+
+    if name is None:
+        backups = sorted(SAVE_DIR.glob("gpdb-backup*.sql"))
+        if not backups:
+            raise FileNotFoundError(f"No backup found in {SAVE_DIR}")
+        return backups[-1]
+    path = Path(name)
+    return path if path.exists() else SAVE_DIR / name
+
+def restore(backup: Path, target: Path, setup: list[Path], pragmas: list[str]) -> sqlite3.Connection:
+
+    """Restores a backup into `target` and applies setup scripts and pragmas."""
+
+    connection = sqlite3.connect(target)
+    connection.execute("PRAGMA foreign_keys = OFF;")
+    connection.executescript(backup.read_text(encoding="utf-8"))
+    connection.execute("PRAGMA foreign_keys = ON;")
+
+    for script in setup:
+        connection.executescript(script.read_text(encoding="utf-8"))
+    for pragma in pragmas:
+        connection.execute(f"PRAGMA {pragma};").fetchall()
+    connection.commit()
+    return connection
+
+def _parameters(params):
+    from utilities import workload
+
+    if params is None:
+        return ()
+    if isinstance(params, dict):
+        return {name: workload.decode(value) for name, value in params.items()}
+    return tuple(workload.decode(value) for value in params)
+
+def replay(connection: sqlite3.Connection, records: list[dict], speed: float) -> dict:
+
+    """
+
+    Re-executes captured records and collects latencies.
+
+    Parameters
+    ----------
+    speed : float
+        Replay speed relative to the capture (2 = twice as fast); 0 replays as fast as possible.
+
+    Returns
+    -------
+    dict
+        Latencies per normalized statement, errors, skipped records and maximum lag.
+
+    """
+
+    from utilities.sqlstats import normalize
+
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    skipped = 0
+    max_lag = 0.0
+
+    origin = records[0]["ts"] if records else 0.0
+    start = time.perf_counter()
+
+    for record in records:
+        if speed:
+            due = start + (record["ts"] - origin) / speed
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                max_lag = max(max_lag, -delay)
+
+        kind = record["kind"]
+        if kind == "commit":
+            statement = "COMMIT"
+        elif record.get("sql") is None:
+            skipped += 1
+            continue
+        else:
+            statement = "<script>" if kind == "script" else normalize(record["sql"])
+
+        begin = time.perf_counter()
+        try:
+            if kind == "commit":
+                connection.commit()
+            elif kind == "script":
+                connection.executescript(record["sql"])
+            elif kind == "executemany":
+                connection.executemany(record["sql"], [_parameters(p) for p in record["params"]])
+            else:
+                connection.execute(record["sql"], _parameters(record.get("params"))).fetchall()
+        except sqlite3.Error:
+            errors[statement] += 1
+            continue
+        latencies[statement].append(time.perf_counter() - begin)
+
+    return {"latencies": latencies, "errors": dict(errors), "skipped": skipped,
+            "max_lag_ms": round(max_lag * 1000, 3), "duration_s": round(time.perf_counter() - start, 3)}
+
+def compare(current: dict, baseline_path: Path):
+
+    """Prints the p95 ratio of every statement against a baseline replay."""
+
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    previous = {r["statement"]: r for r in baseline["statements"]}
+    previous["<all>"] = baseline["overall"]
+    print(f"\nComparison with {baseline_path} (p95, lower is better):")
+    for result in [{"statement": "<all>", **current["overall"]}] + current["statements"]:
+        old = previous.get(result["statement"])
+        if old is None or not old["p95_ms"]:
+            continue
+        ratio = result["p95_ms"] / old["p95_ms"]
+        print(f"  {old['p95_ms']:>10.3f}ms -> {result['p95_ms']:>10.3f}ms  ({ratio:.2f}x)  {result['statement'][:90]}")
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Replays a captured Gameplay Database workload against a backup")
+    parser.add_argument("captures", type=Path, nargs="+", help="Capture files (workload.jsonl and its .gz archives)")
+    parser.add_argument("--backup", default=None, help="Backup path or file name in saves/ (default: latest backup)")
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay speed (1 = original pace, 0 = as fast as possible)")
+    parser.add_argument("--setup", type=Path, action="append", default=[], help="SQL script applied to the copy before replaying")
+    parser.add_argument("--pragma", action="append", default=[], help="Pragma applied to the copy before replaying (e.g. journal_mode=WAL)")
+    parser.add_argument("--top", type=int, default=15, help="Statements listed in the report")
+    parser.add_argument("--output", type=Path, default=None, help="Result file (default replay-<timestamp>.json)")
+    parser.add_argument("--compare", type=Path, default=None, help="Previous result file to compare against")
+    args = parser.parse_args()
+
+    os.environ.setdefault("GPDB_LOG_LEVEL", "WARNING")
+
+    timestamp = datetime.today().strftime("%Y-%m-%d%H%M%S")
+    output = (args.output or Path(f"replay-{timestamp}.json")).resolve()
+    backup = resolve_backup(args.backup)
+    records = read_capture(args.captures)
+    if not records:
+        sys.exit("The capture is empty")
+
+    with tempfile.TemporaryDirectory(prefix="gpdb-replay-") as tmp:
+        connection = restore(backup, Path(tmp) / "gpdb.db", args.setup, args.pragma)
+        print(f"Replaying {len(records)} records from {backup.name} (speed {args.speed or 'max'})")
+        result = replay(connection, records, args.speed)
+        connection.close()
+
+    everything = [sample for samples in result["latencies"].values() for sample in samples]
+    statements = [{"statement": statement, **summarize(samples)} for statement, samples in result["latencies"].items()]
+    statements.sort(key=lambda s: s["mean_ms"] * s["n"], reverse=True)
+
+    report = {
+        "meta": {
+            "timestamp": timestamp,
+            "python": sys.version.split()[0],
+            "sqlite": sqlite3.sqlite_version,
+            "backup": backup.name,
+            "captures": [str(path) for path in args.captures],
+            "speed": args.speed,
+            "setup": [str(path) for path in args.setup],
+            "pragmas": args.pragma,
+            "records": len(records),
+            "skipped": result["skipped"],
+            "max_lag_ms": result["max_lag_ms"],
+            "duration_s": result["duration_s"],
+        },
+        "overall": summarize(everything) if everything else {},
+        "statements": statements,
+        "errors": result["errors"],
+    }
+
+    if everything:
+        o = report["overall"]
+        print(f"Overall : n={o['n']}  median {o['median_ms']:.3f}ms  p95 {o['p95_ms']:.3f}ms  max {o['max_ms']:.3f}ms")
+    print(f"Duration {result['duration_s']}s, max lag behind schedule {result['max_lag_ms']}ms, {result['skipped']} records skipped")
+    print(f"\n{'n':>7} {'median ms':>10} {'p95 ms':>10} {'max ms':>10}  statement")
+    for s in statements[:args.top]:
+        print(f"{s['n']:>7} {s['median_ms']:>10.3f} {s['p95_ms']:>10.3f} {s['max_ms']:>10.3f}  {s['statement'][:100]}")
+    for statement, count in result["errors"].items():
+        print(f"  {count} failed : {statement[:100]}")
+
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        compare(report, args.compare.resolve())
+
+if __name__ == "__main__":
+    main()
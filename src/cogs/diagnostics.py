@@ -0,0 +1,230 @@
+"""
+
+File: diagnostics.py
+
+This module defines the `DiagnosticsCog` class, a Discord cog gathering moderator-only
+commands used to investigate the performance of the running bot.
+
+It provides:
+    - `/profile` : profiles the running process for a bounded duration and uploads
+      a sorted summary along with the raw profile file
+    - `/sql_stats` : reports the top N SQL statements executed through `database.py`
+    - `/memory` : controls allocation tracing and reports memory snapshots and RSS history
+    - `/capture` : starts or stops the capture of the SQL workload, replayed offline by
+      `benchmarks.replay`
+
+Every command is gated by `tools.check_mod()` and logged through `AppLogger`.
+
+Author: cobalt
+
+"""
+
+# --- Standard imports ---
+import discord
+from discord.ext import commands
+from datetime import datetime
+import io
+
+# --- Local imports ---
+from utilities.applogger import AppLogger
+from utilities import memprofiler
+from utilities import profiler
+from utilities import sqlstats
+from utilities import tools
+from utilities import workload
+from exceptions.custom_exceptions import ProfilerBusy
+
+# --- Application logger ---
+applogger = AppLogger()
+
+class DiagnosticsCog(commands.Cog):
+
+    """
+
+    Cog providing moderator-only diagnostics commands.
+
+    Attributes
+    ----------
+    bot : commands.Bot
+        The Discord bot instance associated with this cog.
+
+    """
+
+    def __init__(self, bot: commands.Bot) -> None:
+
+        """Initialize the DiagnosticsCog with a reference to the bot."""
+
+        self.bot = bot
+
+    @discord.app_commands.command(name="profile", description="Profiles the running bot and uploads the results")
+    @discord.app_commands.describe(seconds=f"Duration of the profiling session (max {profiler.MAX_PROFILE_SECONDS}s)")
+    @discord.app_commands.describe(top="Number of functions listed in the summary")
+    @discord.app_commands.describe(sort="Sort key of the summary")
+    @discord.app_commands.choices(sort=[discord.app_commands.Choice(name=key, value=key) for key in profiler.SORT_KEYS])
+    async def profile(self, interaction: discord.Interaction, seconds: int = 30, top: int = 25, sort: str = "cumulative"):
+
+        """
+
+        Profile the running process and upload a sorted stats summary and the raw profile.
+
+        The session covers the event loop thread, which runs every command handler
+        and the `database_worker` task.
+
+        Parameters
+        ----------
+        interaction : discord.Interaction
+            The Discord interaction context where the command is executed.
+        seconds : int, optional
+            Duration of the session, clamped to [1, `profiler.MAX_PROFILE_SECONDS`].
+        top : int, optional
+            Number of functions listed in the summary ("top N by cumulative time" by default).
+        sort : str, optional
+            Sort key ("cumulative", "tottime" or "calls").
+
+        """
+
+        await tools.check_mod(interaction)
+
+        if sort not in profiler.SORT_KEYS:
+            sort = "cumulative"
+
+        try:
+            await interaction.response.defer(ephemeral=True, thinking=True)
+            session = await profiler.profile_for(seconds)
+        except ProfilerBusy:
+            await interaction.followup.send("**A profiling session** is already running.", ephemeral=True)
+            return
+
+        timestamp = datetime.today().strftime("%Y-%m-%d%H%M%S")
+        files = [
+            discord.File(io.BytesIO(profiler.summary(session, top, sort).encode("utf-8")), filename=f"profile{timestamp}.txt"),
+            discord.File(io.BytesIO(profiler.raw_dump(session)), filename=f"profile{timestamp}.prof"),
+        ]
+        await interaction.followup.send(f"Profiling session finished ({session.duration:.1f}s, top {top} by {sort})", files=files, ephemeral=True)
+
+    @discord.app_commands.command(name="sql_stats", description="Reports the most expensive SQL statements")
+    @discord.app_commands.describe(top="Number of statements listed")
+    @discord.app_commands.describe(sort="Sort key of the report")
+    @discord.app_commands.describe(reset="Clears the statistics after reporting them")
+    @discord.app_commands.choices(sort=[discord.app_commands.Choice(name=key, value=key) for key in sqlstats.REPORT_SORT_KEYS])
+    async def sql_stats(self, interaction: discord.Interaction, top: int = 10, sort: str = "total", reset: bool = False):
+
+        """
+
+        Report per-statement SQL statistics (calls, total/avg/max duration, rows returned).
+
+        Parameters
+        ----------
+        interaction : discord.Interaction
+            The Discord interaction context where the command is executed.
+        top : int, optional
+            Number of statements listed.
+        sort : str, optional
+            Sort key ("total", "max", "calls" or "rows").
+        reset : bool, optional
+            Whether to clear the statistics once reported.
+
+        """
+
+        await tools.check_mod(interaction)
+
+        text = sqlstats.report(top, sort if sort in sqlstats.REPORT_SORT_KEYS else "total")
+        if reset:
+            sqlstats.reset()
+
+        if len(text) < 1900:
+            await interaction.response.send_message(f"```\n{text}\n```", ephemeral=True)
+        else:
+            timestamp = datetime.today().strftime("%Y-%m-%d%H%M%S")
+            await interaction.response.send_message(
+                file=discord.File(io.BytesIO(text.encode("utf-8")), filename=f"sqlstats{timestamp}.txt"), ephemeral=True)
+
+    @discord.app_commands.command(name="memory", description="Memory diagnostics (allocation tracing, snapshots, RSS)")
+    @discord.app_commands.describe(action="Action to perform")
+    @discord.app_commands.describe(top="Number of allocation sites listed in snapshots")
+    @discord.app_commands.choices(action=[discord.app_commands.Choice(name=action, value=action)
+                                          for action in ("snapshot", "start", "stop", "rss")])
+    async def memory(self, interaction: discord.Interaction, action: str = "snapshot", top: int = 10):
+
+        """
+
+        Control memory diagnostics at runtime.
+
+        Actions:
+            - "start" / "stop" : enable or disable `tracemalloc` allocation tracing
+            - "snapshot" : take a snapshot and report top allocation sites (or their growth
+              since the previous snapshot)
+            - "rss" : report the RSS history
+
+        Parameters
+        ----------
+        interaction : discord.Interaction
+            The Discord interaction context where the command is executed.
+        action : str, optional
+            Action to perform.
+        top : int, optional
+            Number of allocation sites listed.
+
+        """
+
+        await tools.check_mod(interaction)
+
+        match action:
+            case "start":
+                text = "Memory tracing started" if memprofiler.start() else "Memory tracing is already running"
+            case "stop":
+                text = "Memory tracing stopped" if memprofiler.stop() else "Memory tracing is not running"
+            case "rss":
+                text = memprofiler.rss_report()
+            case _:
+                text = memprofiler.snapshot_report(top)
+
+        if len(text) < 1900:
+            await interaction.response.send_message(f"```\n{text}\n```", ephemeral=True)
+        else:
+            timestamp = datetime.today().strftime("%Y-%m-%d%H%M%S")
+            await interaction.response.send_message(
+                file=discord.File(io.BytesIO(text.encode("utf-8")), filename=f"memory{timestamp}.txt"), ephemeral=True)
+
+    @discord.app_commands.command(name="capture", description="Starts or stops the capture of the SQL workload")
+    @discord.app_commands.describe(action="Action to perform")
+    @discord.app_commands.describe(redact="Redacts personal data from captured parameters (start only)")
+    @discord.app_commands.choices(action=[discord.app_commands.Choice(name=action, value=action)
+                                          for action in ("status", "start", "stop")])
+    async def capture(self, interaction: discord.Interaction, action: str = "status", redact: bool = True):
+
+        """
+
+        Control the workload capture at runtime.
+
+        Captured statements are written to `GPDB_WORKLOAD_FILE` and can be replayed
+        against a copy of a backup with `python -m benchmarks.replay`.
+
+        Parameters
+        ----------
+        interaction : discord.Interaction
+            The Discord interaction context where the command is executed.
+        action : str, optional
+            Action to perform ("status", "start" or "stop").
+        redact : bool, optional
+            Whether parameters are redacted when starting a capture.
+
+        """
+
+        await tools.check_mod(interaction)
+
+        match action:
+            case "start":
+                text = f"Workload capture started ({'redacted' if redact else 'raw'})" if workload.start(redact=redact) else "Workload capture is already running"
+            case "stop":
+                text = "Workload capture stopped" if workload.stop() else "Workload capture is not running"
+            case _:
+                text = f"Workload capture is {'running' if workload.is_capturing() else 'not running'} ({workload.CAPTURE_FILE})"
+
+        await interaction.response.send_message(text, ephemeral=True)
+
+async def setup(bot: commands.Bot) -> None:
+
+    """Extension entry point, called by `bot.load_extension` and `bot.reload_extension`."""
+
+    await bot.add_cog(DiagnosticsCog(bot))
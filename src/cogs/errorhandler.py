@@ -27,6 +27,8 @@ import discord
 
 # --- Local imports
 from utilities.applogger import AppLogger
+from utilities import metrics
+from utilities import tracing
 from exceptions.custom_exceptions import *
 
 class ErrorHandlerCog(commands.Cog):
@@ -102,6 +104,10 @@ class ErrorHandlerCog(commands.Cog):
         self.applogger.error(
             f"Raised unhandled app command error: {interaction.command.name if interaction.command else 'unknown'} - {error}"
         )
+        outcome = type(getattr(error, "original", error)).__name__
+        self.applogger.debug_command(interaction, outcome=outcome)
+        metrics.commands_total.inc(command=interaction.command.name if interaction.command else "unknown", outcome=outcome)
+        tracing.end_trace(outcome)
         
         if isinstance(error, discord.app_commands.CommandInvokeError):
             original = error.original
@@ -112,6 +118,9 @@ class ErrorHandlerCog(commands.Cog):
 
                 case MissingModPermissions():
                     await interaction.response.send_message("**You** are not authorized !", ephemeral=True)
+
+                case QueryBudgetExceeded():
+                    await interaction.response.send_message("**The query** took too long, please try again later !", ephemeral=True)
         
     @commands.Cog.listener()
     async def on_error(self, event_name, *args, **kwargs):
@@ -134,3 +143,9 @@ class ErrorHandlerCog(commands.Cog):
         """
         
         self.applogger.error(f"Unhandled event error: {event_name}", exc_info=True)
+
+async def setup(bot: commands.Bot) -> None:
+
+    """Extension entry point, called by `bot.load_extension` and `bot.reload_extension`."""
+
+    await bot.add_cog(ErrorHandlerCog(bot, AppLogger()))
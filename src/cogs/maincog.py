@@ -7,8 +7,11 @@ the lifecycle, background tasks, and maintenance operations of the Gameplay Data
 
 It performs the following key roles:
     - Handles the bot's startup routine (`on_ready`)
-    - Manages periodic tasks for data synchronization and auto-saving
+    - Declares the periodic background jobs (sync, backups, checkpoints, optimization,
+      cache snapshots and prefetching, log rotation) run by `utilities.scheduler`
+    - Provides a command to inspect, pause, resume and trigger these jobs
     - Provides a command to manually load database backups
+    - Provides a command to hot-reload cog extensions without restarting the bot
 
 All activity and errors are logged through the `AppLogger` utility for easier debugging
 and maintenance.
@@ -18,18 +21,27 @@ Author: cobalt
 """
 
 # --- Standard imports ---
+import asyncio
+import io
+import time
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
+from datetime import datetime
 
 # --- Local imports
 import database
 from utilities.applogger import AppLogger
-from utilities import recovery
 from utilities import tools
-
-# --- Setup logging and intents ---
-intents = discord.Intents.all()
-intents.guilds = True
+from utilities import metrics
+from utilities import loopmonitor
+from utilities import memprofiler
+from utilities import tracing
+from utilities import commandsync
+from utilities import warmcache
+from utilities import maintenance
+from utilities.scheduler import scheduler
+
+# --- Setup logging ---
 applogger = AppLogger()
 
 
@@ -39,8 +51,8 @@ class MainCog(commands.Cog):
 
     Core management cog for the Gameplay Database Discord bot.
 
-    This cog initializes the bot, starts background synchronization and save tasks,
-    and provides recovery-related utilities such as loading backups.
+    This cog initializes the bot, declares and starts the background jobs, and provides
+    recovery-related utilities such as loading backups.
 
     Attributes
     ----------
@@ -54,6 +66,26 @@ class MainCog(commands.Cog):
 
         self.bot = bot
 
+    async def cog_load(self):
+
+        """
+
+        Called by discord.py when the cog is added.
+
+        On a hot reload the bot is already ready and `on_ready` will not fire again,
+        so the background tasks are restarted here.
+
+        """
+
+        if self.bot.is_ready():
+            self.start_tasks()
+
+    async def cog_unload(self):
+
+        """Stops the scheduled jobs (runs in progress complete, the database worker keeps running)."""
+
+        scheduler.stop()
+
     @commands.Cog.listener(name="on_ready")
     async def starting(self):
 
@@ -64,52 +96,243 @@ class MainCog(commands.Cog):
         This method:
             - Logs that the bot is online
             - Updates the bot's Discord presence
-            - Starts the periodic sync and save background tasks
-            - Launches the asynchronous database worker
+            - Starts the background tasks (see `start_tasks`)
 
         """
 
         applogger.info("Ready to use")
         await self.bot.change_presence(activity=discord.Activity(type=discord.ActivityType.watching, name="Gameplay Database"))
+        self.start_tasks()
+
+    def start_tasks(self):
+
+        """
 
-        if not self.sync.is_running():
-            self.sync.start()
-            applogger.info("Sync task started")
+        Declares the periodic background jobs and starts the scheduler (see
+        `utilities.scheduler`), launches the asynchronous database worker and the
+        maintenance process pool, and starts the local metrics endpoint and the event
+        loop monitor.
 
-        if not self.save.is_running():
-            self.save.start()
-            applogger.info("Save task started")
+        Every step is idempotent, so this is safe on reconnections and hot reloads (jobs
+        redeclared by a reloaded cog keep their accounting and paused state).
 
-        self.bot.loop.create_task(database.database_worker())
+        """
 
-    # --- BACKGROUND TASKS ---
+        scheduler.add("sync", self.sync, every=5, jitter=1)
+        scheduler.add("backup", self.save, every=300, jitter=30)
+        if database.CHECKPOINT_PATH:
+            scheduler.add("checkpoint", self.checkpoint, every=database.CHECKPOINT_INTERVAL, jitter=5)
+        scheduler.add("optimize", self.optimize, cron="30 4 * * *", jitter=900)
+        scheduler.add("warm_cache", self.save_warm_cache, every=600, jitter=60)
+        scheduler.add("youtube_prefetch", self.prefetch_youtube, every=3600, jitter=300)
+        scheduler.add("memory", self.watch_memory, every=900, jitter=60)
+        scheduler.add("mod_whitelist", self.watch_whitelist, every=30, jitter=5)
+        scheduler.add("log_rotation", applogger.rotate, every=600, jitter=60, thread=True)
+
+        database.start_worker()
+        maintenance.start()
+        scheduler.start()
+        metrics.start_http_server()
+        loopmonitor.start(self.bot.loop)
+
+    # --- BACKGROUND JOBS ---
 
-    @tasks.loop(seconds=5)
     async def sync(self):
 
         """
 
-        Periodic synchronization task.
+        Periodic synchronization job.
 
-        Runs every 5 seconds to enqueue the `synchronize_data` function into
-        the database's asynchronous task queue, ensuring all live data is kept in sync.
+        Runs every 5 seconds to run `synchronize_data` in the maintenance process pool
+        (see `utilities.maintenance`), ensuring all live data is kept in sync. Queued
+        writes wait for it.
 
         """
-        await database.database_queue.put((database.synchronize_data, (), {}))
+        await maintenance.run("synchronize_data")
 
-    @tasks.loop(minutes=5)
     async def save(self):
 
         """
 
-        Periodic save task.
+        Periodic save job.
 
         Runs every 5 minutes to trigger an automatic database backup using the
-        recovery module. Logs its activity for traceability.
+        recovery module, in the maintenance process pool. Logs its activity for
+        traceability.
 
         """
         applogger.debug("Starting database save...")
-        recovery.create_save()
+        previous = maintenance.history.get("create_save")
+        try:
+            await maintenance.run("create_save")
+        finally:
+            # Duration measured under the database lock, without the wait for it
+            last = maintenance.history.get("create_save")
+            if last is not None and last is not previous:
+                metrics.save_duration.observe(last["duration"])
+
+    async def checkpoint(self):
+
+        """
+
+        Periodic database checkpoint job.
+
+        Only declared when the database does not survive a restart (in memory or on a tmpfs,
+        see `database.CHECKPOINT_PATH`). Runs every `GPDB_CHECKPOINT_SECONDS` to enqueue
+        `database.checkpoint`, so the copy is taken between two database jobs.
+
+        """
+        await database.database_queue.put((database.checkpoint, (), {}))
+
+    async def optimize(self):
+
+        """
+
+        Nightly database optimization job.
+
+        Runs at 04:30 (plus up to 15 minutes of jitter) to enqueue `database.optimize`,
+        which refreshes stale planner statistics. Its execution time is recorded by
+        `database_worker` (job "optimize").
+
+        """
+        await database.database_queue.put((database.optimize, (), {}))
+
+    async def save_warm_cache(self):
+
+        """
+
+        Periodic warm cache snapshot job.
+
+        Runs every 10 minutes to persist the most-queried entities and the resolved YouTube
+        metadata (see `utilities.warmcache`), so an unclean shutdown loses little of it.
+
+        """
+        warmcache.save()
+
+    async def prefetch_youtube(self):
+
+        """
+
+        Hourly YouTube metadata prefetch job.
+
+        Resolves the avatars of the most-queried artists which are not cached yet or about to
+        expire (see `utilities.warmcache`), in a thread, so `/get_artist_by_name` rarely waits
+        for the YouTube Data API.
+
+        """
+        urls = await warmcache.prefetch_candidates()
+        if urls:
+            resolved = await asyncio.to_thread(warmcache.prefetch_youtube, urls)
+            applogger.debug(f"YouTube metadata prefetched for {resolved}/{len(urls)} artists")
+
+    async def watch_memory(self):
+
+        """
+
+        Periodic memory sampling job.
+
+        Runs every 15 minutes to record the process RSS. When allocation tracing has been
+        enabled (see `/memory`), a snapshot diff of the top allocation sites is logged too.
+
+        """
+        report = memprofiler.snapshot_report()
+        if memprofiler.is_tracing():
+            applogger.info(f"Memory snapshot :\n{report}")
+        else:
+            applogger.debug(report)
+
+    async def watch_whitelist(self):
+
+        """
+
+        Periodic mod whitelist change detection.
+
+        Runs every 30 seconds and reloads the cached moderator whitelist only if
+        `mod/mod_whitelist.json` changed on disk, keeping file I/O off the
+        permission check path.
+
+        """
+        tools.mod_whitelist.refresh()
+
+    @commands.Cog.listener(name="on_app_command_completion")
+    async def record_command(self, interaction: discord.Interaction, command):
+
+        """
+
+        Records the latency and count of every successfully completed application command,
+        and logs its "command" event.
+
+        Failed commands are recorded by `ErrorHandlerCog`.
+
+        """
+
+        metrics.commands_total.inc(command=command.name, outcome="ok")
+        tracing.end_trace()
+        metrics.command_duration.observe((discord.utils.utcnow() - interaction.created_at).total_seconds(), command=command.name)
+
+    @discord.app_commands.command(name="jobs", description="Reports, pauses, resumes or runs the background jobs")
+    @discord.app_commands.describe(action="Action to perform")
+    @discord.app_commands.describe(job="Job to pause, resume or run")
+    @discord.app_commands.choices(action=[discord.app_commands.Choice(name=action, value=action)
+                                          for action in ("status", "pause", "resume", "run")])
+    async def jobs(self, interaction: discord.Interaction, action: str = "status", job: str = None):
+
+        """
+
+        Control the scheduled background jobs at runtime.
+
+        The status reports, for every job, its schedule and state, its runs, failures and
+        skipped (overlapping) runs, its last, average and maximum duration, the share of
+        the uptime spent running it and its next run. It is sent as a file when too long
+        for a message.
+
+        Parameters
+        ----------
+        interaction : discord.Interaction
+            The Discord interaction context where the command is executed.
+        action : str, optional
+            Action to perform ("status", "pause", "resume" or "run").
+        job : str, optional
+            Name of the job (required by every action but "status").
+
+        """
+
+        await tools.check_mod(interaction)
+
+        if action != "status" and scheduler.get(job) is None:
+            await interaction.response.send_message(f"Unknown job **{job}**", ephemeral=True)
+            return
+
+        match action:
+            case "pause":
+                text = f"Job **{job}** paused" if scheduler.pause(job) else f"Job **{job}** is already paused"
+            case "resume":
+                text = f"Job **{job}** resumed" if scheduler.resume(job) else f"Job **{job}** is not paused"
+            case "run":
+                await interaction.response.defer(ephemeral=True, thinking=True)
+                if not await scheduler.trigger(job):
+                    text = f"Job **{job}** is already running"
+                else:
+                    ran = scheduler.get(job)
+                    text = f"Job **{job}** ran in {ran.last_duration * 1000:.0f}ms" + (
+                        f" and failed : {ran.last_error}" if ran.last_outcome == "error" else "")
+                await interaction.edit_original_response(content=text)
+                return
+            case _:
+                report = scheduler.report()
+                if len(report) >= 1900:
+                    timestamp = datetime.today().strftime("%Y-%m-%d%H%M%S")
+                    await interaction.response.send_message(
+                        file=discord.File(io.BytesIO(report.encode("utf-8")), filename=f"jobs{timestamp}.txt"), ephemeral=True)
+                    return
+                text = f"```\n{report}\n```"
+
+        await interaction.response.send_message(text, ephemeral=True)
+
+    @jobs.autocomplete("job")
+    async def job_autocomplete(self, interaction: discord.Interaction, current: str):
+        return [discord.app_commands.Choice(name=name, value=name)
+                for name in scheduler.jobs if current in name][:25]
 
     @discord.app_commands.command(name="load_backup", description="Loads a file from save folder")
     @discord.app_commands.describe(filename="Name of the file")
@@ -133,8 +356,9 @@ class MainCog(commands.Cog):
         Behavior
         --------
         - Verifies that the user has moderator permissions using `tools.check_mod()`.
-        - Logs the command usage via `AppLogger.debug_command()`.
-        - Calls `recovery.load_save()` to restore database content from the given file.
+        - Logs the command usage on completion (see `record_command`).
+        - Runs `recovery.load_save()` in the maintenance process pool to restore database
+          content from the given file, reporting its progress and outcome to the moderator.
 
         Notes
         -----
@@ -146,10 +370,114 @@ class MainCog(commands.Cog):
         """
 
         await tools.check_mod(interaction)
-        applogger.debug_command(interaction)
-        recovery.load_save(filename)
+        await interaction.response.defer(ephemeral=True, thinking=True)
+
+        # Progress edits go through a single updater, which only sends the latest report, so an
+        # edit never overtakes another one (nor the final message)
+        pending = {"content": None}
+        updater = None
+
+        async def publish():
+            while pending["content"] is not None:
+                content, pending["content"] = pending["content"], None
+                try:
+                    await interaction.edit_original_response(content=content)
+                except discord.HTTPException as e:
+                    applogger.error(f"Failed to report the progress of {filename} : {e}")
+
+        def progress(stage, done, total):
+            nonlocal updater
+            pending["content"] = f"Loading **{filename}** : {stage} ({done}/{total})"
+            if updater is None or updater.done():
+                updater = self.bot.loop.create_task(publish())
+
+        started = time.perf_counter()
+        try:
+            restored = await maintenance.run("load_save", filename, progress=progress)
+        except Exception as e:
+            restored = e
+        pending["content"] = None
+        if updater is not None:
+            await updater
+
+        if isinstance(restored, Exception):
+            await interaction.edit_original_response(content=f"Failed to load **{filename}** : {restored}")
+            return
+
+        if restored:
+            await interaction.edit_original_response(content=f"Loaded **{filename}** in {time.perf_counter() - started:.1f}s.")
+        else:
+            await interaction.edit_original_response(content=f"**{filename}** was not found in the save folder.")
+
+    @discord.app_commands.command(name="reload_mod_whitelist", description="Reloads the moderator whitelist from disk")
+    async def reload_mod_whitelist(self, interaction: discord.Interaction):
+
+        """
+
+        Forces a reload of the cached moderator whitelist.
+
+        Useful right after editing `mod/mod_whitelist.json` when waiting for
+        the periodic change detection is not desirable.
+
+        Parameters
+        ----------
+        interaction : discord.Interaction
+            The Discord interaction context where the command is executed.
+
+        """
+
+        await tools.check_mod(interaction)
+        tools.mod_whitelist.load()
+        await interaction.response.send_message(
+            f"Mod whitelist reloaded ({len(tools.mod_whitelist.mods)} users, {len(tools.mod_whitelist.roles)} roles)",
+            ephemeral=True)
+
+    @discord.app_commands.command(name="reload_extension", description="Reloads a cog's code without restarting the bot")
+    @discord.app_commands.describe(extension="Extension to reload (e.g. cogs.query)")
+    async def reload_extension(self, interaction: discord.Interaction, extension: str):
+
+        """
+
+        Hot-reloads a cog extension.
+
+        The extension module is re-imported and its cog replaced in place; the gateway
+        connection, the `database_worker`, its queue and the caches held by `database`
+        and `utilities` modules are preserved. If the new code fails to load, discord.py
+        keeps the previous version. Application commands are re-synced only if the
+        reloaded cog changed them (see `utilities.commandsync`).
+
+        Parameters
+        ----------
+        interaction : discord.Interaction
+            The Discord interaction context where the command is executed.
+        extension : str
+            Name of the extension, as listed in `main.EXTENSIONS`.
+
+        """
+
+        await tools.check_mod(interaction)
+        await interaction.response.defer(ephemeral=True, thinking=True)
+
+        try:
+            await self.bot.reload_extension(extension)
+        except commands.ExtensionError as e:
+            applogger.error(f"Failed to reload {extension} : {e}")
+            await interaction.followup.send(f"**Failed** to reload {extension} : {e}", ephemeral=True)
+            return
+
+        synced = await commandsync.sync(self.bot.tree, self.bot.application_id)
+        applogger.info(f"Reloaded extension {extension}")
+        await interaction.followup.send(
+            f"**{extension}** reloaded{' (commands synced)' if synced is not None else ''}", ephemeral=True)
+
+    @reload_extension.autocomplete("extension")
+    async def extension_autocomplete(self, interaction: discord.Interaction, current: str):
+        return [discord.app_commands.Choice(name=name, value=name)
+                for name in sorted(self.bot.extensions) if current in name][:25]
+
 
+async def setup(bot: commands.Bot) -> None:
 
-    
+    """Extension entry point, called by `bot.load_extension` and `bot.reload_extension`."""
 
-            
\ No newline at end of file
+    await bot.add_cog(MainCog(bot))
@@ -16,6 +16,8 @@ The cog includes commands to fetch:
 Each command:
     - Queries the database via helper methods in the `database` module
     - Handles the `DataNotFound` exception if no match is found
+    - Counts the lookup in the warm cache (`utilities.warmcache`), which also caches the
+      YouTube avatars of artists
     - Logs all interactions and potential issues through the `AppLogger`
     - Returns a styled Discord embed containing detailed information
 
@@ -30,6 +32,7 @@ from discord.ext import commands
 # --- Local imports ---
 from utilities.applogger import AppLogger
 from utilities import tools
+from utilities import warmcache
 from exceptions.custom_exceptions import *
 import database
 
@@ -73,13 +76,14 @@ class QueryCog(commands.Cog):
         """
         
         try:
-            get = database.get_creator_by_name(user.global_name)
+            get = await database.call(database.get_creator_by_name, user.global_name)
         except DataNotFound:
             await interaction.response.send_message("**User** not found.")
             applogger.error(f"Empty response on {interaction.command.name} used by {interaction.user.name}")
             return
         
         creator = get[0]
+        warmcache.record("creator", user.global_name)
 
         embed = discord.Embed(
             title=f"Creator overview : {creator['username']}",
@@ -104,7 +108,6 @@ class QueryCog(commands.Cog):
 
         embed.set_image(url=user.avatar)
 
-        applogger.debug_command(interaction)
         await interaction.response.send_message(embed=embed)
 
     @discord.app_commands.command(name="get_layout_by_name", description="Retrieves data about a layout by giving name")
@@ -118,13 +121,14 @@ class QueryCog(commands.Cog):
         """
 
         try:
-            get = database.get_layout_by_name(name)
+            get = await database.call(database.get_layout_by_name, name)
         except DataNotFound:
             await interaction.response.send_message("**User** not found.")
             applogger.error(f"Empty response on {interaction.command.name} used by {interaction.user.name}")
             return
 
         layout = get[0]
+        warmcache.record("layout", name)
 
         embed = discord.Embed(
             title=f"Layout overview : {layout['name']}",
@@ -155,7 +159,6 @@ class QueryCog(commands.Cog):
 
         embed.set_image(url=tools.get_youtube_thumbnail(layout["yt"]))
         
-        applogger.debug_command(interaction)
         await interaction.response.send_message(embed=embed)
 
     @discord.app_commands.command(name="get_collab_by_name", description="Retrieves data about a collab by giving name")
@@ -169,13 +172,14 @@ class QueryCog(commands.Cog):
         """
 
         try:
-            get = database.get_collab_by_name(name)
+            get = await database.call(database.get_collab_by_name, name)
         except DataNotFound:
             await interaction.response.send_message("**Collab** not found.")
             applogger.error(f"Empty response on {interaction.command.name} used by {interaction.user.name}")
             return
 
         collab = get[0]
+        warmcache.record("collab", name)
 
         embed = discord.Embed(
             title=f"Collab overview : {collab['name']}",
@@ -204,7 +208,6 @@ class QueryCog(commands.Cog):
 
         embed.set_image(url=tools.get_youtube_thumbnail(collab["yt"]))
 
-        applogger.debug_command(interaction)
         await interaction.response.send_message(embed=embed)
 
     @discord.app_commands.command(name="get_music_by_name", description="Retrieves data about a music by giving name")
@@ -218,13 +221,14 @@ class QueryCog(commands.Cog):
         """
 
         try:
-            get = database.get_music_by_name(name)
+            get = await database.call(database.get_music_by_name, name)
         except DataNotFound:
             await interaction.response.send_message("**Music** not found.")
             applogger.error(f"Empty response on {interaction.command.name} used by {interaction.user.name}")
             return
         
         music = get[0]
+        warmcache.record("music", name)
 
         embed = discord.Embed(
             title=f"Music overview : {music['name']}",
@@ -251,7 +255,6 @@ class QueryCog(commands.Cog):
 
         embed.set_image(url=tools.get_youtube_thumbnail(music["yt"]))
         
-        applogger.debug_command(interaction)
         await interaction.response.send_message(embed=embed)
 
     @discord.app_commands.command(name="get_artist_by_name", description="Retrieves data about an artist by giving name")
@@ -265,13 +268,14 @@ class QueryCog(commands.Cog):
         """
 
         try:
-            get = database.get_artist_by_name(name)
+            get = await database.call(database.get_artist_by_name, name)
         except DataNotFound:
             await interaction.response.send_message("**Artist** not found.")
             applogger.error(f"Empty response on {interaction.command.name} used by {interaction.user.name}")
             return
         
         artist = get[0]
+        warmcache.record("artist", name)
 
         embed = discord.Embed(
             title=f"Artist overview : {artist['name']}",
@@ -293,17 +297,18 @@ class QueryCog(commands.Cog):
         embed.set_thumbnail(url=self.bot.user.avatar)
 
         try:
-            channel_api_id = tools.get_yt_channel_id(artist['yt'])
-            ytpp_url = tools.get_youtube_pp(channel_api_id)
+            ytpp_url = warmcache.youtube_avatar(artist['yt'])
         except (InvalidYouTubeURL, UnboundLocalError):
             applogger.warning(f"Failed to retrieve info due to youtube URL on {interaction.command.name} runned by {interaction.user.name}")
-            applogger.debug_command(interaction)
             await interaction.response.send_message(embed=embed)
+            return
         
         embed.set_image(url=ytpp_url)
 
-        applogger.debug_command(interaction)
         await interaction.response.send_message(embed=embed)
 
+async def setup(bot: commands.Bot) -> None:
 
+    """Extension entry point, called by `bot.load_extension` and `bot.reload_extension`."""
 
+    await bot.add_cog(QueryCog(bot))
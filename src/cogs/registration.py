@@ -20,20 +20,12 @@ Author: cobalt
 # --- Standard imports ---
 import discord
 from discord.ext import commands
-import sqlite3
 
 # --- Local imports ---
 import database
 from utilities.applogger import AppLogger
 from utilities import tools
 
-# --- Initialization section ---
-connection = sqlite3.connect("gpdb.db")
-c = connection.cursor()
-database.initialize()
-connection.commit()
-connection.close()
-
 applogger = AppLogger()
 
 class RegistrationCog(commands.Cog):
@@ -103,7 +95,6 @@ class RegistrationCog(commands.Cog):
         embed.set_footer(text="Gameplay Database", icon_url=self.bot.user.avatar)
         embed.set_thumbnail(url=self.bot.user.avatar)
 
-        applogger.debug_command(interaction)
         await interaction.response.send_message(embed=embed)
 
     @discord.app_commands.command(name="add_layout", description="Adds directly a layout and its info into the database (prior confirmation)")
@@ -171,7 +162,6 @@ class RegistrationCog(commands.Cog):
         embed.set_footer(text="Gameplay Database", icon_url=self.bot.user.avatar)
         embed.set_thumbnail(url=self.bot.user.avatar)
 
-        applogger.debug_command(interaction)
         await interaction.response.send_message(embed=embed)
 
     @discord.app_commands.command(name="add_collab", description="Adds directly a collab and its info into the database (prior confirmation)")
@@ -236,7 +226,6 @@ class RegistrationCog(commands.Cog):
         embed.set_footer(text="Gameplay Database", icon_url=self.bot.user.avatar)
         embed.set_thumbnail(url=self.bot.user.avatar)
 
-        applogger.debug_command(interaction)
         await interaction.response.send_message(embed=embed)
 
     @discord.app_commands.command(name="add_music", description="Adds directly a music track and its info into the database (prior confirmation)")
@@ -295,7 +284,6 @@ class RegistrationCog(commands.Cog):
         embed.set_footer(text="Gameplay Database", icon_url=self.bot.user.avatar)
         embed.set_thumbnail(url=self.bot.user.avatar)
 
-        applogger.debug_command(interaction)
         await interaction.response.send_message(embed=embed)
 
     @discord.app_commands.command(name="add_artist", description="Adds directly an artist and its info into the database (prior confirmation)")
@@ -345,13 +333,10 @@ class RegistrationCog(commands.Cog):
         embed.set_footer(text="Gameplay Database", icon_url=self.bot.user.avatar)
         embed.set_thumbnail(url=self.bot.user.avatar)
 
-        applogger.debug_command(interaction)
         await interaction.response.send_message(embed=embed)
 
+async def setup(bot: commands.Bot) -> None:
 
+    """Extension entry point, called by `bot.load_extension` and `bot.reload_extension`."""
 
-
-
-
-
-    
\ No newline at end of file
+    await bot.add_cog(RegistrationCog(bot))
@@ -59,7 +59,6 @@ class RequestRegistrationCog(commands.Cog):
         embed.set_footer(text="Gameplay Database", icon_url=self.bot.user.avatar)
         embed.set_thumbnail(url=self.bot.user.avatar)
 
-        applogger.debug_command(interaction)
         await interaction.response.send_message(embed=embed)
 
     # ───────────────────────────────
@@ -127,7 +126,6 @@ class RequestRegistrationCog(commands.Cog):
         embed.set_footer(text="Gameplay Database", icon_url=self.bot.user.avatar)
         embed.set_thumbnail(url=self.bot.user.avatar)
 
-        applogger.debug_command(interaction)
         await interaction.response.send_message(embed=embed)
 
     # ───────────────────────────────
@@ -192,7 +190,6 @@ class RequestRegistrationCog(commands.Cog):
         embed.set_footer(text="Gameplay Database", icon_url=self.bot.user.avatar)
         embed.set_thumbnail(url=self.bot.user.avatar)
 
-        applogger.debug_command(interaction)
         await interaction.response.send_message(embed=embed)
 
     # ───────────────────────────────
@@ -252,7 +249,6 @@ class RequestRegistrationCog(commands.Cog):
         embed.set_footer(text="Gameplay Database", icon_url=self.bot.user.avatar)
         embed.set_thumbnail(url=self.bot.user.avatar)
 
-        applogger.debug_command(interaction)
         await interaction.response.send_message(embed=embed)
 
     # ───────────────────────────────
@@ -300,7 +296,10 @@ class RequestRegistrationCog(commands.Cog):
         embed.set_footer(text="Gameplay Database", icon_url=self.bot.user.avatar)
         embed.set_thumbnail(url=self.bot.user.avatar)
 
-        applogger.debug_command(interaction)
         await interaction.response.send_message(embed=embed)
-            
-        
\ No newline at end of file
+
+async def setup(bot: commands.Bot) -> None:
+
+    """Extension entry point, called by `bot.load_extension` and `bot.reload_extension`."""
+
+    await bot.add_cog(RequestRegistrationCog(bot))
@@ -4,7 +4,6 @@ from discord.ext import commands
 import database
 from exceptions.custom_exceptions import DataNotFound
 from utilities.applogger import AppLogger
-from views.requestview import ReviewRequestView
 from utilities import tools
 
 applogger = AppLogger()
@@ -21,7 +20,7 @@ class ReviewCog(commands.Cog):
         await tools.check_mod(interaction)
         
         try:
-            next_request = database.get_oldest_request()
+            next_request = await database.call(database.get_oldest_request)
         except DataNotFound:
             await interaction.response.send_message("**No** pending requests at the moment.")
             applogger.error(f"No pending requests at the moment - Interaction user : {interaction.user.name}")
@@ -30,7 +29,7 @@ class ReviewCog(commands.Cog):
         type_, id_, date = next_request
         
         try:
-            details = database.get_request_details(type_, id_)
+            details = await database.call(database.get_request_details, type_, id_)
         except DataNotFound:
             await interaction.response.send_message("Failed to fetch requests details, check traceback in *latest.log* for more details")
             applogger.error(f"No pending requests at the moment - Interaction user : {interaction.user.name}")
@@ -97,11 +96,13 @@ class ReviewCog(commands.Cog):
         embed.set_footer(text="Gameplay Database", icon_url=self.bot.user.avatar)
         embed.set_thumbnail(url=self.bot.user.avatar)
 
+        from views.requestview import ReviewRequestView
+
         view = ReviewRequestView(request_type=type_, request_id=id_)
         await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
 
+async def setup(bot: commands.Bot) -> None:
 
+    """Extension entry point, called by `bot.load_extension` and `bot.reload_extension`."""
 
-            
-        
-        
+    await bot.add_cog(ReviewCog(bot))
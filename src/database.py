@@ -7,33 +7,60 @@ Description: Contains a collection of methods which allows the application to in
 This module handles all interactions with the SQLite database for the Gameplay Database bot.
 It provides:
 
-- Initialization of tables (official + request tables)
+- Versioned schema migrations (official + request tables, indexes), applied at startup
 - Registration functions for creators, layouts, collabs, music, and artists
 - Retrieval functions for single or multiple records
 - Database synchronization functions to keep IDs and counts updated
 - An asynchronous worker for queued database operations with locking
+- Per-call time and VM-step budgets for reads and maintenance jobs
+- A single connection factory, with a configurable location and an in-memory mode
+  checkpointed to disk
+- An optional in-memory read replica serving the entity lookups
 
 Author: cobalt
 
 """
 
 # --- Standard imports ---
+from pathlib import Path
 import sqlite3
 from datetime import datetime
 import asyncio
+import functools
+import inspect
+import logging
+import os
+import time
 
 # --- Local imports ---
 from utilities import tools
 from utilities.applogger import AppLogger
-from exceptions.custom_exceptions import DataNotFound
-
-# --- Async database queue and lock ---
-database_queue = asyncio.Queue()
-database_lock = asyncio.Lock()
+from utilities import metrics
+from utilities import sqlstats
+from utilities import tracing
+from exceptions.custom_exceptions import DataNotFound, MigrationError, QueryBudgetExceeded
 
 # --- Application logger ---
 applogger = AppLogger()
 
+# --- Async database queue and lock ---
+# Producers put (function, args, kwargs) tuples; the worker receives them wrapped in a
+# `tracing.QueueEntry` carrying the producer's trace and the enqueue time.
+# `database_queue` and `database_lock` are created on first use (see `__getattr__`),
+# so importing this module has no side effect.
+
+def _create_queue():
+    if "database_queue" not in globals():
+        globals()["database_queue"] = tracing.TracedQueue()
+        globals()["database_lock"] = asyncio.Lock()
+        metrics.database_queue_depth.set_function(database_queue.qsize)
+
+def __getattr__(name):
+    if name in ("database_queue", "database_lock"):
+        _create_queue()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 async def database_worker():
 
     """
@@ -46,41 +73,473 @@ async def database_worker():
     Each task is a tuple of (function, args, kwargs). Supports both
     coroutine functions and regular functions.
 
+    Lock wait, execution time and outcome of every job are recorded in `metrics`,
+    and as spans of the producer's trace (queue wait, lock wait, execution, commit).
+
+    When the read replica is enabled, a refresh is scheduled after every job which changed
+    rows (see `schedule_replica_refresh`).
+
     """
 
+    _create_queue()
+
     while True:
-        function, args, kwargs = await database_queue.get()
+        entry = await database_queue.get()
+        function, args, kwargs = entry.item
+        job = getattr(function, "__name__", "unknown")
+        outcome = "ok"
+        token = tracing.attach(entry.trace)
         try:
+            wait_start = time.perf_counter()
+            tracing.record("queue_wait", time.time() - (wait_start - entry.enqueued_at), wait_start - entry.enqueued_at, job=job)
             async with database_lock:
-                if asyncio.iscoroutinefunction(function):
-                    await function(*args, **kwargs)
-                else:
-                    function(*args, **kwargs)
+                start = time.perf_counter()
+                metrics.database_lock_wait.observe(start - wait_start, job=job)
+                tracing.record("lock_wait", time.time() - (start - wait_start), start - wait_start, job=job)
+                try:
+                    with tracing.span("execute", job=job):
+                        if asyncio.iscoroutinefunction(function):
+                            await function(*args, **kwargs)
+                        else:
+                            function(*args, **kwargs)
+                finally:
+                    metrics.database_job_duration.observe(time.perf_counter() - start, job=job)
+                if replica is not None:
+                    with tracing.span("replica_refresh", job=job):
+                        schedule_replica_refresh()
         except Exception as e:
+            outcome = "error"
             applogger.error(f"Database error : {e}")
         finally:
+            tracing.detach(token)
+            metrics.database_jobs_total.inc(job=job, outcome=outcome)
             database_queue.task_done()
 
 
+_worker_task = None
+
+def start_worker() -> asyncio.Task:
+
+    """
+
+    Starts `database_worker` on the running event loop, unless it is already running.
+
+    The task lives in this module, so reloading cog extensions (or a repeated
+    `on_ready` after a reconnection) never starts a second worker on the queue.
+
+    """
+
+    global _worker_task
+
+    if _worker_task is None or _worker_task.done():
+        _worker_task = asyncio.get_running_loop().create_task(database_worker(), name="gpdb-database-worker")
+    return _worker_task
+
+async def call(function, *args, **kwargs):
+
+    """
+
+    Calls a database operation (`get_*`, request queue functions, `recovery` backups...)
+    from the event loop.
+
+    When the operations are routed to the database service (see `utilities.dbclient`), the
+    call is awaited on the service's asynchronous connection instead of making a blocking
+    round-trip, so the event loop keeps running while the service is busy. Otherwise the
+    function is called directly (and awaited if it returns an awaitable).
+
+    Example
+    -------
+    >>> layout = (await database.call(database.get_layout_by_name, "Bloodbath"))[0]
+
+    """
+
+    remote = getattr(function, "remote", None)
+    result = remote(*args, **kwargs) if remote is not None else function(*args, **kwargs)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+# --- Database location ---
+# GPDB_DATABASE is the database file, or ":memory:" for a RAM-resident database. A database
+# which does not survive a restart (in memory, or on a tmpfs) is restored at startup from
+# GPDB_DATABASE_CHECKPOINT and copied back to it every GPDB_CHECKPOINT_SECONDS.
+# The default file sits at the project root, like saves/, logs/ and cache/; a database
+# left in src/ by earlier versions (started from src/) keeps being used until moved.
+DEFAULT_DATABASE_PATH = Path(__file__).parent.parent / "gpdb.db"
+LEGACY_DATABASE_PATH = Path(__file__).parent / "gpdb.db"
+if not DEFAULT_DATABASE_PATH.exists() and LEGACY_DATABASE_PATH.exists():
+    DEFAULT_DATABASE_PATH = LEGACY_DATABASE_PATH
+DATABASE_PATH = os.getenv("GPDB_DATABASE", str(DEFAULT_DATABASE_PATH))
+IN_MEMORY = DATABASE_PATH == ":memory:"
+CHECKPOINT_PATH = os.getenv("GPDB_DATABASE_CHECKPOINT") or (str(DEFAULT_DATABASE_PATH) if IN_MEMORY else None)
+CHECKPOINT_INTERVAL = float(os.getenv("GPDB_CHECKPOINT_SECONDS", 60))
+
 # --- Database connection ---
-connection = sqlite3.connect("gpdb.db")
-connection.row_factory = sqlite3.Row
-cursor = connection.cursor()
-cursor.execute("PRAGMA foreign_keys = ON;")
+# Opened by `connect()` (called by `initialize()` at startup), not at import
+connection = None
+cursor = None
 
-# -------------------- DATABASE INITIALIZATION --------------------
+def open_connection(path: str = None) -> sqlite3.Connection:
+
+    """
 
-def initialize():
+    Connection factory of the application: every connection to the database is opened here.
+
+    Parameters
+    ----------
+    path : str, optional
+        Database file. Defaults to `GPDB_DATABASE`.
+
+    Returns
+    -------
+    sqlite3.Connection
+        A connection recording its commits in the current trace, returning `sqlite3.Row`
+        rows, with foreign key enforcement enabled.
+
+    """
+
+    new_connection = sqlite3.connect(path or DATABASE_PATH, factory=tracing.TracedConnection)
+    new_connection.row_factory = sqlite3.Row
+    new_connection.execute("PRAGMA foreign_keys = ON;")
+    return new_connection
+
+def connect() -> sqlite3.Connection:
 
     """
 
-    Initializes the database by creating all required tables if they do not exist.
+    Opens the shared connection and cursor used by every function of this module.
+
+    When the database does not exist yet (always the case in memory) and a checkpoint
+    is configured, the checkpoint is restored into it first.
+
+    Does nothing if the connection is already open.
 
-    Includes both official tables (creator, layout, collab, music, artist) and
-    request tables (requestcreator, requestlayout, requestcollab, requestmusic, requestartist).
+    Returns
+    -------
+    sqlite3.Connection
+        The shared connection.
 
     """
 
+    global connection, cursor
+
+    if connection is None:
+        restore = CHECKPOINT_PATH is not None and (IN_MEMORY or not Path(DATABASE_PATH).exists())
+        connection = open_connection()
+        cursor = connection.cursor(factory=sqlstats.InstrumentedCursor)
+        applogger.info(f"Database opened at {Path(DATABASE_PATH).resolve() if not IN_MEMORY else DATABASE_PATH}")
+        if Path(DATABASE_PATH) == LEGACY_DATABASE_PATH:
+            applogger.warning(f"Using the database in src/, move it to {Path(__file__).parent.parent / 'gpdb.db'} "
+                              f"(or set GPDB_DATABASE)")
+
+        if restore and Path(CHECKPOINT_PATH).exists():
+            source = sqlite3.connect(CHECKPOINT_PATH)
+            try:
+                source.backup(connection)
+            finally:
+                source.close()
+            applogger.info(f"Database restored from checkpoint {CHECKPOINT_PATH}")
+    return connection
+
+def checkpoint() -> Path | None:
+
+    """
+
+    Copies the database to `GPDB_DATABASE_CHECKPOINT` with SQLite's online backup API.
+
+    The copy is written next to the checkpoint and renamed over it, so a crash during a
+    checkpoint leaves the previous one intact. Pending writes of the shared connection
+    are committed first (the backup of a connection inside a write transaction never
+    completes), so this should run through `database_queue`, between jobs.
+
+    Returns
+    -------
+    Path | None
+        The checkpoint file, or None if no checkpoint is configured.
+
+    """
+
+    if CHECKPOINT_PATH is None:
+        return None
+
+    if connection.in_transaction:
+        connection.commit()
+
+    target_path = Path(CHECKPOINT_PATH)
+    temporary = target_path.with_suffix(".tmp")
+    start = time.perf_counter()
+    target = sqlite3.connect(temporary)
+    try:
+        connection.backup(target)
+    finally:
+        target.close()
+    os.replace(temporary, target_path)
+
+    applogger.debug(f"Database checkpointed to {target_path} in {(time.perf_counter() - start) * 1000:.0f}ms")
+    return target_path
+
+def optimize():
+
+    """
+
+    Runs SQLite's `PRAGMA optimize`, which refreshes the planner statistics (ANALYZE) of
+    the tables whose statistics are missing or stale, with a bounded cost per index
+    (`analysis_limit`). The statistics reach the read replica with its next refresh.
+
+    Should run through `database_queue`, between jobs.
+
+    """
+
+    start = time.perf_counter()
+    connection.execute("PRAGMA analysis_limit = 400;")
+    connection.execute("PRAGMA optimize;")
+    connection.commit()
+    applogger.debug(f"Database optimized in {(time.perf_counter() - start) * 1000:.0f}ms")
+
+# -------------------- READ REPLICA --------------------
+
+# With GPDB_READ_REPLICA=1, a full in-memory copy of the database serves the entity lookups
+# (`get_*_by_name`, `get_creators`...) of the query commands, so they run at in-RAM speed and
+# never wait behind the writes and sync passes of the shared connection. The copy is rebuilt
+# with the online backup API after write jobs (see `database_worker`) and swapped in at once,
+# so readers never see a partially refreshed replica. Refreshes are coalesced: the replica
+# lags the primary by at most GPDB_REPLICA_MAX_LAG_MS, and a burst of writes costs one copy
+# per interval instead of one per job. It doubles the memory held by the database. Lookups
+# made by maintenance jobs (e.g. `synchronize_data`) and the request queue functions, which
+# must never see a request already deleted, keep reading the primary.
+READ_REPLICA = os.getenv("GPDB_READ_REPLICA", "0") == "1"
+REPLICA_MAX_LAG = float(os.getenv("GPDB_REPLICA_MAX_LAG_MS", 250)) / 1000
+
+replica = None
+replica_cursor = None
+# `connection.total_changes`, `PRAGMA data_version` and `time.monotonic()` when the replica
+# was last refreshed
+_replica_changes = None
+_replica_data_version = None
+_replica_refreshed_at = 0.0
+_refresh_scheduled = False
+
+def refresh_replica(force: bool = False) -> bool:
+
+    """
+
+    Rebuilds the read replica from the shared connection, if the database changed since the
+    last refresh (see `replica_stale`) or `force` is set. Does nothing unless
+    `GPDB_READ_REPLICA` is enabled.
+
+    The refresh is skipped while the shared connection is inside a write transaction (its
+    backup would never complete); the next job to finish retries it.
+
+    Returns
+    -------
+    bool
+        Whether the replica was refreshed.
+
+    """
+
+    global replica, replica_cursor, _replica_changes, _replica_data_version, _replica_refreshed_at
+
+    if not READ_REPLICA or connection.in_transaction:
+        return False
+    if not force and replica is not None and not replica_stale():
+        return False
+
+    start = time.perf_counter()
+    fresh = open_connection(":memory:")
+    connection.backup(fresh)
+    fresh.execute("PRAGMA query_only = ON;")
+
+    previous = replica
+    replica, replica_cursor = fresh, fresh.cursor(factory=sqlstats.InstrumentedCursor)
+    _replica_changes = connection.total_changes
+    _replica_data_version = _data_version()
+    _replica_refreshed_at = time.monotonic()
+    if previous is not None:
+        previous.close()
+
+    metrics.replica_refresh_duration.observe(time.perf_counter() - start)
+    return True
+
+def _data_version() -> int:
+    return connection.execute("PRAGMA data_version;").fetchone()[0]
+
+def replica_stale() -> bool:
+
+    """
+
+    Whether the database changed since the last replica refresh: rows changed through the
+    shared connection (`total_changes`), or commits made by another connection, such as the
+    maintenance workers (`PRAGMA data_version`, which ignores the connection's own commits).
+
+    """
+
+    return connection.total_changes != _replica_changes or _data_version() != _replica_data_version
+
+def schedule_replica_refresh():
+
+    """
+
+    Refreshes the replica after a write job: at once if the last refresh is older than
+    `REPLICA_MAX_LAG`, otherwise as a queued `refresh_replica` job when it will be.
+
+    """
+
+    global _refresh_scheduled
+
+    if _refresh_scheduled or connection.total_changes == _replica_changes:
+        return
+
+    wait = _replica_refreshed_at + REPLICA_MAX_LAG - time.monotonic()
+    if wait <= 0:
+        refresh_replica()
+        return
+
+    _refresh_scheduled = True
+    asyncio.get_running_loop().call_later(wait, _enqueue_refresh)
+
+def _enqueue_refresh():
+    global _refresh_scheduled
+    _refresh_scheduled = False
+    if _worker_task is None:
+        # No worker (database service): operations already run one at a time
+        refresh_replica()
+    else:
+        database_queue.put_nowait((refresh_replica, (), {}))
+
+def _reader() -> sqlite3.Cursor:
+
+    """Returns the cursor serving entity lookups: the replica's, except inside maintenance jobs."""
+
+    if replica_cursor is not None and (QueryBudget.active is None or QueryBudget.active.kind == "interactive"):
+        return replica_cursor
+    return cursor
+
+# -------------------- PROGRESS --------------------
+
+# Long maintenance jobs report their progress as (stage, done, total), total being 0 when
+# unknown. `utilities.maintenance` sets the callback in its worker processes.
+progress_callback = None
+
+def report_progress(stage: str, done: int, total: int = 0):
+    if progress_callback is not None:
+        progress_callback(stage, done, total)
+
+# -------------------- QUERY BUDGETS --------------------
+
+# Budgets are (seconds, VM steps); None disables the corresponding limit.
+# Interactive reads answer slash commands and must never hog the connection,
+# maintenance jobs (sync, restore) are allowed to run much longer.
+QUERY_BUDGETS = {
+    "interactive": (float(os.getenv("GPDB_INTERACTIVE_QUERY_MS", 250)) / 1000,
+                    int(os.getenv("GPDB_INTERACTIVE_QUERY_STEPS", 5_000_000)) or None),
+    "maintenance": (float(os.getenv("GPDB_MAINTENANCE_QUERY_SECONDS", 120)), None),
+}
+
+# Number of SQLite VM instructions between two progress handler calls
+PROGRESS_GRANULARITY = 1000
+
+class QueryBudget:
+
+    """
+
+    Time and VM-step budget enforced on `connection` (and on the read replica) through
+    `set_progress_handler`.
+
+    While a budget is active, SQLite calls `_check` every `PROGRESS_GRANULARITY`
+    instructions; once the deadline or the step limit is exceeded the running
+    statement is interrupted (`sqlite3.OperationalError`), which `budgeted`
+    turns into `QueryBudgetExceeded`.
+
+    """
+
+    # Budget currently installed on the connection (budgets do not nest, see `budgeted`)
+    active = None
+
+    def __init__(self, kind: str, name: str):
+        self.kind = kind
+        self.name = name
+        self.seconds, self.max_steps = QUERY_BUDGETS[kind]
+        self.steps = 0
+        self.exceeded = False
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        self.deadline = self.start + self.seconds if self.seconds else None
+        QueryBudget.active = self
+        if self.deadline or self.max_steps:
+            for target in self._connections():
+                target.set_progress_handler(self._check, PROGRESS_GRANULARITY)
+        return self
+
+    def __exit__(self, *exc_info):
+        for target in self._connections():
+            target.set_progress_handler(None, PROGRESS_GRANULARITY)
+        QueryBudget.active = None
+
+    @staticmethod
+    def _connections():
+        return (connection,) if replica is None else (connection, replica)
+
+    def _check(self):
+        self.steps += PROGRESS_GRANULARITY
+        if (self.max_steps and self.steps > self.max_steps) or (self.deadline and time.perf_counter() > self.deadline):
+            self.exceeded = True
+            return 1
+        return 0
+
+def budgeted(kind: str):
+
+    """
+
+    Decorator running a database function under the `kind` budget of `QUERY_BUDGETS`.
+
+    Calls nested inside an already budgeted call (e.g. lookups made by
+    `synchronize_data`) run under the outer budget. Aborts are counted per
+    query and budget in `metrics.query_aborts_total`; maintenance jobs are
+    rolled back when aborted.
+
+    Raises
+    ------
+    QueryBudgetExceeded
+        If the call exceeded its budget.
+
+    """
+
+    def decorator(function):
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if QueryBudget.active is not None:
+                return function(*args, **kwargs)
+
+            with QueryBudget(kind, function.__name__) as budget, tracing.span("sql", query=function.__name__):
+                try:
+                    return function(*args, **kwargs)
+                except sqlite3.OperationalError:
+                    if not budget.exceeded:
+                        raise
+                    if kind == "maintenance" and connection.in_transaction:
+                        connection.rollback()
+                    elapsed = time.perf_counter() - budget.start
+                    metrics.query_aborts_total.inc(query=budget.name, budget=kind)
+                    applogger.error(f"Aborted {function.__name__} : exceeded {kind} budget after {elapsed * 1000:.0f}ms and ~{budget.steps} VM steps")
+                    raise QueryBudgetExceeded(f"{function.__name__} exceeded its {kind} query budget ({elapsed * 1000:.0f}ms, ~{budget.steps} steps)")
+
+        return wrapper
+
+    return decorator
+
+# -------------------- SCHEMA MIGRATIONS --------------------
+
+# The schema version is stored in `PRAGMA user_version`. Every migration is applied once,
+# in order, inside its own transaction which also bumps the version; never edit a migration
+# once released, add a new one instead (new columns, indexes, triggers...).
+
+def _migration_base_schema(cursor):
+
+    # Databases created before schema versioning (user_version 0) already have these tables
+
     # --- Official tables ---
     cursor.execute(''' CREATE TABLE IF NOT EXISTS creator (id INTEGER PRIMARY KEY AUTOINCREMENT,
                    username TEXT NOT NULL,
@@ -160,7 +619,7 @@ def initialize():
                    recorder_name TEXT,
                    recorder_notes TEXT)''')
     
-    # REQUESTS TABLES
+    # --- Request tables ---
 
     cursor.execute(''' CREATE TABLE IF NOT EXISTS requestcreator (id INTEGER PRIMARY KEY AUTOINCREMENT,
                    username TEXT NOT NULL,
@@ -219,16 +678,105 @@ def initialize():
                    registration_date TEXT,
                    recorder_name TEXT,
                    recorder_notes TEXT)''')
-    
-    connection.commit()
+
+def _migration_indexes(cursor):
+
+    # Name lookups (get_*_by_name, also used by synchronize_data); artist.name is UNIQUE
+    cursor.execute(''' CREATE INDEX IF NOT EXISTS idx_creator_username ON creator (username); ''')
+    cursor.execute(''' CREATE INDEX IF NOT EXISTS idx_layout_name ON layout (name); ''')
+    cursor.execute(''' CREATE INDEX IF NOT EXISTS idx_collab_name ON collab (name); ''')
+    cursor.execute(''' CREATE INDEX IF NOT EXISTS idx_music_name ON music (name); ''')
+
+    # Foreign keys counted by synchronize_data
+    cursor.execute(''' CREATE INDEX IF NOT EXISTS idx_layout_creator_id ON layout (creator_id); ''')
+    cursor.execute(''' CREATE INDEX IF NOT EXISTS idx_layout_music_id ON layout (music_id); ''')
+    cursor.execute(''' CREATE INDEX IF NOT EXISTS idx_layout_artist_id ON layout (artist_id); ''')
+    cursor.execute(''' CREATE INDEX IF NOT EXISTS idx_collab_artist_id ON collab (artist_id); ''')
+    cursor.execute(''' CREATE INDEX IF NOT EXISTS idx_music_artist_id ON music (artist_id); ''')
+
+    # Request queue ordering (get_oldest_request merges these in order)
+    for table in ("requestcreator", "requestlayout", "requestcollab", "requestmusic", "requestartist"):
+        cursor.execute(f''' CREATE INDEX IF NOT EXISTS idx_{table}_registration_date ON {table} (registration_date); ''')
+
+MIGRATIONS = (
+    (1, "official and request tables", _migration_base_schema),
+    (2, "lookup, synchronization and request queue indexes", _migration_indexes),
+)
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+# -------------------- DATABASE INITIALIZATION --------------------
+
+def schema_version(target: sqlite3.Cursor = None) -> int:
+    return (target or cursor).execute("PRAGMA user_version;").fetchone()[0]
+
+def initialize(target: sqlite3.Connection = None) -> int:
+
+    """
+
+    Opens the database connection if needed, and brings the database schema to
+    `SCHEMA_VERSION`, applying pending `MIGRATIONS`.
+
+    When the schema is current (the common case) this is a single pragma read. Otherwise
+    each pending migration runs in its own transaction, together with the version bump,
+    so a failed migration leaves the schema at the previous version.
+
+    Called once at startup (`GameplayDatabase.setup_hook`), so it also (re)builds the read
+    replica when it is enabled, and on the staging copy of a restored backup (`target`).
+
+    Parameters
+    ----------
+    target : sqlite3.Connection, optional
+        Database to migrate instead of the shared connection (which is then left unopened).
+
+    Returns
+    -------
+    int
+        The schema version.
+
+    Raises
+    ------
+    MigrationError
+        If a migration failed or the database schema is newer than this code.
+
+    """
+
+    if target is None:
+        connect()
+    migrated, migration_cursor = (connection, cursor) if target is None else (target, target.cursor())
+    version = schema_version(migration_cursor)
+    if version > SCHEMA_VERSION:
+        raise MigrationError(f"Database schema v{version} is newer than the supported v{SCHEMA_VERSION}")
+
+    for number, description, migration in MIGRATIONS:
+        if number <= version:
+            continue
+        begun = False
+        try:
+            migration_cursor.execute("BEGIN IMMEDIATE;")
+            begun = True
+            migration(migration_cursor)
+            migration_cursor.execute(f"PRAGMA user_version = {number};")
+            migrated.commit()
+        except sqlite3.Error as e:
+            # A failed BEGIN (lock timeout, transaction already open) has nothing of ours to roll back
+            if begun:
+                migrated.rollback()
+            applogger.error(f"Migration {number} ({description}) failed : {e}")
+            raise MigrationError(f"Migration {number} ({description}) failed : {e}") from e
+        applogger.info(f"Applied migration {number} : {description}")
+
+    if READ_REPLICA and target is None:
+        refresh_replica(force=True)
+    return SCHEMA_VERSION
 
 def clear():
 
     """
 
-    Drops all official tables and resets the SQLite autoincrement sequence.
+    Drops all official and request tables and resets the SQLite autoincrement sequence.
 
-    This is useful for resetting the database during development or testing.
+    This is useful for resetting the database during development or testing. The schema
+    version is reset, so `initialize()` recreates the schema afterwards.
     Foreign key checks are temporarily disabled during the drop operation.
 
     """
@@ -241,7 +789,14 @@ def clear():
     cursor.execute("DROP TABLE IF EXISTS music;")
     cursor.execute("DROP TABLE IF EXISTS artist;")
 
+    cursor.execute("DROP TABLE IF EXISTS requestcreator;")
+    cursor.execute("DROP TABLE IF EXISTS requestlayout;")
+    cursor.execute("DROP TABLE IF EXISTS requestcollab;")
+    cursor.execute("DROP TABLE IF EXISTS requestmusic;")
+    cursor.execute("DROP TABLE IF EXISTS requestartist;")
+
     cursor.execute("DELETE FROM sqlite_sequence;")
+    cursor.execute("PRAGMA user_version = 0;")
 
     connection.commit()
     cursor.execute("PRAGMA foreign_keys = ON;")
@@ -473,6 +1028,7 @@ def register_request_artist(name, yt, soundcloud, recorder_notes, registrator):
 
 # -------------------- RETRIEVAL FUNCTIONS --------------------
 
+@budgeted("interactive")
 def get_creator_by_name(username):
 
     """
@@ -486,8 +1042,9 @@ def get_creator_by_name(username):
 
     """
 
-    cursor.execute('''SELECT * FROM creator WHERE username = ?;''', (username,))
-    result = cursor.fetchall()
+    reader = _reader()
+    reader.execute('''SELECT * FROM creator WHERE username = ?;''', (username,))
+    result = reader.fetchall()
     if not result:
         raise DataNotFound(f"No creator found with username '{username}'")
     return result
@@ -495,67 +1052,86 @@ def get_creator_by_name(username):
 # --- Similarly, get_layout_by_name, get_collab_by_name, get_music_by_name, get_artist_by_name ---
 # All raise DataNotFound if no result is found.
 
+@budgeted("interactive")
 def get_layout_by_name(layout_name):
-    cursor.execute('''SELECT * FROM layout WHERE name = ?;''', (layout_name,))
-    result = cursor.fetchall()
+    reader = _reader()
+    reader.execute('''SELECT * FROM layout WHERE name = ?;''', (layout_name,))
+    result = reader.fetchall()
     if not result:
         raise DataNotFound(f"No layout found with name '{layout_name}'")
     return result
 
 
+@budgeted("interactive")
 def get_collab_by_name(collab_name):
-    cursor.execute('''SELECT * FROM collab WHERE name = ?;''', (collab_name,))
-    result = cursor.fetchall()
+    reader = _reader()
+    reader.execute('''SELECT * FROM collab WHERE name = ?;''', (collab_name,))
+    result = reader.fetchall()
     if not result:
         raise DataNotFound(f"No collab found with name '{collab_name}'")
     return result
 
 
+@budgeted("interactive")
 def get_music_by_name(music_name):
-    cursor.execute('''SELECT * FROM music WHERE name = ?;''', (music_name,))
-    result = cursor.fetchall()
+    reader = _reader()
+    reader.execute('''SELECT * FROM music WHERE name = ?;''', (music_name,))
+    result = reader.fetchall()
     if not result:
         raise DataNotFound(f"No music found with name '{music_name}'")
     return result
 
 
+@budgeted("interactive")
 def get_artist_by_name(artist_name):
-    cursor.execute('''SELECT * FROM artist WHERE name = ?;''', (artist_name,))
-    result = cursor.fetchall()
+    reader = _reader()
+    reader.execute('''SELECT * FROM artist WHERE name = ?;''', (artist_name,))
+    result = reader.fetchall()
     if not result:
         raise DataNotFound(f"No artist found with name '{artist_name}'")
     return result
 
 
+@budgeted("interactive")
 def get_creators():
 
     """Returns all creators as a list of rows."""
 
-    cursor.execute(''' SELECT * FROM creator; ''')
-    return cursor.fetchall()
+    reader = _reader()
+    reader.execute(''' SELECT * FROM creator; ''')
+    return reader.fetchall()
 
 # --- Similarly, get_layouts, get_collabs, get_musics, get_artists ---
 
+@budgeted("interactive")
 def get_layouts():
-    cursor.execute(''' SELECT * FROM layout; ''')
-    return cursor.fetchall()
+    reader = _reader()
+    reader.execute(''' SELECT * FROM layout; ''')
+    return reader.fetchall()
 
 
+@budgeted("interactive")
 def get_collabs():
-    cursor.execute(''' SELECT * FROM collab; ''')
-    return cursor.fetchall()
+    reader = _reader()
+    reader.execute(''' SELECT * FROM collab; ''')
+    return reader.fetchall()
 
 
+@budgeted("interactive")
 def get_musics():
-    cursor.execute(''' SELECT * FROM music; ''')
-    return cursor.fetchall()
+    reader = _reader()
+    reader.execute(''' SELECT * FROM music; ''')
+    return reader.fetchall()
 
 
+@budgeted("interactive")
 def get_artists():
-    cursor.execute(''' SELECT * FROM artist; ''')
-    return cursor.fetchall()
+    reader = _reader()
+    reader.execute(''' SELECT * FROM artist; ''')
+    return reader.fetchall()
 
 
+@budgeted("maintenance")
 def synchronize_data():
 
     """
@@ -571,6 +1147,8 @@ def synchronize_data():
         
     # --- Update layout, collab, and music IDs ---
 
+    report_progress("layout references", 0, 5)
+
     cursor.execute(''' SELECT id, creator_name, music_name, music_artist FROM layout WHERE creator_id IS NULL OR artist_id IS NULL OR music_id is NULL; ''')
     layouts = cursor.fetchall()
 
@@ -590,6 +1168,8 @@ def synchronize_data():
 
     # --- Update collab table IDs similarly ---
 
+    report_progress("collab and music references", 1, 5)
+
     cursor.execute(''' SELECT id, host_name, music_name, music_artist FROM collab WHERE host_id IS NULL OR artist_id IS NULL OR music_id is NULL; ''')
     collabs = cursor.fetchall()
 
@@ -618,6 +1198,8 @@ def synchronize_data():
 
     # --- Update creator stats (layouts_registered, collab_participations, total_time_built) ---
 
+    report_progress("creator stats", 2, 5)
+
     creators = get_creators()
 
     for creator in creators:
@@ -637,6 +1219,8 @@ def synchronize_data():
 
     # --- Updates music uses ---
 
+    report_progress("music uses", 3, 5)
+
     cursor.execute(''' SELECT id FROM music; ''')
     musics = cursor.fetchall()
 
@@ -649,6 +1233,8 @@ def synchronize_data():
 
     # --- Updates songs registered count and total song uses ---
 
+    report_progress("artist stats", 4, 5)
+
     cursor.execute(''' SELECT id, name FROM artist; ''')
     artists = cursor.fetchall()
 
@@ -666,10 +1252,12 @@ def synchronize_data():
         cursor.execute(''' UPDATE artist SET total_song_uses = ? WHERE id = ?; ''', (tt, id,))
     
     connection.commit()
+    report_progress("done", 5, 5)
 
-    applogger.info("Database successfully synced")
+    applogger.event("sync", "Database successfully synced", level=logging.INFO)
 
 
+@budgeted("maintenance")
 def execute_queries(queries):
 
     """
@@ -688,6 +1276,7 @@ def execute_queries(queries):
     cursor.executescript(sql_script)
     connection.commit()
 
+@budgeted("interactive")
 def get_oldest_request():
 
     
@@ -711,6 +1300,7 @@ def get_oldest_request():
         raise DataNotFound(f"No request found")
     return result
 
+@budgeted("interactive")
 def get_request_details(type_, id_):
 
     table = f"request{type_}"
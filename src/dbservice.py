@@ -0,0 +1,199 @@
+"""
+
+File: dbservice.py
+
+Description: Out-of-process database service.
+
+Owns the database (`GPDB_DATABASE`) and exposes the operations of `database` and
+`utilities.recovery` (registrations, lookups, sync, request queue, backups, checkpoints)
+on a Unix-domain socket, using the binary protocol of `utilities.dbprotocol`. Bot
+processes started with GPDB_DATABASE_SERVICE set to the same socket forward their database
+calls to it (see `utilities.dbclient`), so SQLite work and backups no longer share the bot's
+interpreter with the gateway, and several bot processes can share one database.
+
+The service is the only writer. Writes run one at a time on the service's connection, in
+the order they are received, under `database.database_lock`. The heavy maintenance jobs
+(sync, backups, restores) run in the service's maintenance process pool (see
+`utilities.maintenance`), holding the same lock, so the service keeps answering lookups
+while they run (unless the database lives in memory: the jobs then run in the service's
+process). Lookups are answered at once, so responses may come back in a different
+order than their requests; clients match them by request id. With GPDB_READ_REPLICA=1,
+lookups are served by the in-memory replica, refreshed after writes as in the bot (see
+`database`).
+
+The socket is created with owner-only permissions. On SIGINT/SIGTERM the service stops
+accepting requests and checkpoints the database (when it lives in memory or on a tmpfs).
+
+The service logs to `logs/dbservice.log` unless GPDB_LOG_FILE is set: `logs/latest.log`
+belongs to the bot, which rotates it.
+
+Usage (from src/):
+    python dbservice.py [--socket ../cache/gpdb.sock]
+
+Author: cobalt
+
+"""
+
+# --- Standard imports ---
+from pathlib import Path
+import argparse
+import asyncio
+import os
+import signal
+import time
+
+# Set before the first `AppLogger` is created (by the imports below)
+os.environ.setdefault("GPDB_LOG_FILE", str(Path(__file__).parent.parent / "logs" / "dbservice.log"))
+
+# --- Local imports ---
+import database
+from utilities.applogger import AppLogger
+from utilities import dbclient
+from utilities import dbprotocol
+from utilities import maintenance
+from utilities import recovery
+
+# --- Service settings ---
+DEFAULT_SOCKET = Path(__file__).parent.parent / "cache" / "gpdb.sock"
+
+# --- Application logger ---
+applogger = AppLogger()
+
+OPERATIONS = {
+    **{name: getattr(database, name) for name in dbclient.QUEUED_OPERATIONS + dbclient.DIRECT_OPERATIONS},
+    **{name: getattr(recovery, name) for name in dbclient.RECOVERY_OPERATIONS},
+}
+
+# Writers of the connected clients, closed when the service stops
+clients: set[asyncio.StreamWriter] = set()
+
+# Operations writing to the database, serialized with `database.database_lock`
+WRITE_OPERATIONS = frozenset(dbclient.QUEUED_OPERATIONS) | {"initialize", "clear", "execute_queries"}
+
+def execute(request_id: int, operation: str, args, kwargs) -> bytes:
+
+    """Runs one call and returns its response frame (an ERROR frame if it raised)."""
+
+    try:
+        function = OPERATIONS.get(operation)
+        if function is None:
+            raise LookupError(f"Unknown operation '{operation}'")
+        start = time.perf_counter()
+        result = function(*args, **kwargs)
+        if database.replica is not None:
+            database.schedule_replica_refresh()
+        applogger.debug(f"{operation} served in {(time.perf_counter() - start) * 1000:.2f}ms")
+        return dbprotocol.encode_frame(request_id, dbprotocol.RESULT, result)
+    except Exception as e:
+        return dbprotocol.encode_frame(request_id, dbprotocol.ERROR, [type(e).__name__, str(e)])
+
+async def execute_exclusive(request_id: int, operation: str, args, kwargs) -> bytes:
+
+    """Runs a write under `database.database_lock`, or a maintenance job in the pool."""
+
+    if operation not in maintenance.JOBS:
+        async with database.database_lock:
+            return execute(request_id, operation, args, kwargs)
+
+    try:
+        start = time.perf_counter()
+        result = await maintenance.run(operation, *args, **kwargs)
+        applogger.debug(f"{operation} served in {(time.perf_counter() - start) * 1000:.2f}ms")
+        return dbprotocol.encode_frame(request_id, dbprotocol.RESULT, result)
+    except Exception as e:
+        return dbprotocol.encode_frame(request_id, dbprotocol.ERROR, [type(e).__name__, str(e)])
+
+async def respond(writer: asyncio.StreamWriter, response):
+
+    """Sends a response frame (awaiting it first if it is still being computed)."""
+
+    if not isinstance(response, bytes):
+        response = await response
+    if not writer.is_closing():
+        writer.write(response)
+        # Only waits when the client stopped reading (pipelined responses pile up)
+        await writer.drain()
+
+async def serve_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+
+    """
+
+    Answers the calls of one client connection until it closes (or the service stops).
+
+    Lookups are answered at once; writes and maintenance jobs are answered by their own
+    task when they complete (see `execute_exclusive`), so they never hold up the lookups
+    pipelined behind them.
+
+    """
+
+    clients.add(writer)
+    pending = set()
+    try:
+        while True:
+            size, request_id, kind = dbprotocol.HEADER.unpack(await reader.readexactly(dbprotocol.HEADER.size))
+            payload = await reader.readexactly(size)
+            if kind != dbprotocol.CALL:
+                continue
+            try:
+                operation, args, kwargs = dbprotocol.decode_payload(payload)
+            except ValueError as e:
+                await respond(writer, dbprotocol.encode_frame(request_id, dbprotocol.ERROR, [type(e).__name__, str(e)]))
+                continue
+
+            if operation in WRITE_OPERATIONS or operation in maintenance.JOBS:
+                task = asyncio.get_running_loop().create_task(
+                    respond(writer, execute_exclusive(request_id, operation, args, kwargs)))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            else:
+                await respond(writer, execute(request_id, operation, args, kwargs))
+    except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+        # The client left, or the service is stopping (see `serve`)
+        pass
+    finally:
+        clients.discard(writer)
+        writer.close()
+
+async def serve(path: Path):
+
+    """Initializes the database and serves the socket at `path` until SIGINT/SIGTERM."""
+
+    applogger.info(f"Database schema v{database.initialize()}")
+    maintenance.start()
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.unlink(missing_ok=True)
+    server = await asyncio.start_unix_server(serve_connection, path=str(path))
+    os.chmod(path, 0o600)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+
+    applogger.info(f"Database service listening on {path} ({database.DATABASE_PATH})")
+    async with server:
+        await stop.wait()
+        server.close()
+        for writer in list(clients):
+            writer.close()
+
+    # Lets the writes and maintenance jobs already started complete
+    async with database.database_lock:
+        pass
+    maintenance.shutdown()
+    path.unlink(missing_ok=True)
+    database.checkpoint()
+    applogger.info("Database service stopped")
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Out-of-process Gameplay Database service")
+    parser.add_argument("--socket", type=Path, default=Path(dbclient.SERVICE_SOCKET or DEFAULT_SOCKET),
+                        help="Unix socket to listen on (default GPDB_DATABASE_SERVICE, or cache/gpdb.sock)")
+    args = parser.parse_args()
+
+    asyncio.run(serve(args.socket.resolve()))
+
+if __name__ == "__main__":
+    main()
@@ -77,4 +77,105 @@ class InvalidYouTubeURL(Exception):
 
     def __init__(self, message):
         super().__init__(message)
-        self.timestamp = datetime.now()
\ No newline at end of file
+        self.timestamp = datetime.now()
+
+class ProfilerBusy(Exception):
+
+    """
+
+    Exception raised when a profiling session is requested while another one is running.
+
+    Parameters
+    ----------
+    message : str
+        A message describing the conflict.
+
+    Attributes
+    ----------
+    timestamp : datetime
+        The time at which the exception was raised.
+
+    """
+
+    def __init__(self, message):
+        super().__init__(message)
+        self.timestamp = datetime.now()
+
+class QueryBudgetExceeded(Exception):
+
+    """
+
+    Exception raised when a database call exceeds its time or VM-step budget.
+
+    The running statement is interrupted by SQLite's progress handler so that a
+    pathological query cannot monopolize the shared connection (see `database.budgeted`).
+
+    Parameters
+    ----------
+    message : str
+        A message naming the aborted call and the budget it exceeded.
+
+    Attributes
+    ----------
+    timestamp : datetime
+        The time at which the exception was raised.
+
+    Example
+    -------
+    >>> raise QueryBudgetExceeded("get_oldest_request exceeded its interactive query budget (251ms, ~120000 steps)")
+
+    """
+
+    def __init__(self, message):
+        super().__init__(message)
+        self.timestamp = datetime.now()
+
+class MigrationError(Exception):
+
+    """
+
+    Exception raised when the database schema cannot be brought to the version expected
+    by the code (see `database.initialize`).
+
+    Either a migration failed, in which case it was rolled back and the schema is left at
+    the last applied version, or the database was written by a newer version of the bot.
+
+    Parameters
+    ----------
+    message : str
+        A message naming the failed migration or the unexpected schema version.
+
+    Attributes
+    ----------
+    timestamp : datetime
+        The time at which the exception was raised.
+
+    """
+
+    def __init__(self, message):
+        super().__init__(message)
+        self.timestamp = datetime.now()
+
+class DatabaseServiceError(Exception):
+
+    """
+
+    Exception raised by the database service client (`utilities.dbclient`) when the service
+    cannot be reached, drops the connection, or fails with an error which has no matching
+    local exception type.
+
+    Parameters
+    ----------
+    message : str
+        A message describing the failure.
+
+    Attributes
+    ----------
+    timestamp : datetime
+        The time at which the exception was raised.
+
+    """
+
+    def __init__(self, message):
+        super().__init__(message)
+        self.timestamp = datetime.now()
@@ -12,19 +12,33 @@ Author: cobalt
 import discord
 from discord.ext import commands
 import os
+import sqlite3
 
 # --- Local imports ---
-from cogs.maincog import MainCog
-from cogs.query import QueryCog
-from cogs.registration import RegistrationCog
-from cogs.errorhandler import ErrorHandlerCog
-from cogs.req_registration import RequestRegistrationCog
-from cogs.review import ReviewCog
+import database
 from utilities.applogger import AppLogger
+from utilities import commandsync
+from utilities import dbclient
+from utilities import gateway
+from utilities import maintenance
+from utilities.scheduler import scheduler
+from utilities import warmcache
+from utilities.tracing import TracedCommandTree
 
 # --- Logger instantiation ---
 applogger = AppLogger()
 
+# Cog extensions, loaded in this order (each module defines `async def setup(bot)`)
+EXTENSIONS = (
+    "cogs.maincog",
+    "cogs.registration",
+    "cogs.query",
+    "cogs.errorhandler",
+    "cogs.req_registration",
+    "cogs.review",
+    "cogs.diagnostics",
+)
+
 class GameplayDatabase(commands.Bot):
 
     """
@@ -33,7 +47,7 @@ class GameplayDatabase(commands.Bot):
 
     Inherits from `commands.Bot` and sets up:
         - Command prefix for traditional commands (not used)
-        - All intents to access members, messages, reactions, etc.
+        - A gateway profile (intents and caches, see `utilities.gateway`)
         - Custom cogs for main functionality, registration, queries, and error handling
         - Synchronization of application commands (slash commands) with Discord
 
@@ -45,11 +59,13 @@ class GameplayDatabase(commands.Bot):
 
         Initialize the bot instance.
 
-        Sets the command prefix and enables all intents.
+        Sets the command prefix, applies the gateway profile selected by
+        `GPDB_GATEWAY_PROFILE` (minimal intents and caches by default) and uses a
+        command tree starting a trace for every application command.
 
         """
 
-        super().__init__(command_prefix="db!", intents=discord.Intents.all())
+        super().__init__(command_prefix="db!", tree_cls=TracedCommandTree, **gateway.client_options())
 
     async def setup_hook(self):
 
@@ -58,31 +74,66 @@ class GameplayDatabase(commands.Bot):
         Called by discord.py before the bot connects to Discord.
 
         Responsible for:
-            - Adding all Cogs
-            - Syncing application commands (slash commands)
+            - Routing the database operations to the database service, when
+              GPDB_DATABASE_SERVICE is set (see `utilities.dbclient`)
+            - Bringing the database schema up to date (`database.initialize`)
+            - Reloading the warm cache snapshot (`utilities.warmcache`), validated against
+              the current rows
+            - Loading all cog extensions (`EXTENSIONS`), which can then be hot-reloaded
+              with `/reload_extension`
+            - Syncing application commands (slash commands), only if they changed
+              since the last sync (see `utilities.commandsync`)
             - Logging the synced commands
 
         """
 
-        await bot.add_cog(MainCog(bot))
-        await bot.add_cog(RegistrationCog(bot))
-        await bot.add_cog(QueryCog(bot))
-        await bot.add_cog(ErrorHandlerCog(bot, applogger))
-        await bot.add_cog(RequestRegistrationCog(bot))
-        await bot.add_cog(ReviewCog(bot))
-        
+        if dbclient.SERVICE_SOCKET:
+            dbclient.install()
+        applogger.info(f"Database schema v{database.initialize()}")
+        warmcache.load()
+
+        for extension in EXTENSIONS:
+            await self.load_extension(extension)
 
-        synced = await self.tree.sync()
-        applogger.info(f"Synchronized commands : {[cmd.name for cmd in synced]}")
+        synced = await commandsync.sync(self.tree, self.application_id)
+        if synced is not None:
+            applogger.info(f"Synchronized commands : {[cmd.name for cmd in synced]}")
 
-# Instantiate the bot
-bot = GameplayDatabase()
+    async def close(self):
 
-# Remove default 'help' command since custom help will be used
-bot.remove_command("help")
+        """
 
-# Retrieve Discord bot token from environment variable
-TOKEN = os.getenv("DISCORD_GDDB_TOKEN")
+        Stops the scheduled jobs, saves the warm cache snapshot, stops the maintenance process
+        pool and checkpoints the database (when it lives in memory or on a tmpfs, see
+        `database.checkpoint`) before closing the connection to Discord.
+
+        """
 
-# Start the bot
-bot.run(TOKEN)
\ No newline at end of file
+        scheduler.stop()
+        try:
+            warmcache.save()
+        except OSError as e:
+            applogger.error(f"Failed to save the warm cache snapshot : {e}")
+        maintenance.shutdown()
+        if database.connection is not None:
+            try:
+                database.checkpoint()
+            except (OSError, sqlite3.Error) as e:
+                applogger.error(f"Failed to checkpoint the database : {e}")
+        await super().close()
+
+# Importing this module has no side effect (see `benchmarks.import_budget`); the bot only
+# starts when it is run as a script
+if __name__ == "__main__":
+
+    # Instantiate the bot
+    bot = GameplayDatabase()
+
+    # Remove default 'help' command since custom help will be used
+    bot.remove_command("help")
+
+    # Retrieve Discord bot token from environment variable
+    TOKEN = os.getenv("DISCORD_GDDB_TOKEN")
+
+    # Start the bot
+    bot.run(TOKEN)
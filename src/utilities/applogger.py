@@ -7,11 +7,28 @@ utility for the Gameplay Database project.
 
 It provides:
 - Automatic console and file logging with timestamps and levels.
+- Non-blocking logging: records are handed to a queue and written by a background
+  listener thread, so formatting and disk I/O never run on the event loop.
+- An optional structured mode (one JSON object per line) and per-event sampling,
+  so high-volume debug events can stay enabled in production.
+- Size and time based rotation of the log file, with gzip-compressed archives
+  and a bounded retention count.
 - Global exception handling (for both synchronous and asynchronous errors).
 - Integrated logging for Discord bot commands (via `discord.Interaction`).
 - Centralized logging configuration, ensuring consistent formatting and behavior.
 
-All logs are stored in the `/logs/latest.log` file by default.
+All logs are stored in the `/logs/latest.log` file by default (GPDB_LOG_FILE overrides it:
+a process rotates its log file, so two processes must never share one). Rotation can be
+tuned through the following environment variables:
+    - GPDB_LOG_MAX_BYTES : rotate once the file exceeds this size (default 10 MiB, 0 disables)
+    - GPDB_LOG_ROTATE_HOURS : rotate at least this often (default 24, 0 disables)
+    - GPDB_LOG_BACKUPS : number of compressed archives kept (default 10)
+
+Structured logging and sampling are configured the same way:
+    - GPDB_LOG_LEVEL : minimum level emitted (default DEBUG)
+    - GPDB_LOG_FORMAT : "text" (default) or "json"
+    - GPDB_LOG_SAMPLING : per event type sampling rates, e.g. "command=0.1,sync=0.01"
+      (event types not listed are always logged)
 
 Author: cobalt
 
@@ -21,7 +38,186 @@ Author: cobalt
 from pathlib import Path
 import discord
 import logging, sys
+import logging.handlers
 import asyncio
+import atexit
+import copy
+import gzip
+import json
+import os
+import queue
+import random
+import shutil
+import time
+
+# --- Log file settings ---
+LOG_FILE = os.getenv("GPDB_LOG_FILE") or None
+LOG_MAX_BYTES = int(os.getenv("GPDB_LOG_MAX_BYTES", 10 * 1024 * 1024))
+LOG_ROTATE_HOURS = float(os.getenv("GPDB_LOG_ROTATE_HOURS", 24))
+LOG_BACKUPS = int(os.getenv("GPDB_LOG_BACKUPS", 10))
+
+# --- Structured logging settings ---
+LOG_LEVEL = os.getenv("GPDB_LOG_LEVEL", "DEBUG").upper()
+LOG_STRUCTURED = os.getenv("GPDB_LOG_FORMAT", "text").lower() == "json"
+
+def parse_sampling(spec: str) -> dict[str, float]:
+
+    """
+
+    Parses a sampling specification such as "command=0.1,sync=0.01".
+
+    Returns
+    -------
+    dict[str, float]
+        Mapping of event type to the fraction of events kept (clamped to [0, 1]).
+
+    """
+
+    rates = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        event, _, rate = item.partition("=")
+        rates[event.strip()] = min(1.0, max(0.0, float(rate)))
+    return rates
+
+LOG_SAMPLING = parse_sampling(os.getenv("GPDB_LOG_SAMPLING", ""))
+
+# Common log format: [timestamp] [LEVEL] message
+LOG_FORMAT = "[%(asctime)s] [%(levelname)s] %(message)s"
+
+class JsonFormatter(logging.Formatter):
+
+    """
+
+    Formats each record as a single-line JSON object.
+
+    Records logged through `AppLogger.event` carry an `event` type and a `fields`
+    mapping, which are merged into the object so they can be aggregated directly.
+
+    Example
+    -------
+    {"time": "2025-10-14 21:45:03,120", "level": "DEBUG", "event": "command", "message": "...",
+     "command": "get_layout_by_name", "user_id": 1234, "args": {"name": "Bloodbath"}, "duration_ms": 12.4, "outcome": "ok"}
+
+    """
+
+    def format(self, record):
+        data = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "event": getattr(record, "event", None),
+            "message": record.getMessage(),
+        }
+        data.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            data["exc"] = self.formatException(record.exc_info)
+        return json.dumps(data, default=str, ensure_ascii=False)
+
+class CompressedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+
+    """
+
+    File handler rotating the log file by size and/or age, gzip-compressing archives.
+
+    Archives are named `latest.log.1.gz` (most recent) to `latest.log.<backup_count>.gz`;
+    older archives are deleted on rollover.
+
+    Parameters
+    ----------
+    filename : str | Path
+        Path of the active log file.
+    max_bytes : int
+        Size threshold triggering a rollover (0 disables size rotation).
+    interval_hours : float
+        Maximum age of the active log file before a rollover (0 disables time rotation).
+    backup_count : int
+        Number of compressed archives kept.
+
+    """
+
+    def __init__(self, filename, max_bytes: int = LOG_MAX_BYTES, interval_hours: float = LOG_ROTATE_HOURS,
+                 backup_count: int = LOG_BACKUPS):
+
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8", delay=True)
+        self.interval = interval_hours * 3600
+        self.rollover_at = self._next_rollover()
+        self.namer = lambda name: name + ".gz"
+        self.rotator = self._compress
+
+    def _next_rollover(self):
+        return time.time() + self.interval if self.interval > 0 else float("inf")
+
+    @staticmethod
+    def _compress(source, dest):
+        with open(source, "rb") as src, gzip.open(dest, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(source)
+
+    def shouldRollover(self, record):
+        if time.time() >= self.rollover_at:
+            return True
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        super().doRollover()
+        self.rollover_at = self._next_rollover()
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+
+    """
+
+    `QueueHandler` that defers formatting to the listener thread.
+
+    The standard `QueueHandler.prepare` formats the record in the calling thread (the
+    event loop for this bot); since the queue never leaves the process, the record can
+    be enqueued as-is and formatted by the listener's handlers instead.
+
+    """
+
+    def prepare(self, record):
+        return copy.copy(record)
+
+def build_handlers(log_file) -> list[logging.Handler]:
+
+    """
+
+    Builds the console and rotating file handlers used by the listener thread.
+
+    Parameters
+    ----------
+    log_file : str | Path
+        Path of the active log file.
+
+    Returns
+    -------
+    list[logging.Handler]
+        The configured handlers, sharing the same formatter.
+
+    """
+
+    formatter = JsonFormatter() if LOG_STRUCTURED else logging.Formatter(LOG_FORMAT)
+
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.DEBUG)
+    console_handler.setFormatter(formatter)
+
+    file_handler = CompressedRotatingFileHandler(log_file)
+    file_handler.setLevel(logging.DEBUG)
+    file_handler.setFormatter(formatter)
+
+    return [console_handler, file_handler]
+
+class ForwardingHandler(logging.Handler):
+
+    """
+
+    Hands records received from child processes (see `AppLogger.receive_from`) to this
+    process' logger of the same name (`gpdb`, or `gpdb.workload` for captured statements),
+    so they are written by its listener like its own records.
+
+    """
+
+    def emit(self, record):
+        logging.getLogger(record.name).handle(record)
 
 class AppLogger:
 
@@ -30,12 +226,14 @@ class AppLogger:
     Application-level logger with built-in support for both console and file logging.
 
     This class encapsulates Python's standard `logging` module and adds:
-    - A default log file (`logs/latest.log`).
+    - A default log file (`logs/latest.log`), rotated and compressed automatically.
     - Unified console and file output with identical formatting.
+    - A background `QueueListener` performing formatting and I/O off the event loop.
     - Global exception handling via `sys.excepthook`.
     - Async exception handling for asyncio event loops.
     - Convenience methods (`info`, `debug`, `warning`, `error`).
-    - A helper for logging Discord commands usage (`debug_command`).
+    - Structured, sampled events (`event`) and a helper for logging Discord commands
+      usage (`debug_command`).
 
     Parameters
     ----------
@@ -50,12 +248,15 @@ class AppLogger:
 
     """
 
+    # Background listener shared by every instance (started by the first one)
+    listener: logging.handlers.QueueListener = None
+
     def __init__(self, log_file: str = None):
 
         """Initialize the logger, configure file and console handlers, and setup global exception hook."""
 
         if log_file is None:
-            log_file = Path(__file__).parent.parent.parent / "logs" / "latest.log"
+            log_file = LOG_FILE or Path(__file__).parent.parent.parent / "logs" / "latest.log"
 
         log_file = Path(log_file)
         log_file.parent.mkdir(parents=True, exist_ok=True)  
@@ -63,23 +264,17 @@ class AppLogger:
         
         # Create or retrieve the logger instance
         self.logger = logging.getLogger("gpdb")
-        self.logger.setLevel(logging.DEBUG)
+        self.logger.setLevel(LOG_LEVEL)
 
         # Avoid adding multiple handlers when multiple instances are created
         if not self.logger.hasHandlers():
-            console_handler = logging.StreamHandler()
-            console_handler.setLevel(logging.DEBUG)
-
-            file_handler = logging.FileHandler(log_file, encoding="utf-8")
-            file_handler.setLevel(logging.DEBUG)
+            log_queue = queue.SimpleQueue()
+            self.logger.addHandler(DeferredQueueHandler(log_queue))
 
-            # Common log format: [timestamp] [LEVEL] message
-            formatter = logging.Formatter("[%(asctime)s] [%(levelname)s] %(message)s")
-            console_handler.setFormatter(formatter)
-            file_handler.setFormatter(formatter)
-
-            self.logger.addHandler(console_handler)
-            self.logger.addHandler(file_handler)
+            AppLogger.listener = logging.handlers.QueueListener(log_queue, *build_handlers(log_file),
+                                                                respect_handler_level=True)
+            AppLogger.listener.start()
+            atexit.register(AppLogger.listener.stop)
 
         # Attach a global exception handler for uncaught errors
         sys.excepthook = self.handle_exception
@@ -135,32 +330,175 @@ class AppLogger:
                 self.logger.error(f"Unhandled asyncio exception : {msg}")
         loop.set_exception_handler(handle_async_exception)
 
+    # -------------------- CHILD PROCESSES --------------------
+
+    @staticmethod
+    def send_to(log_queue):
+
+        """
+
+        Routes the records of this (child) process to `log_queue` instead of its own handlers.
+
+        A child process must never write to its parent's log file: when either process
+        rotates it, the other keeps writing to the unlinked file and its lines are lost.
+        The parent drains the queue with `receive_from`.
+
+        Parameters
+        ----------
+        log_queue : multiprocessing.Queue
+            Queue shared with the parent process.
+
+        """
+
+        logger = logging.getLogger("gpdb")
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    @staticmethod
+    def receive_from(log_queue) -> logging.handlers.QueueListener:
+
+        """
+
+        Starts a thread logging the records sent by child processes through `log_queue`
+        (see `send_to`) with this process' handlers.
+
+        Returns
+        -------
+        logging.handlers.QueueListener
+            The listener, to stop once the child processes are gone.
+
+        """
+
+        listener = logging.handlers.QueueListener(log_queue, ForwardingHandler())
+        listener.start()
+        return listener
+
+    def rotate(self, force: bool = False) -> int:
+
+        """
+
+        Rotates the log file if a rotation is due (or always, with `force`).
+
+        The file handler only checks its rotation conditions when a record is written, so a
+        quiet bot could keep a log file past its age limit; this check is run periodically
+        by the scheduler. Compressing the archive blocks, so call it from a thread.
+
+        Returns
+        -------
+        int
+            The number of log files rotated.
+
+        """
+
+        rotated = 0
+        for handler in AppLogger.listener.handlers if AppLogger.listener is not None else ():
+            if not isinstance(handler, CompressedRotatingFileHandler):
+                continue
+            handler.acquire()
+            try:
+                oversized = (handler.maxBytes > 0 and os.path.exists(handler.baseFilename)
+                             and os.path.getsize(handler.baseFilename) >= handler.maxBytes)
+                if force or oversized or time.time() >= handler.rollover_at:
+                    handler.doRollover()
+                    rotated += 1
+            finally:
+                handler.release()
+        return rotated
+
     # -------------------- LOGGING METHODS -------------------
 
-    def info(self, message: str): self.logger.info(message)
-    def debug(self, message: str): self.logger.debug(message)
-    def warning(self, message: str): self.logger.warning(message)
-    def error(self, message: str): self.logger.error(message)
+    def info(self, message: str, *args, **kwargs): self.logger.info(message, *args, **kwargs)
+    def debug(self, message: str, *args, **kwargs): self.logger.debug(message, *args, **kwargs)
+    def warning(self, message: str, *args, **kwargs): self.logger.warning(message, *args, **kwargs)
+    def error(self, message: str, *args, **kwargs): self.logger.error(message, *args, **kwargs)
+
+    def enabled(self, event: str, level: int = logging.DEBUG) -> bool:
+
+        """
+
+        Returns whether an event of the given type and level would be emitted.
 
-    def debug_command(self, interaction: discord.Interaction):
+        Checks the logger level first, then draws against the sampling rate configured
+        for the event type in `GPDB_LOG_SAMPLING`. Callers should check this before
+        building any costly message or field.
+
+        """
+
+        if not self.logger.isEnabledFor(level):
+            return False
+        rate = LOG_SAMPLING.get(event, 1.0)
+        return rate >= 1.0 or random.random() < rate
+
+    def event(self, event: str, message: str, *args, level: int = logging.DEBUG, **fields):
+
+        """
+
+        Log a structured event.
+
+        The message is %-formatted lazily with `args`, and `fields` are attached to the
+        record: they are emitted as JSON keys in structured mode and ignored in text mode.
+
+        Parameters
+        ----------
+        event : str
+            Event type, used for sampling and aggregation (e.g. "command", "sync").
+        message : str
+            Human-readable message, formatted with `args` only if emitted.
+        level : int, optional
+            Logging level of the event (defaults to DEBUG).
+        **fields
+            Additional structured data.
+
+        """
+
+        if self.enabled(event, level):
+            self.logger.log(level, message, *args, extra={"event": event, "fields": fields})
+
+    def debug_command(self, interaction: discord.Interaction, duration: float = None, outcome: str = "ok"):
 
         """
 
         Log detailed information about a Discord command execution.
 
-        Useful for tracing user activity and command usage during bot operation.
+        Useful for tracing user activity and command usage during bot operation. Called once
+        per command, when it completed (`MainCog.record_command`) or failed
+        (`ErrorHandlerCog`). Nothing is computed when DEBUG is disabled or the "command"
+        event is sampled out.
 
         Parameters
         ----------
         interaction : discord.Interaction
             The Discord interaction object containing command metadata.
+        duration : float, optional
+            Handling duration in seconds. Defaults to the time elapsed since the handler
+            started (see `tracing.TracedCommandTree`), or since the interaction was created.
+        outcome : str, optional
+            Outcome of the command ("ok" by default, or the error name).
 
         Example
         -------
-        [2025-10-14 21:45:03] [DEBUG] user1 used get_creator_by_name with args: ['user=JohnDoe']
+        [2025-10-14 21:45:03] [DEBUG] user1 used get_creator_by_name within the following args: ['user=JohnDoe']
 
         """
-        args_list = [f"{opt['name']}={opt['value']}" for opt in interaction.data.get("options", [])]
-        self.debug(f"{interaction.user.name} used {interaction.command.name} within the following args: {args_list}")
 
-        
+        if not self.enabled("command"):
+            return
+
+        options = interaction.data.get("options", []) if interaction.data else []
+        command = interaction.command.name if interaction.command else None
+        if duration is None:
+            started = interaction.extras.get("handler_started")
+            if started is not None:
+                duration = time.perf_counter() - started
+            else:
+                duration = (discord.utils.utcnow() - interaction.created_at).total_seconds()
+
+        self.logger.debug("%s used %s within the following args: %s",
+                          interaction.user.name, command, [f"{opt['name']}={opt['value']}" for opt in options],
+                          extra={"event": "command", "fields": {
+                              "command": command,
+                              "user_id": interaction.user.id,
+                              "args": {opt["name"]: opt["value"] for opt in options},
+                              "duration_ms": round(duration * 1000, 2),
+                              "outcome": outcome}})
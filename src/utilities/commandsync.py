@@ -0,0 +1,116 @@
+"""
+
+File: commandsync.py
+
+Description: This module synchronizes the application command tree with Discord only when
+it changed.
+
+`CommandTree.sync()` is a global HTTP round-trip, rate-limited by Discord, while the command
+set rarely changes between restarts. A stable hash of the tree (the payload sent to Discord:
+names, descriptions, options, permissions...) is stored locally after every successful sync,
+and the next sync is skipped when the hash is unchanged.
+
+Settings are read from environment variables:
+    - GPDB_FORCE_SYNC : set to 1 to sync even if the tree is unchanged
+    - GPDB_DEV_GUILD_ID : guild to sync to instead of globally (development bots);
+      global commands are copied to that guild, which applies instantly
+    - GPDB_COMMAND_SYNC_FILE : file storing the hashes (default cache/command_sync.json)
+
+Author: cobalt
+
+"""
+
+# --- Standard imports ---
+from pathlib import Path
+import hashlib
+import json
+import os
+
+# --- Third-party imports ---
+import discord
+
+# --- Local imports ---
+from utilities.applogger import AppLogger
+
+# --- Sync settings ---
+FORCE_SYNC = os.getenv("GPDB_FORCE_SYNC", "0") == "1"
+DEV_GUILD_ID = int(os.getenv("GPDB_DEV_GUILD_ID", 0)) or None
+SYNC_STATE_FILE = Path(os.getenv("GPDB_COMMAND_SYNC_FILE", Path(__file__).parent.parent.parent / "cache" / "command_sync.json"))
+
+# --- Application logger ---
+applogger = AppLogger()
+
+def tree_hash(tree: discord.app_commands.CommandTree, guild: discord.abc.Snowflake = None) -> str:
+
+    """
+
+    Returns a stable SHA-256 hash of the commands synced to `guild` (global commands if None).
+
+    The hash covers the exact payloads `CommandTree.sync()` sends, sorted by command type
+    and name, so it does not depend on the order in which cogs were added.
+
+    """
+
+    payloads = [command.to_dict(tree) for command in tree.get_commands(guild=guild)]
+    payloads.sort(key=lambda payload: (payload.get("type", 1), payload["name"]))
+    encoded = json.dumps(payloads, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+def _load_state() -> dict:
+    try:
+        return json.loads(SYNC_STATE_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+def _save_state(state: dict):
+    SYNC_STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    temporary = SYNC_STATE_FILE.with_suffix(".tmp")
+    temporary.write_text(json.dumps(state, indent=2), encoding="utf-8")
+    os.replace(temporary, SYNC_STATE_FILE)
+
+async def sync(tree: discord.app_commands.CommandTree, application_id: int,
+               guild_id: int = DEV_GUILD_ID, force: bool = FORCE_SYNC) -> list | None:
+
+    """
+
+    Syncs the command tree if it changed since the last successful sync.
+
+    Parameters
+    ----------
+    tree : discord.app_commands.CommandTree
+        The bot's command tree, with every cog added.
+    application_id : int
+        Application of the bot; hashes are stored per application and scope, so that
+        development and production bots sharing a checkout do not skip each other's syncs.
+    guild_id : int, optional
+        Guild to sync to instead of globally. Defaults to `GPDB_DEV_GUILD_ID`.
+    force : bool, optional
+        Sync even if the tree is unchanged. Defaults to `GPDB_FORCE_SYNC`.
+
+    Returns
+    -------
+    list | None
+        The synced commands, or None if the sync was skipped.
+
+    """
+
+    guild = discord.Object(id=guild_id) if guild_id else None
+    if guild is not None:
+        tree.copy_global_to(guild=guild)
+
+    key = f"{application_id}:{guild_id or 'global'}"
+    digest = tree_hash(tree, guild)
+    state = _load_state()
+
+    if not force and state.get(key) == digest:
+        applogger.info(f"Command tree unchanged ({digest[:12]}), skipping sync")
+        return None
+
+    synced = await tree.sync(guild=guild)
+
+    state[key] = digest
+    try:
+        _save_state(state)
+    except OSError as e:
+        applogger.error(f"Failed to store the command tree hash : {e}")
+    return synced
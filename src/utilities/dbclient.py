@@ -0,0 +1,301 @@
+"""
+
+File: dbclient.py
+
+Description: Client of the out-of-process database service (`dbservice`).
+
+When GPDB_DATABASE_SERVICE is set to the service's Unix socket, `install()` (called by
+`GameplayDatabase.setup_hook`) replaces the operations of the `database` and `recovery`
+modules with proxies forwarding them to the service, so the cogs keep calling
+`database.get_layout_by_name(...)` or queueing `database.register_layout` unchanged:
+    - Operations queued on `database.database_queue` (writes, sync, checkpoints) become
+      coroutine functions: `database_worker` awaits them without blocking the event loop
+      while the service executes them
+    - Operations called directly (lookups, request queue, backups) stay synchronous and
+      make a blocking round-trip on a dedicated socket; their asynchronous version, used by
+      the cogs through `database.call`, is attached to the proxy as `remote`
+
+The asynchronous side pipelines its requests over a single connection: each call is sent
+at once and matched with its response by request id. `DatabaseClient.pipeline` does the
+same for a batch of synchronous calls.
+
+Errors raised by an operation in the service are raised again in the bot with the same
+type when it is one of `exceptions.custom_exceptions` (e.g. `DataNotFound`), and as
+`DatabaseServiceError` otherwise.
+
+Author: cobalt
+
+"""
+
+# --- Standard imports ---
+import asyncio
+import functools
+import itertools
+import os
+import socket
+
+# --- Local imports ---
+from utilities.applogger import AppLogger
+from utilities import dbprotocol
+from exceptions import custom_exceptions
+from exceptions.custom_exceptions import DatabaseServiceError
+
+# --- Service settings ---
+SERVICE_SOCKET = os.getenv("GPDB_DATABASE_SERVICE") or None
+TIMEOUT = float(os.getenv("GPDB_DATABASE_SERVICE_TIMEOUT", 30))
+
+# Operations put on `database.database_queue` by the cogs, awaited by `database_worker`
+QUEUED_OPERATIONS = (
+    "register_creator", "register_layout", "register_collab", "register_music", "register_artist",
+    "register_request_creator", "register_request_layout", "register_request_collab",
+    "register_request_music", "register_request_artist",
+    "delete_request", "synchronize_data", "checkpoint", "optimize", "refresh_replica",
+)
+
+# Operations called directly
+DIRECT_OPERATIONS = (
+    "get_creator_by_name", "get_layout_by_name", "get_collab_by_name", "get_music_by_name", "get_artist_by_name",
+    "get_creators", "get_layouts", "get_collabs", "get_musics", "get_artists",
+    "get_oldest_request", "get_request_details",
+    "initialize", "schema_version", "clear", "execute_queries",
+)
+
+# Operations of `utilities.recovery`, called directly
+RECOVERY_OPERATIONS = ("create_save", "load_save")
+
+# --- Application logger ---
+applogger = AppLogger()
+
+def _error(name: str, message: str) -> Exception:
+    exception_type = getattr(custom_exceptions, name, None)
+    if isinstance(exception_type, type) and issubclass(exception_type, Exception):
+        return exception_type(message)
+    return DatabaseServiceError(f"{name} : {message}")
+
+class DatabaseClient:
+
+    """
+
+    Connection to the database service.
+
+    Synchronous calls use a blocking socket, asynchronous calls an asyncio connection with
+    pipelining; both are opened on first use and reopened after a failure.
+
+    Parameters
+    ----------
+    path : str
+        Unix socket of the service.
+
+    Example
+    -------
+    >>> client = DatabaseClient("/run/gpdb/gpdb.sock")
+    >>> client.call("get_artist_by_name", "Camellia")[0]["yt"]
+
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._ids = itertools.count(1)
+        self._socket = None
+        self._reader = None
+        self._writer = None
+        self._pending: dict[int, asyncio.Future] = {}
+        self._dispatcher = None
+        self._opening = asyncio.Lock()
+
+    # -------------------- SYNCHRONOUS CALLS --------------------
+
+    def _connect(self) -> socket.socket:
+        if self._socket is None:
+            try:
+                self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                self._socket.settimeout(TIMEOUT)
+                self._socket.connect(self.path)
+            except OSError as e:
+                self._socket = None
+                raise DatabaseServiceError(f"Database service unreachable at {self.path} : {e}") from e
+        return self._socket
+
+    def _receive_exactly(self, size: int) -> bytes:
+        data = bytearray()
+        while len(data) < size:
+            chunk = self._socket.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError("connection closed by the database service")
+            data += chunk
+        return bytes(data)
+
+    def _receive(self):
+        size, request_id, kind = dbprotocol.HEADER.unpack(self._receive_exactly(dbprotocol.HEADER.size))
+        return request_id, kind, dbprotocol.decode_payload(self._receive_exactly(size))
+
+    def pipeline(self, calls: list[tuple[str, tuple, dict]]) -> list:
+
+        """
+
+        Sends several calls at once, then reads their responses (one round-trip).
+
+        Parameters
+        ----------
+        calls : list[tuple[str, tuple, dict]]
+            (operation, args, kwargs) of each call.
+
+        Returns
+        -------
+        list
+            The results, in the order of `calls`; a failed call's exception is returned in
+            place of its result.
+
+        """
+
+        connection = self._connect()
+        ids = [next(self._ids) for _ in calls]
+        try:
+            connection.sendall(b"".join(dbprotocol.encode_frame(request_id, dbprotocol.CALL, list(call))
+                                        for request_id, call in zip(ids, calls)))
+            responses = {}
+            while len(responses) < len(ids):
+                request_id, kind, value = self._receive()
+                responses[request_id] = _error(*value) if kind == dbprotocol.ERROR else value
+        except (OSError, ConnectionError, ValueError) as e:
+            self._socket.close()
+            self._socket = None
+            raise DatabaseServiceError(f"Database service call failed : {e}") from e
+        return [responses[request_id] for request_id in ids]
+
+    def call(self, operation: str, *args, **kwargs):
+
+        """Executes `operation` in the service and returns its result (blocking)."""
+
+        result = self.pipeline([(operation, args, kwargs)])[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    # -------------------- ASYNCHRONOUS CALLS --------------------
+
+    async def _open(self) -> tuple[asyncio.StreamWriter, dict[int, asyncio.Future]]:
+
+        """
+
+        Returns the current connection's writer and pending calls, opening it if needed.
+
+        Concurrent first calls wait for the same connection instead of each opening one.
+
+        """
+
+        async with self._opening:
+            if self._writer is None:
+                try:
+                    reader, writer = await asyncio.open_unix_connection(self.path)
+                except OSError as e:
+                    raise DatabaseServiceError(f"Database service unreachable at {self.path} : {e}") from e
+                self._reader, self._writer, self._pending = reader, writer, {}
+                self._dispatcher = asyncio.get_running_loop().create_task(
+                    self._dispatch(reader, writer, self._pending), name="gpdb-dbclient")
+            return self._writer, self._pending
+
+    async def _dispatch(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, pending: dict[int, asyncio.Future]):
+
+        """
+
+        Resolves the pending calls of one connection as their responses arrive, in any order.
+
+        When the connection ends, its own calls fail and the client state is reset only if
+        it still refers to this connection (a newer one may already be open).
+
+        """
+
+        try:
+            while True:
+                size, request_id, kind = dbprotocol.HEADER.unpack(await reader.readexactly(dbprotocol.HEADER.size))
+                value = dbprotocol.decode_payload(await reader.readexactly(size))
+                future = pending.pop(request_id, None)
+                if future is None or future.done():
+                    continue
+                if kind == dbprotocol.ERROR:
+                    future.set_exception(_error(*value))
+                else:
+                    future.set_result(value)
+        except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+            applogger.error(f"Lost the connection to the database service : {e}")
+        finally:
+            writer.close()
+            if self._writer is writer:
+                self._reader = self._writer = self._dispatcher = None
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(DatabaseServiceError("Connection to the database service lost"))
+            pending.clear()
+
+    async def acall(self, operation: str, *args, **kwargs):
+
+        """Executes `operation` in the service without blocking the event loop."""
+
+        writer, pending = await self._open()
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        pending[request_id] = future
+        try:
+            writer.write(dbprotocol.encode_frame(request_id, dbprotocol.CALL, [operation, args, kwargs]))
+            await writer.drain()
+        except OSError as e:
+            pending.pop(request_id, None)
+            raise DatabaseServiceError(f"Database service call failed : {e}") from e
+        return await future
+
+    def close(self):
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+
+def _proxy(client: DatabaseClient, original, asynchronous: bool):
+
+    """
+
+    Returns a function forwarding calls of `original` to the service, with its name and
+    docstring. Synchronous proxies carry their asynchronous version as `remote` (see
+    `database.call`).
+
+    """
+
+    name = original.__name__
+    if asynchronous:
+        async def proxy(*args, **kwargs):
+            return await client.acall(name, *args, **kwargs)
+    else:
+        def proxy(*args, **kwargs):
+            return client.call(name, *args, **kwargs)
+    proxy = functools.update_wrapper(proxy, original)
+    if not asynchronous:
+        proxy.remote = functools.partial(client.acall, name)
+    return proxy
+
+def install(path: str = SERVICE_SOCKET) -> DatabaseClient:
+
+    """
+
+    Routes the operations of `database` and `recovery` to the service at `path`.
+
+    Returns
+    -------
+    DatabaseClient
+        The client used by the proxies.
+
+    """
+
+    import database
+    from utilities import recovery
+
+    client = DatabaseClient(path)
+    for name in QUEUED_OPERATIONS:
+        setattr(database, name, _proxy(client, getattr(database, name), asynchronous=True))
+    for name in DIRECT_OPERATIONS:
+        setattr(database, name, _proxy(client, getattr(database, name), asynchronous=False))
+    for name in RECOVERY_OPERATIONS:
+        setattr(recovery, name, _proxy(client, getattr(recovery, name), asynchronous=False))
+
+    applogger.info(f"Database operations routed to the service at {path}")
+    return client
@@ -0,0 +1,154 @@
+"""
+
+File: dbprotocol.py
+
+Description: Binary protocol between the database service (`dbservice`) and its clients
+(`utilities.dbclient`).
+
+Every message is a frame:
+    - header : payload length (uint32), request id (uint32), kind (uint8), big-endian
+    - payload : one encoded value
+
+Kinds:
+    - CALL : [operation, args, kwargs]
+    - RESULT : the value returned by the operation
+    - ERROR : [exception type name, message]
+
+Request ids let a client pipeline requests (send several before reading the responses)
+and match the responses, which the service may send in a different order (a lookup is
+answered before a write queued ahead of it completes).
+
+Values use a compact tagged encoding (one tag byte, then the value) limited to the types
+the database operations exchange: None, bool, int, float, str, bytes, list, tuple, dict
+and rows, which are decoded as `RemoteRow` (indexable by position and by column name,
+like `sqlite3.Row`). Unlike pickle, decoding never executes code.
+
+Author: cobalt
+
+"""
+
+# --- Standard imports ---
+from pathlib import PurePath
+import sqlite3
+import struct
+
+HEADER = struct.Struct(">IIB")
+CALL, RESULT, ERROR = 0, 1, 2
+
+_INT = struct.Struct(">q")
+_FLOAT = struct.Struct(">d")
+_SIZE = struct.Struct(">I")
+
+class RemoteRow(tuple):
+
+    """Row decoded from the protocol, indexable by position and by column name like `sqlite3.Row`."""
+
+    def __new__(cls, keys, values):
+        row = super().__new__(cls, values)
+        row._keys = keys
+        return row
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return tuple.__getitem__(self, self._keys.index(key))
+        return tuple.__getitem__(self, key)
+
+    def keys(self) -> list[str]:
+        return list(self._keys)
+
+def _encode(value, out: bytearray):
+    if value is None:
+        out += b"N"
+    elif value is True:
+        out += b"T"
+    elif value is False:
+        out += b"F"
+    elif isinstance(value, int):
+        if -2 ** 63 <= value < 2 ** 63:
+            out += b"i" + _INT.pack(value)
+        else:
+            _encode_sized(b"I", str(value).encode("ascii"), out)
+    elif isinstance(value, float):
+        out += b"d" + _FLOAT.pack(value)
+    elif isinstance(value, str):
+        _encode_sized(b"s", value.encode("utf-8"), out)
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        _encode_sized(b"b", bytes(value), out)
+    elif isinstance(value, (sqlite3.Row, RemoteRow)):
+        out += b"r"
+        _encode(list(value.keys()), out)
+        _encode(list(value), out)
+    elif isinstance(value, (list, tuple)):
+        out += (b"l" if isinstance(value, list) else b"t") + _SIZE.pack(len(value))
+        for item in value:
+            _encode(item, out)
+    elif isinstance(value, dict):
+        out += b"m" + _SIZE.pack(len(value))
+        for key, item in value.items():
+            _encode(key, out)
+            _encode(item, out)
+    elif isinstance(value, PurePath):
+        _encode_sized(b"s", str(value).encode("utf-8"), out)
+    else:
+        raise TypeError(f"Cannot encode {type(value).__name__} values")
+
+def _encode_sized(tag: bytes, data: bytes, out: bytearray):
+    out += tag + _SIZE.pack(len(data)) + data
+
+def _decode(data: memoryview, offset: int):
+    tag = data[offset:offset + 1].tobytes()
+    offset += 1
+    if tag == b"N":
+        return None, offset
+    if tag == b"T":
+        return True, offset
+    if tag == b"F":
+        return False, offset
+    if tag == b"i":
+        return _INT.unpack_from(data, offset)[0], offset + _INT.size
+    if tag == b"d":
+        return _FLOAT.unpack_from(data, offset)[0], offset + _FLOAT.size
+    if tag in (b"s", b"b", b"I"):
+        size = _SIZE.unpack_from(data, offset)[0]
+        offset += _SIZE.size
+        raw = data[offset:offset + size].tobytes()
+        value = raw.decode("utf-8") if tag == b"s" else int(raw) if tag == b"I" else raw
+        return value, offset + size
+    if tag in (b"l", b"t"):
+        count = _SIZE.unpack_from(data, offset)[0]
+        offset += _SIZE.size
+        items = []
+        for _ in range(count):
+            item, offset = _decode(data, offset)
+            items.append(item)
+        return (items if tag == b"l" else tuple(items)), offset
+    if tag == b"m":
+        count = _SIZE.unpack_from(data, offset)[0]
+        offset += _SIZE.size
+        mapping = {}
+        for _ in range(count):
+            key, offset = _decode(data, offset)
+            mapping[key], offset = _decode(data, offset)
+        return mapping, offset
+    if tag == b"r":
+        keys, offset = _decode(data, offset)
+        values, offset = _decode(data, offset)
+        return RemoteRow(keys, values), offset
+    raise ValueError(f"Unknown value tag {tag!r}")
+
+def encode_frame(request_id: int, kind: int, value) -> bytes:
+
+    """Returns the frame carrying `value` (header included)."""
+
+    payload = bytearray()
+    _encode(value, payload)
+    return HEADER.pack(len(payload), request_id, kind) + payload
+
+def decode_payload(payload: bytes):
+
+    """Decodes the value carried by a frame payload."""
+
+    value, offset = _decode(memoryview(payload), 0)
+    if offset != len(payload):
+        raise ValueError("Trailing bytes after the frame value")
+    return value
@@ -0,0 +1,70 @@
+"""
+
+File: gateway.py
+
+Description: This module defines the gateway profiles of the bot (intents and caches).
+
+The bot is driven by interactions: their payloads carry the invoking member (with roles,
+used by `tools.check_mod`), so it needs neither the member list nor the presences of the
+guilds it is in. Requesting them makes discord.py chunk and cache every member of every
+guild at startup, so memory and time-to-ready scale with guild size instead of usage.
+
+Profiles:
+    - "minimal" (default) : `guilds` intent only, no member cache, no guild chunking at
+      startup, no message cache
+    - "full" : every intent with discord.py defaults (chunking, member and message caches),
+      the previous behaviour, kept for features which would need the member list
+
+The profile is selected through the GPDB_GATEWAY_PROFILE environment variable.
+`benchmarks.gateway_profile` measures RSS and time-to-ready of each profile.
+
+Author: cobalt
+
+"""
+
+# --- Standard imports ---
+import os
+
+# --- Third-party imports ---
+import discord
+
+# --- Gateway settings ---
+GATEWAY_PROFILE = os.getenv("GPDB_GATEWAY_PROFILE", "minimal")
+PROFILES = ("minimal", "full")
+
+def client_options(profile: str = GATEWAY_PROFILE) -> dict:
+
+    """
+
+    Returns the `discord.Client` keyword arguments of a gateway profile.
+
+    Parameters
+    ----------
+    profile : str, optional
+        One of `PROFILES`. Defaults to `GPDB_GATEWAY_PROFILE`.
+
+    Raises
+    ------
+    ValueError
+        If the profile is unknown.
+
+    Example
+    -------
+    >>> bot = commands.Bot(command_prefix="db!", **gateway.client_options("minimal"))
+
+    """
+
+    if profile == "full":
+        return {"intents": discord.Intents.all()}
+
+    if profile == "minimal":
+        intents = discord.Intents.none()
+        intents.guilds = True
+        return {
+            "intents": intents,
+            "member_cache_flags": discord.MemberCacheFlags.none(),
+            "chunk_guilds_at_startup": False,
+            "max_messages": None,
+        }
+
+    raise ValueError(f"Unknown gateway profile '{profile}' (expected one of {', '.join(PROFILES)})")
@@ -0,0 +1,170 @@
+"""
+
+File: loopmonitor.py
+
+Description: This module monitors the responsiveness of the bot's asyncio event loop.
+
+It provides:
+- Continuous loop lag measurement: a heartbeat coroutine sleeps for a fixed interval and
+  records how late it wakes up (`gpdb_event_loop_lag_seconds` histogram in `metrics`)
+- A watchdog thread which, when the heartbeat is late by more than the slow callback
+  threshold, captures the stack of the event loop thread and the running task, so the
+  handler blocking the loop can be identified
+- Optional asyncio debug mode, whose slow callback warnings are forwarded to the log
+- A periodic lag summary written to the log
+
+Settings are read from environment variables:
+    - GPDB_LOOP_LAG_INTERVAL : heartbeat interval in seconds (default 0.5)
+    - GPDB_SLOW_CALLBACK_SECONDS : lag reported as a blocked loop (default 0.1)
+    - GPDB_LOOP_REPORT_SECONDS : interval of the lag summary (default 300)
+    - GPDB_LOOP_DEBUG : set to 1 to enable asyncio debug mode (adds overhead)
+
+Author: cobalt
+
+"""
+
+# --- Standard imports ---
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+import traceback
+
+# --- Local imports ---
+from utilities.applogger import AppLogger
+from utilities import metrics
+
+# --- Monitor settings ---
+LAG_INTERVAL = float(os.getenv("GPDB_LOOP_LAG_INTERVAL", 0.5))
+SLOW_CALLBACK_SECONDS = float(os.getenv("GPDB_SLOW_CALLBACK_SECONDS", 0.1))
+REPORT_SECONDS = float(os.getenv("GPDB_LOOP_REPORT_SECONDS", 300))
+LOOP_DEBUG = os.getenv("GPDB_LOOP_DEBUG", "0") == "1"
+
+# --- Application logger ---
+applogger = AppLogger()
+
+class LoopMonitor:
+
+    """
+
+    Measures event loop lag and reports what blocked the loop.
+
+    Parameters
+    ----------
+    loop : asyncio.AbstractEventLoop
+        The monitored event loop (must be running in the current thread when `start` is called).
+    interval : float, optional
+        Heartbeat interval in seconds.
+    threshold : float, optional
+        Lag (in seconds) above which the loop is considered blocked and a stack is captured.
+
+    Attributes
+    ----------
+    lags : list[float]
+        Lag samples of the current reporting window.
+
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, interval: float = LAG_INTERVAL, threshold: float = SLOW_CALLBACK_SECONDS):
+        self.loop = loop
+        self.interval = interval
+        self.threshold = threshold
+        self.lags = []
+        self._last_beat = time.monotonic()
+        self._loop_thread_id = None
+        self._reported_beat = None
+        self._task = None
+        self._stopped = threading.Event()
+
+    def start(self):
+
+        """Starts the heartbeat task and the watchdog thread."""
+
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._task = self.loop.create_task(self._heartbeat())
+        threading.Thread(target=self._watchdog, name="gpdb-loop-watchdog", daemon=True).start()
+
+        if LOOP_DEBUG:
+            self.loop.set_debug(True)
+            self.loop.slow_callback_duration = self.threshold
+            asyncio_logger = logging.getLogger("asyncio")
+            for handler in applogger.logger.handlers:
+                asyncio_logger.addHandler(handler)
+
+        applogger.info(f"Loop monitor started (interval {self.interval}s, threshold {self.threshold}s, asyncio debug {LOOP_DEBUG})")
+
+    def stop(self):
+        self._stopped.set()
+        if self._task:
+            self._task.cancel()
+
+    async def _heartbeat(self):
+        last_report = time.monotonic()
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - expected)
+            self._last_beat = now
+            self.lags.append(lag)
+            metrics.loop_lag.observe(lag)
+
+            if lag >= self.threshold:
+                applogger.warning(f"Event loop lagged {lag * 1000:.1f}ms behind schedule")
+
+            if now - last_report >= REPORT_SECONDS:
+                self.report()
+                last_report = now
+
+    def _watchdog(self):
+
+        """Captures the loop thread stack while the heartbeat is overdue (one report per stall)."""
+
+        while not self._stopped.wait(self.threshold / 2):
+            beat = self._last_beat
+            overdue = time.monotonic() - beat - self.interval
+            if overdue < self.threshold or self._reported_beat == beat:
+                continue
+            self._reported_beat = beat
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame else "<unavailable>"
+            try:
+                task = asyncio.current_task(self.loop)
+            except RuntimeError:
+                task = None
+            metrics.loop_blocked_total.inc()
+            applogger.warning(f"Event loop blocked for more than {overdue * 1000:.0f}ms "
+                              f"(task: {task.get_coro() if task else 'none'}), loop thread stack:\n{stack}")
+
+    def report(self):
+
+        """Logs a summary of the lag samples gathered since the last report, then resets the window."""
+
+        lags, self.lags = self.lags, []
+        if not lags:
+            return
+        lags.sort()
+        p = lambda q: lags[min(len(lags) - 1, int(len(lags) * q))] * 1000
+        applogger.info(f"Event loop lag over {len(lags)} beats : mean={statistics.fmean(lags) * 1000:.1f}ms "
+                       f"p50={p(0.50):.1f}ms p95={p(0.95):.1f}ms p99={p(0.99):.1f}ms max={lags[-1] * 1000:.1f}ms")
+
+_monitor = None
+
+def start(loop: asyncio.AbstractEventLoop) -> LoopMonitor:
+
+    """
+
+    Starts the process-wide loop monitor (only once, `on_ready` may fire several times).
+
+    """
+
+    global _monitor
+    if _monitor is None:
+        _monitor = LoopMonitor(loop)
+        _monitor.start()
+    return _monitor
@@ -0,0 +1,238 @@
+"""
+
+File: maintenance.py
+
+Description: Executor of the heavy maintenance jobs (sync, backup, restore) in a process pool.
+
+`database.synchronize_data`, `recovery.create_save` and `recovery.load_save` hold the
+interpreter for as long as they run, and used to run on the event loop or in the database
+worker, delaying every interaction meanwhile. `run()` executes them in a worker process
+instead, against that process' own connection to the database file, while the bot:
+    - Holds `database.database_lock` for the duration of the job, so queued writes never
+      interleave with it (they simply wait in `database.database_queue`)
+    - Keeps answering interactions: the database is switched to WAL journaling when the
+      pool starts, so lookups on the bot's connection are never blocked by the job's writes
+    - Receives the job's progress (`database.report_progress`) and its result
+    - Writes the worker processes' log records itself (they are sent through a queue):
+      only one process may write, and rotate, a log file
+    - Adds the job's SQL statistics to its own (`/sql_stats`), and writes the job's
+      statements to its workload capture when one is running (`/capture`); the workers
+      never write trace or capture files themselves
+
+Jobs run in the bot's process (as before) when the pool is disabled or when the database
+lives in memory (a worker process cannot see it). When the database operations are routed
+to the database service (`utilities.dbclient`), the bot awaits the job in the service,
+which runs it in its own maintenance pool (see `dbservice`).
+
+Settings are read from environment variables:
+    - GPDB_MAINTENANCE_PROCESSES : worker processes (default 1, 0 disables the pool)
+
+Author: cobalt
+
+"""
+
+# --- Standard imports ---
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import asyncio
+import multiprocessing
+import os
+import queue
+import time
+
+# --- Local imports ---
+import database
+from utilities.applogger import AppLogger
+from utilities import metrics
+from utilities import sqlstats
+from utilities import tracing
+from utilities import workload
+
+# --- Maintenance settings ---
+PROCESSES = int(os.getenv("GPDB_MAINTENANCE_PROCESSES", 1))
+PROGRESS_POLL_INTERVAL = 0.2
+
+# Job name -> (module, function) of the job, resolved in the process running it
+JOBS = {
+    "synchronize_data": ("database", "synchronize_data"),
+    "create_save": ("utilities.recovery", "create_save"),
+    "load_save": ("utilities.recovery", "load_save"),
+}
+
+# --- Application logger ---
+applogger = AppLogger()
+
+_pool = None
+_progress = None
+_logs = None
+_log_listener = None
+
+# Job running now : {"job", "started", "stage", "done", "total"}, None when idle
+current = None
+# Last completed job of each kind : {"duration", "outcome", "finished"}
+history: dict[str, dict] = {}
+
+# -------------------- WORKER PROCESSES --------------------
+
+def _initialize_worker(progress_queue, log_queue):
+    AppLogger.send_to(log_queue)
+    workload.forward_to(log_queue)
+    tracing.TRACING_ENABLED = False
+    database.READ_REPLICA = False
+    database.progress_callback = lambda stage, done, total: progress_queue.put((stage, done, total))
+    database.connect()
+
+def _resolve(job: str):
+    module_name, function_name = JOBS[job]
+    return getattr(__import__(module_name, fromlist=[function_name]), function_name)
+
+def _execute(job: str, args: tuple, capture: tuple[bool, bool]):
+
+    """
+
+    Runs a job (in a worker process, module functions are resolved there).
+
+    Its statements are captured following the bot's capture state `capture` (see
+    `workload.state`), and its SQL statistics are returned along with its result.
+
+    """
+
+    workload.follow(capture)
+    sqlstats.reset()
+    try:
+        return _resolve(job)(*args), sqlstats.snapshot()
+    finally:
+        workload.follow((False, False))
+
+# -------------------- BOT SIDE --------------------
+
+def enabled() -> bool:
+
+    """Whether jobs run in the process pool (see the module description)."""
+
+    return PROCESSES > 0 and not database.IN_MEMORY and database.connection is not None
+
+def start():
+
+    """
+
+    Starts the process pool, unless disabled, and switches the database to WAL journaling.
+
+    The worker processes are spawned (not forked from the bot and its threads) and started
+    at once, so the first job does not pay for their imports. Idempotent.
+
+    """
+
+    global _pool, _progress, _logs, _log_listener
+
+    if _pool is not None or not enabled():
+        return
+
+    mode = database.connection.execute("PRAGMA journal_mode = WAL;").fetchone()[0]
+    if mode != "wal":
+        applogger.warning(f"Database journal mode is {mode} : lookups may wait for maintenance commits")
+
+    context = multiprocessing.get_context("spawn")
+    _progress = context.Queue()
+    if _log_listener is None:
+        _logs = context.Queue()
+        _log_listener = AppLogger.receive_from(_logs)
+    _pool = ProcessPoolExecutor(PROCESSES, mp_context=context, initializer=_initialize_worker,
+                                initargs=(_progress, _logs))
+    for _ in range(PROCESSES):
+        _pool.submit(time.sleep, 0)
+    applogger.info(f"Maintenance pool started ({PROCESSES} process{'es' if PROCESSES > 1 else ''})")
+
+def shutdown():
+    global _pool, _log_listener
+    if _pool is not None:
+        _pool.shutdown(wait=True, cancel_futures=True)
+        _pool = None
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+def _drain_progress(progress) -> None:
+    while True:
+        try:
+            stage, done, total = _progress.get_nowait()
+        except queue.Empty:
+            return
+        current.update(stage=stage, done=done, total=total)
+        if progress is not None:
+            progress(stage, done, total)
+
+async def run(job: str, *args, progress=None):
+
+    """
+
+    Runs a maintenance job, in the process pool when enabled.
+
+    Parameters
+    ----------
+    job : str
+        One of `JOBS`.
+    *args
+        Arguments of the job function.
+    progress : callable, optional
+        Called on the event loop as progress(stage, done, total) when the job reports
+        progress (only for jobs run in the pool).
+
+    Returns
+    -------
+    Any
+        The job function's result.
+
+    Raises
+    ------
+    Exception
+        The exception raised by the job.
+
+    Example
+    -------
+    >>> backup_file = await maintenance.run("create_save")
+
+    """
+
+    global current, _pool
+
+    outcome = "ok"
+    async with database.database_lock:
+        began = time.perf_counter()
+        current = {"job": job, "started": time.time(), "stage": None, "done": 0, "total": 0}
+        try:
+            with tracing.span("maintenance", job=job):
+                if _pool is None:
+                    # Awaited on the service's connection when routed to it (see `database.call`)
+                    result = await database.call(_resolve(job), *args)
+                else:
+                    # The job's connection must not wait for a transaction left open on the bot's
+                    if database.connection.in_transaction:
+                        database.connection.commit()
+
+                    future = asyncio.get_running_loop().run_in_executor(_pool, _execute, job, args, workload.state())
+                    while not future.done():
+                        await asyncio.wait([future], timeout=PROGRESS_POLL_INTERVAL)
+                        _drain_progress(progress)
+                    result, statements = future.result()
+                    sqlstats.merge(statements)
+
+            # Only rebuilt when the job committed changes (see `database.replica_stale`)
+            if database.replica is not None:
+                database.refresh_replica()
+            return result
+        except BrokenProcessPool:
+            outcome = "error"
+            applogger.error(f"Maintenance process died during {job}, restarting the pool")
+            _pool = None
+            start()
+            raise
+        except BaseException:
+            outcome = "error"
+            raise
+        finally:
+            duration = time.perf_counter() - began
+            metrics.database_job_duration.observe(duration, job=job)
+            metrics.database_jobs_total.inc(job=job, outcome=outcome)
+            history[job] = {"duration": duration, "outcome": outcome, "finished": time.time()}
+            current = None
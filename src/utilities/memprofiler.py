@@ -0,0 +1,165 @@
+"""
+
+File: memprofiler.py
+
+Description: This module provides runtime-switchable memory diagnostics for the bot process.
+
+It provides:
+- Starting and stopping `tracemalloc` at runtime (tracing is off by default, so it costs
+  nothing until a moderator enables it)
+- On-demand and periodic snapshots, diffed against the previous one to report the top
+  allocation sites (by file and line)
+- Resident set size (RSS) sampling, kept as a short history to follow memory over time
+
+Settings are read from environment variables:
+    - GPDB_TRACEMALLOC_FRAMES : frames recorded per allocation when tracing (default 1)
+    - GPDB_MEMORY_HISTORY : number of RSS samples kept (default 96)
+
+Author: cobalt
+
+"""
+
+# --- Standard imports ---
+from collections import deque
+from datetime import datetime
+import os
+import resource
+import tracemalloc
+
+# --- Local imports ---
+from utilities.applogger import AppLogger
+
+# --- Memory diagnostics settings ---
+TRACEMALLOC_FRAMES = int(os.getenv("GPDB_TRACEMALLOC_FRAMES", 1))
+MEMORY_HISTORY = int(os.getenv("GPDB_MEMORY_HISTORY", 96))
+
+# --- Application logger ---
+applogger = AppLogger()
+
+rss_history = deque(maxlen=MEMORY_HISTORY)
+_last_snapshot = None
+
+def rss() -> int:
+
+    """
+
+    Returns the current resident set size of the process, in bytes.
+
+    Falls back to the peak RSS reported by `getrusage` where `/proc` is unavailable.
+
+    """
+
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def sample_rss() -> int:
+
+    """Records the current RSS in `rss_history` and returns it."""
+
+    value = rss()
+    rss_history.append((datetime.now(), value))
+    return value
+
+def is_tracing() -> bool:
+    return tracemalloc.is_tracing()
+
+def start(frames: int = TRACEMALLOC_FRAMES) -> bool:
+
+    """
+
+    Starts tracing allocations.
+
+    Returns
+    -------
+    bool
+        False if tracing was already running.
+
+    """
+
+    global _last_snapshot
+    if tracemalloc.is_tracing():
+        return False
+    tracemalloc.start(frames)
+    _last_snapshot = None
+    applogger.info(f"Memory tracing started ({frames} frame(s) per allocation)")
+    return True
+
+def stop() -> bool:
+
+    """
+
+    Stops tracing allocations and releases the traces.
+
+    Returns
+    -------
+    bool
+        False if tracing was not running.
+
+    """
+
+    global _last_snapshot
+    if not tracemalloc.is_tracing():
+        return False
+    tracemalloc.stop()
+    _last_snapshot = None
+    applogger.info("Memory tracing stopped")
+    return True
+
+def _format_size(size: int) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if abs(size) < 1024:
+            return f"{size:.1f}{unit}" if unit != "B" else f"{size}{unit}"
+        size /= 1024
+    return f"{size:.1f}GiB"
+
+def snapshot_report(top: int = 10) -> str:
+
+    """
+
+    Takes a snapshot and reports the top allocation sites.
+
+    The first snapshot after tracing starts reports the largest sites; the following ones
+    report the sites which grew the most since the previous snapshot.
+
+    Returns
+    -------
+    str
+        The report, or a notice if tracing is not running.
+
+    """
+
+    global _last_snapshot
+    current_rss = sample_rss()
+    if not tracemalloc.is_tracing():
+        return f"RSS {_format_size(current_rss)} (memory tracing is off)"
+
+    snapshot = tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    ))
+    traced, peak = tracemalloc.get_traced_memory()
+    lines = [f"RSS {_format_size(current_rss)} | traced {_format_size(traced)} (peak {_format_size(peak)})"]
+
+    if _last_snapshot is None:
+        lines.append(f"Top {top} allocation sites:")
+        for stat in snapshot.statistics("lineno")[:top]:
+            lines.append(f"  {_format_size(stat.size):>10} {stat.count:>8} blocks  {stat.traceback}")
+    else:
+        lines.append(f"Top {top} allocation changes since previous snapshot:")
+        for stat in snapshot.compare_to(_last_snapshot, "lineno")[:top]:
+            size_diff = ("+" if stat.size_diff >= 0 else "") + _format_size(stat.size_diff)
+            lines.append(f"  {size_diff:>10} {stat.count_diff:>+8} blocks  {stat.traceback}")
+
+    _last_snapshot = snapshot
+    return "\n".join(lines)
+
+def rss_report() -> str:
+
+    """Renders the RSS history, oldest sample first."""
+
+    if not rss_history:
+        return "No RSS sample recorded"
+    return "\n".join(f"{moment:%Y-%m-%d %H:%M:%S}  {_format_size(value)}" for moment, value in rss_history)
@@ -0,0 +1,331 @@
+"""
+
+File: metrics.py
+
+Description: This module provides a small in-process metrics registry for the Gameplay Database bot.
+
+It provides:
+- Counters, gauges and histograms, optionally labelled (e.g. per command or per job)
+- Rendering of all registered metrics in the Prometheus text exposition format
+- A lightweight HTTP endpoint (`/metrics`) served from a daemon thread, bound to localhost
+
+Updating a metric is a dictionary update under a lock, so instrumentation can be left
+on permanently. The endpoint is configured through environment variables:
+    - GPDB_METRICS_HOST : address the endpoint binds to (default 127.0.0.1)
+    - GPDB_METRICS_PORT : port of the endpoint (default 9108, 0 disables the endpoint)
+
+Example
+-------
+>>> from utilities import metrics
+>>> metrics.commands_total.inc(command="get_layout_by_name", outcome="ok")
+>>> with metrics.save_duration.time():
+...     recovery.create_save()
+
+$ curl http://127.0.0.1:9108/metrics
+
+Author: cobalt
+
+"""
+
+# --- Standard imports ---
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from contextlib import contextmanager
+import bisect
+import math
+import os
+import threading
+import time
+
+# --- Local imports ---
+from utilities.applogger import AppLogger
+
+# --- Endpoint settings ---
+METRICS_HOST = os.getenv("GPDB_METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("GPDB_METRICS_PORT", 9108))
+
+# Default histogram buckets (seconds), from sub-millisecond SQL to multi-second jobs
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# --- Application logger ---
+applogger = AppLogger()
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted(labels.items()))
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(key: tuple, extra: tuple = ()) -> str:
+    items = key + extra
+    if not items:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in items) + "}"
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+# -------------------- METRIC TYPES --------------------
+
+class Metric:
+
+    """
+
+    Base class for all metrics.
+
+    Parameters
+    ----------
+    name : str
+        Metric name, following Prometheus conventions (e.g. `gpdb_commands_total`).
+    documentation : str
+        Help text exposed with the metric.
+
+    """
+
+    type_ = "untyped"
+
+    def __init__(self, name: str, documentation: str):
+        self.name = name
+        self.documentation = documentation
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def samples(self):
+
+        """Yields (suffix, label key, extra labels, value) tuples for rendering."""
+
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield "", key, (), value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_}"]
+        for suffix, key, extra, value in self.samples():
+            lines.append(f"{self.name}{suffix}{_format_labels(key, extra)} {_format_value(value)}")
+        return lines
+
+class Counter(Metric):
+
+    """Monotonically increasing value (e.g. number of commands handled)."""
+
+    type_ = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        return self._values.get(_label_key(labels), 0)
+
+class Gauge(Metric):
+
+    """
+
+    Value that can go up and down (e.g. queue depth).
+
+    A gauge can also be bound to a callback with `set_function`, in which case its value
+    is read at scrape time and costs nothing between scrapes.
+
+    """
+
+    type_ = "gauge"
+
+    def __init__(self, name: str, documentation: str):
+        super().__init__(name, documentation)
+        self._function = None
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def set_function(self, function):
+        self._function = function
+
+    def get(self, **labels) -> float:
+        if self._function is not None and not labels:
+            return self._function()
+        return self._values.get(_label_key(labels), 0)
+
+    def samples(self):
+        if self._function is not None:
+            yield "", (), (), self._function()
+            return
+        yield from super().samples()
+
+class Histogram(Metric):
+
+    """
+
+    Distribution of observed values (e.g. durations in seconds) over fixed buckets.
+
+    Parameters
+    ----------
+    buckets : tuple[float], optional
+        Upper bounds of the buckets, in increasing order. `+Inf` is added automatically.
+
+    """
+
+    type_ = "histogram"
+
+    def __init__(self, name: str, documentation: str, buckets: tuple = DEFAULT_BUCKETS):
+        super().__init__(name, documentation)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = _label_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+
+        """Context manager observing the duration of its body, in seconds."""
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels) -> int:
+        state = self._values.get(_label_key(labels))
+        return state[2] if state else 0
+
+    def samples(self):
+        with self._lock:
+            items = [(key, (list(state[0]), state[1], state[2])) for key, state in self._values.items()]
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                yield "_bucket", key, (("le", _format_value(bound)),), cumulative
+            yield "_sum", key, (), total
+            yield "_count", key, (), count
+
+# -------------------- REGISTRY --------------------
+
+class Registry:
+
+    """Collection of metrics rendered together by the HTTP endpoint."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+
+        """Registers a metric, or returns the already registered one with the same name."""
+
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, documentation: str) -> Counter:
+        return self.register(Counter(name, documentation))
+
+    def gauge(self, name: str, documentation: str) -> Gauge:
+        return self.register(Gauge(name, documentation))
+
+    def histogram(self, name: str, documentation: str, buckets: tuple = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, buckets))
+
+    def render(self) -> str:
+
+        """Renders every registered metric in the Prometheus text exposition format."""
+
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+registry = Registry()
+
+# -------------------- BOT METRICS --------------------
+
+commands_total = registry.counter("gpdb_commands_total", "Application commands handled, by command and outcome")
+command_duration = registry.histogram("gpdb_command_duration_seconds", "Time from interaction creation to command completion")
+database_queue_depth = registry.gauge("gpdb_database_queue_depth", "Jobs waiting in database.database_queue")
+database_jobs_total = registry.counter("gpdb_database_jobs_total", "Jobs executed by database_worker, by job and outcome")
+database_job_duration = registry.histogram("gpdb_database_job_duration_seconds", "Execution time of database_worker jobs")
+database_lock_wait = registry.histogram("gpdb_database_lock_wait_seconds", "Time database_worker jobs waited for database_lock")
+save_duration = registry.histogram("gpdb_save_duration_seconds", "Duration of recovery.create_save, excluding the database lock wait")
+replica_refresh_duration = registry.histogram("gpdb_replica_refresh_duration_seconds", "Duration of database.refresh_replica copies")
+query_aborts_total = registry.counter("gpdb_query_aborts_total", "Database calls aborted for exceeding their query budget")
+loop_lag = registry.histogram("gpdb_event_loop_lag_seconds", "Delay of the loop monitor heartbeat behind schedule")
+loop_blocked_total = registry.counter("gpdb_event_loop_blocked_total", "Stalls of the event loop reported by the loop monitor")
+scheduler_job_duration = registry.histogram("gpdb_scheduler_job_duration_seconds", "Duration of the scheduled background jobs, by job")
+scheduler_runs_total = registry.counter("gpdb_scheduler_runs_total", "Runs of the scheduled background jobs, by job and outcome (ok, error, skipped)")
+
+# -------------------- HTTP ENDPOINT --------------------
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+_server = None
+
+def start_http_server(host: str = METRICS_HOST, port: int = METRICS_PORT):
+
+    """
+
+    Starts the metrics endpoint in a daemon thread (only once per process).
+
+    Parameters
+    ----------
+    host : str, optional
+        Address to bind to. Defaults to `GPDB_METRICS_HOST` (localhost).
+    port : int, optional
+        Port to bind to. Defaults to `GPDB_METRICS_PORT`; 0 disables the endpoint.
+
+    Returns
+    -------
+    ThreadingHTTPServer | None
+        The running server, or None if disabled or if the port could not be bound.
+
+    """
+
+    global _server
+
+    if _server is not None or not port:
+        return _server
+
+    try:
+        _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    except OSError as e:
+        applogger.error(f"Failed to start metrics endpoint on {host}:{port} : {e}")
+        return None
+
+    _server.daemon_threads = True
+    threading.Thread(target=_server.serve_forever, name="gpdb-metrics", daemon=True).start()
+    applogger.info(f"Metrics endpoint listening on http://{host}:{port}/metrics")
+    return _server
@@ -0,0 +1,111 @@
+"""
+
+File: profiler.py
+
+Description: This module provides time-bounded profiling sessions of the running bot.
+
+It provides:
+- `profile_for`, which runs `cProfile` on the event loop thread for a given duration
+- Helpers to render a sorted text summary and the raw `.prof` dump of a session
+
+Since every cog, view and the `database_worker` task run on the event loop thread,
+a session started from a command captures all of them. Only one session can run at
+a time.
+
+`cProfile`, `pstats` and `marshal` are imported by the functions using them, so loading
+the diagnostics cog does not pay for them.
+
+Author: cobalt
+
+"""
+
+# --- Standard imports ---
+import asyncio
+import io
+import time
+
+# --- Local imports ---
+from utilities.applogger import AppLogger
+from exceptions.custom_exceptions import ProfilerBusy
+
+# --- Session settings ---
+MAX_PROFILE_SECONDS = 300
+SORT_KEYS = ("cumulative", "tottime", "calls")
+
+# --- Application logger ---
+applogger = AppLogger()
+
+_session_lock = asyncio.Lock()
+
+async def profile_for(seconds: float) -> "cProfile.Profile":
+
+    """
+
+    Profiles the event loop thread for the given duration.
+
+    Parameters
+    ----------
+    seconds : float
+        Duration of the session, clamped to [1, MAX_PROFILE_SECONDS].
+
+    Returns
+    -------
+    cProfile.Profile
+        The finished (disabled) profiler. Its `duration` attribute holds the measured
+        length of the session, in seconds.
+
+    Raises
+    ------
+    ProfilerBusy
+        If another session is already running.
+
+    """
+
+    if _session_lock.locked():
+        raise ProfilerBusy("A profiling session is already running")
+
+    import cProfile
+
+    seconds = min(max(seconds, 1), MAX_PROFILE_SECONDS)
+    async with _session_lock:
+        profiler = cProfile.Profile()
+        applogger.info(f"Profiling session started for {seconds}s")
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            profiler.disable()
+            profiler.duration = time.perf_counter() - started
+        applogger.info("Profiling session finished")
+    return profiler
+
+def summary(profiler: "cProfile.Profile", top: int = 25, sort: str = "cumulative") -> str:
+
+    """
+
+    Renders the top N functions of a session, sorted by `sort` (see `SORT_KEYS`).
+
+    """
+
+    import pstats
+
+    buffer = io.StringIO()
+    stats = pstats.Stats(profiler, stream=buffer)
+    stats.strip_dirs().sort_stats(sort).print_stats(top)
+    return buffer.getvalue()
+
+def raw_dump(profiler: "cProfile.Profile") -> bytes:
+
+    """
+
+    Returns the raw profile data, in the format written by `cProfile.Profile.dump_stats`.
+
+    The file can be loaded with `pstats.Stats(path)` or visualized with snakeviz.
+
+    """
+
+    import marshal
+
+    profiler.create_stats()
+    return marshal.dumps(profiler.stats)
@@ -16,8 +16,8 @@ Author: cobalt
 
 # --- Standard imports ---
 from pathlib import Path
-import sqlite3
 import io
+import sqlite3
 import database
 from datetime import datetime
 
@@ -27,6 +27,9 @@ from utilities.applogger import AppLogger
 # --- Application logger ---
 applogger = AppLogger()
 
+# --- Backup directory ---
+SAVE_DIR = Path(__file__).parent.parent.parent / "saves"
+
 def create_save():
 
     """
@@ -34,11 +37,15 @@ def create_save():
     Creates a full SQL backup of the current database.
 
     This function exports the entire content and structure of the
-    'gpdb.db' SQLite database to a timestamped `.sql` file
-    located in the 'saves/' directory.
+    database (`GPDB_DATABASE`, see `database`) to a timestamped `.sql`
+    file located in the 'saves/' directory.
+
+    The dump goes through the shared connection of `database`, which
+    also works when the database lives in memory.
 
     The backup file is created using SQLite's `iterdump()` method,
-    ensuring a complete and restorable snapshot.
+    ensuring a complete and restorable snapshot. The schema version
+    (`PRAGMA user_version`) is appended to the dump.
 
     File naming convention:
         gpdb-backupYYYY-MM-DDHHMMSS.sql
@@ -46,6 +53,11 @@ def create_save():
     Example:
         gpdb-backup2025-10-14213045.sql
 
+    Returns
+    -------
+    Path
+        Path of the created backup file.
+
     Side Effects
     ------------
     - Creates the 'saves/' directory if it doesn't exist.
@@ -58,19 +70,24 @@ def create_save():
         If an issue occurs during the database dump.
 
     """
-    save_dir = Path(__file__).parent.parent.parent / "saves"
+    save_dir = SAVE_DIR
     save_dir.mkdir(parents=True, exist_ok=True)
 
     timestamp = datetime.today().strftime("%Y-%m-%d%H%M%S")
     backup_file = save_dir / f"gpdb-backup{timestamp}.sql"
 
-    connection = sqlite3.connect("gpdb.db")
+    connection = database.connect()
     with io.open(backup_file, "w", encoding="utf-8") as p:
-        for line in connection.iterdump():
+        for count, line in enumerate(connection.iterdump(), 1):
             p.write('%s\n' % line)
+            if count % 10000 == 0:
+                database.report_progress("dump", count)
+        # iterdump() does not export the schema version
+        version = connection.execute("PRAGMA user_version;").fetchone()[0]
+        p.write(f"PRAGMA user_version = {version};\n")
 
-    connection.close()
     applogger.info(f"Save created at {backup_file}")
+    return backup_file
 
 def load_save(filename):
 
@@ -79,8 +96,8 @@ def load_save(filename):
     Loads a saved database backup (.sql) into the current database.
 
     This function reads a backup SQL file from the 'saves/' directory,
-    clears the current database, and restores all data and schema
-    from the provided backup file.
+    restores it into an in-memory staging database, then replaces the
+    current database with it in a single step.
 
     Parameters
     ----------
@@ -90,31 +107,60 @@ def load_save(filename):
     Behavior
     --------
     - Reads SQL commands from the backup file.
-    - Clears existing database tables using `database.clear()`.
-    - Executes the backup SQL script to restore all data.
+    - Executes the backup SQL script in the staging database, where foreign
+      keys are not checked (tables reference tables created later in the dump).
+    - Migrates the staged schema to the current version (`database.initialize`).
+    - Copies the staging database over the current one with SQLite's backup
+      API, in one write transaction: if any step fails, the current data is
+      left untouched. The staging database is not bound by the query budgets.
 
     Side Effects
     ------------
     - Modifies the current database.
     - Logs restoration status and errors.
 
-    Raises
-    ------
-    FileNotFoundError
-        If the specified backup file does not exist.
+    Returns
+    -------
+    bool
+        Whether the backup was restored (False if the file does not exist, which is
+        logged rather than raised).
 
     """
 
-    save_dir = Path(__file__).parent.parent.parent / "saves"
-    file_path = save_dir / filename
+    file_path = SAVE_DIR / filename
 
     try:
         with open(file_path, "r", encoding="utf-8") as f:
             queries = f.read()
 
-        database.clear()
-        database.execute_queries(queries)
+        connection = database.connect()
+        staging = sqlite3.connect(":memory:")
+        try:
+            # The backup API only copies between databases of the same page size
+            page_size = connection.execute("PRAGMA page_size;").fetchone()[0]
+            staging.execute(f"PRAGMA page_size = {page_size};")
+
+            database.report_progress("restore", 0, 3)
+            staging.executescript(queries)
+
+            # Backups made before schema versioning, or by an older schema, are migrated
+            database.report_progress("migrate", 1, 3)
+            database.initialize(staging)
+
+            # The copy fails while a transaction is open on the destination connection
+            database.report_progress("replace", 2, 3)
+            if connection.in_transaction:
+                connection.commit()
+            staging.backup(connection)
+        finally:
+            staging.close()
+
+        # The backup API bypasses `total_changes` and `data_version` of the destination
+        if database.replica is not None:
+            database.refresh_replica(force=True)
         applogger.debug(f"Retrieved data from {filename}")
+        return True
             
     except FileNotFoundError:
         applogger.error("Failed to retrieve data: the savefile was not found")
+        return False
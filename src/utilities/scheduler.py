@@ -0,0 +1,434 @@
+"""
+
+File: scheduler.py
+
+Description: Scheduler of the bot's periodic background jobs (sync, backups, checkpoints,
+cache snapshots, database optimization, prefetching, log rotation...).
+
+It provides:
+- Jobs declared with a fixed interval (`every`, in seconds) or a cron expression
+  (`cron`, "minute hour day month weekday", supporting `*`, lists, ranges and steps)
+- Jitter: a random delay of up to `jitter` seconds is added before every run (and before
+  the first run of interval jobs), so jobs declared together do not fire together
+- Single-flight runs: a job never overlaps itself; a run due (or triggered) while the
+  previous one is still running is skipped and counted
+- Per-job accounting (runs, failures, last and average duration, share of the uptime spent
+  running, last error), also exported through `metrics`, so operators can see what the
+  background work is costing (`/jobs`)
+- Pausing, resuming and triggering jobs at runtime
+
+Interval jobs run `every` seconds after the end of their previous run. Functions may be
+coroutine functions or plain functions; plain functions run on the event loop unless the
+job is declared with `thread=True` (blocking I/O, e.g. network calls or compression).
+
+Settings are read from environment variables:
+    - GPDB_SCHEDULER_PAUSED : comma-separated jobs paused at startup (e.g. "optimize,youtube_prefetch")
+
+Example
+-------
+>>> from utilities.scheduler import scheduler
+>>> scheduler.add("backup", backup_function, every=300, jitter=30)
+>>> scheduler.add("optimize", database_optimize, cron="30 4 * * *", jitter=600)
+>>> scheduler.start()
+
+Author: cobalt
+
+"""
+
+# --- Standard imports ---
+from datetime import datetime, timedelta
+import asyncio
+import inspect
+import os
+import random
+import time
+
+# --- Local imports ---
+from utilities.applogger import AppLogger
+from utilities import metrics
+
+# --- Scheduler settings ---
+PAUSED_AT_STARTUP = {name.strip() for name in os.getenv("GPDB_SCHEDULER_PAUSED", "").split(",") if name.strip()}
+
+# --- Application logger ---
+applogger = AppLogger()
+
+# -------------------- CRON EXPRESSIONS --------------------
+
+# (lowest, highest) value of each field of a cron expression
+_CRON_FIELDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+def _parse_cron_field(field: str, lowest: int, highest: int) -> set[int]:
+    values = set()
+    for part in field.split(","):
+        part, _, step = part.partition("/")
+        step = int(step) if step else 1
+        if part == "*":
+            start, end = lowest, highest
+        elif "-" in part:
+            start, end = (int(value) for value in part.split("-", 1))
+        else:
+            start = int(part)
+            end = highest if step > 1 else start
+        if step < 1 or start < lowest or end > highest or start > end:
+            raise ValueError(f"Invalid cron field '{field}' (values {lowest}-{highest})")
+        values.update(range(start, end + 1, step))
+    return values
+
+class CronSchedule:
+
+    """
+
+    Parsed cron expression ("minute hour day month weekday", weekday 0-6 from Sunday, 7 is
+    also Sunday). As in cron, when both the day of month and the weekday are restricted, a
+    day matching either of them matches.
+
+    Parameters
+    ----------
+    expression : str
+        Cron expression, e.g. "*/15 * * * *" or "30 4 * * 1-5".
+
+    Raises
+    ------
+    ValueError
+        If the expression is malformed.
+
+    Example
+    -------
+    >>> CronSchedule("30 4 * * *").next_after(datetime(2025, 10, 14, 21, 45))
+    datetime.datetime(2025, 10, 15, 4, 30)
+
+    """
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression '{expression}' must have 5 fields")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, weekdays = (
+            _parse_cron_field(field, lowest, highest) for field, (lowest, highest) in zip(fields, _CRON_FIELDS))
+        self.weekdays = {weekday % 7 for weekday in weekdays}
+        self.any_day = fields[2] == "*"
+        self.any_weekday = fields[4] == "*"
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day = moment.day in self.days
+        weekday = (moment.weekday() + 1) % 7 in self.weekdays
+        if self.any_day or self.any_weekday:
+            return day and weekday
+        return day or weekday
+
+    def next_after(self, moment: datetime) -> datetime:
+
+        """Returns the first matching minute strictly after `moment` (local time)."""
+
+        moment = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = moment + timedelta(days=366 * 5)
+        while moment < limit:
+            if moment.month not in self.months:
+                moment = (moment.replace(day=1) + timedelta(days=32)).replace(day=1, hour=0, minute=0)
+            elif not self._day_matches(moment):
+                moment = (moment + timedelta(days=1)).replace(hour=0, minute=0)
+            elif moment.hour not in self.hours:
+                moment = (moment + timedelta(hours=1)).replace(minute=0)
+            elif moment.minute not in self.minutes:
+                moment += timedelta(minutes=1)
+            else:
+                return moment
+        raise ValueError(f"Cron expression '{self.expression}' never matches")
+
+# -------------------- JOBS --------------------
+
+class Job:
+
+    """
+
+    Periodic job and its accounting.
+
+    Attributes
+    ----------
+    name : str
+        Name of the job (used by `/jobs` and as the `job` label of the metrics).
+    function : callable
+        Called without arguments on each run.
+    every : float | None
+        Interval between the end of a run and the start of the next one, in seconds.
+    cron : CronSchedule | None
+        Schedule of the job, when declared with a cron expression.
+    jitter : float
+        Maximum random delay added before each run, in seconds.
+    paused : bool
+        Whether scheduled runs are skipped (manual runs still happen).
+    runs, failures, skipped : int
+        Completed runs (failed ones included), failed runs, and runs skipped because the
+        previous one was still running.
+    last_duration, total_duration, max_duration : float
+        Durations of the runs, in seconds.
+    last_started, next_run : float | None
+        Start of the last run and next scheduled run (Unix timestamps).
+    last_error : str | None
+        Error of the last failed run.
+
+    """
+
+    def __init__(self, name: str, function, every: float = None, cron: str = None, jitter: float = 0,
+                 thread: bool = False):
+        self.name = name
+        self.configure(function, every=every, cron=cron, jitter=jitter, thread=thread)
+        self.paused = name in PAUSED_AT_STARTUP
+
+        self.running = False
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0
+        self.last_duration = 0.0
+        self.total_duration = 0.0
+        self.max_duration = 0.0
+        self.last_started = None
+        self.last_outcome = None
+        self.last_error = None
+        self.next_run = None
+
+    @property
+    def schedule(self) -> str:
+        return f"every {self.every:g}s" if self.cron is None else f"cron {self.cron.expression}"
+
+    @property
+    def average_duration(self) -> float:
+        return self.total_duration / self.runs if self.runs else 0.0
+
+    def next_delay(self) -> float:
+
+        """Returns the delay until the next run, jitter included."""
+
+        jitter = random.uniform(0, self.jitter) if self.jitter > 0 else 0.0
+        if self.cron is not None:
+            return max(0.0, self.cron.next_after(datetime.now()).timestamp() - time.time()) + jitter
+        # Interval jobs which never ran only wait for their jitter
+        return jitter if self.last_started is None else self.every + jitter
+
+    def configure(self, function, every: float = None, cron: str = None, jitter: float = 0, thread: bool = False):
+
+        """Sets the function and schedule of the job (see `Scheduler.add`)."""
+
+        if (every is None) == (cron is None):
+            raise ValueError(f"Job '{self.name}' needs either an interval or a cron expression")
+        if every is not None and every <= 0:
+            raise ValueError(f"Job '{self.name}' needs a positive interval")
+        self.cron = CronSchedule(cron) if cron is not None else None
+        self.function = function
+        self.every = every
+        self.jitter = jitter
+        self.thread = thread
+
+class Scheduler:
+
+    """
+
+    Runs the declared jobs, each in its own asyncio task.
+
+    Example
+    -------
+    >>> scheduler = Scheduler()
+    >>> scheduler.add("sync", sync_function, every=5, jitter=1)
+    >>> scheduler.start()
+    >>> await scheduler.trigger("sync")
+
+    """
+
+    def __init__(self):
+        self.jobs: dict[str, Job] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+        self.started_at = time.time()
+
+    def add(self, name: str, function, every: float = None, cron: str = None, jitter: float = 0,
+            thread: bool = False) -> Job:
+
+        """
+
+        Declares a job (or redeclares it, e.g. from a reloaded cog, keeping its accounting).
+
+        Parameters
+        ----------
+        name : str
+            Name of the job.
+        function : callable
+            Coroutine function or function, called without arguments.
+        every : float, optional
+            Interval in seconds (exclusive with `cron`).
+        cron : str, optional
+            Cron expression (exclusive with `every`).
+        jitter : float, optional
+            Maximum random delay added before each run, in seconds.
+        thread : bool, optional
+            Runs a plain function in a thread instead of on the event loop.
+
+        Returns
+        -------
+        Job
+            The declared job. It is scheduled at once if the scheduler is running.
+
+        Raises
+        ------
+        ValueError
+            If the schedule is invalid.
+
+        """
+
+        job = self.jobs.get(name)
+        if job is None:
+            job = self.jobs[name] = Job(name, function, every=every, cron=cron, jitter=jitter, thread=thread)
+        else:
+            job.configure(function, every=every, cron=cron, jitter=jitter, thread=thread)
+
+        task = self._tasks.pop(name, None)
+        if task is not None:
+            task.cancel()
+            self._schedule(job)
+        return job
+
+    def get(self, name: str) -> Job | None:
+        return self.jobs.get(name)
+
+    def _schedule(self, job: Job):
+        self._tasks[job.name] = asyncio.get_running_loop().create_task(self._loop(job), name=f"gpdb-job-{job.name}")
+
+    def start(self):
+
+        """Schedules every declared job not scheduled yet. Idempotent."""
+
+        for job in self.jobs.values():
+            task = self._tasks.get(job.name)
+            if task is None or task.done():
+                self._schedule(job)
+        applogger.info(f"Scheduler started ({len(self.jobs)} jobs)")
+
+    def stop(self):
+
+        """Cancels the scheduled runs (a run in progress still completes)."""
+
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+        for job in self.jobs.values():
+            job.next_run = None
+
+    def is_running(self) -> bool:
+        return any(not task.done() for task in self._tasks.values())
+
+    async def _loop(self, job: Job):
+        while True:
+            delay = job.next_delay()
+            job.next_run = time.time() + delay
+            await asyncio.sleep(delay)
+            job.next_run = None
+            if not job.paused:
+                # Cancelling the schedule (stop, redeclaration) lets a run in progress finish
+                await asyncio.shield(self._run(job))
+
+    async def _run(self, job: Job) -> bool:
+
+        """Runs a job once unless it is already running; failures are logged, not raised."""
+
+        if job.running:
+            job.skipped += 1
+            metrics.scheduler_runs_total.inc(job=job.name, outcome="skipped")
+            applogger.warning(f"Job {job.name} skipped : its previous run is still running")
+            return False
+
+        job.running = True
+        job.last_started = time.time()
+        start = time.perf_counter()
+        outcome = "ok"
+        try:
+            if job.thread:
+                result = await asyncio.to_thread(job.function)
+            else:
+                result = job.function()
+            if inspect.isawaitable(result):
+                await result
+            job.last_error = None
+        except Exception as e:
+            outcome = "error"
+            job.failures += 1
+            job.last_error = f"{type(e).__name__} : {e}"
+            applogger.error(f"Job {job.name} failed : {job.last_error}")
+        finally:
+            duration = time.perf_counter() - start
+            job.running = False
+            job.runs += 1
+            job.last_outcome = outcome
+            job.last_duration = duration
+            job.total_duration += duration
+            job.max_duration = max(job.max_duration, duration)
+            metrics.scheduler_job_duration.observe(duration, job=job.name)
+            metrics.scheduler_runs_total.inc(job=job.name, outcome=outcome)
+        return True
+
+    # -------------------- CONTROL --------------------
+
+    def pause(self, name: str) -> bool:
+
+        """Pauses the scheduled runs of a job. Returns False if it was already paused."""
+
+        job = self.jobs[name]
+        if job.paused:
+            return False
+        job.paused = True
+        applogger.info(f"Job {name} paused")
+        return True
+
+    def resume(self, name: str) -> bool:
+
+        """Resumes the scheduled runs of a job. Returns False if it was not paused."""
+
+        job = self.jobs[name]
+        if not job.paused:
+            return False
+        job.paused = False
+        applogger.info(f"Job {name} resumed")
+        return True
+
+    async def trigger(self, name: str) -> bool:
+
+        """
+
+        Runs a job now (even if paused) and waits for the run.
+
+        Returns
+        -------
+        bool
+            False if the job was already running (the run is skipped).
+
+        """
+
+        applogger.info(f"Job {name} triggered")
+        return await self._run(self.jobs[name])
+
+    # -------------------- REPORTING --------------------
+
+    def report(self) -> str:
+
+        """
+
+        Returns a table of the jobs: schedule, state, runs, failures, last/average/max
+        duration, share of the uptime spent running, next run and last error.
+
+        """
+
+        uptime = max(time.time() - self.started_at, 1e-9)
+        now = time.time()
+        lines = [f"{'job':<17} {'schedule':<20} {'state':<8} {'runs':>6} {'fail':>5} {'skip':>5} "
+                 f"{'last':>9} {'avg':>9} {'max':>9} {'load':>6} {'next':>7}"]
+        for job in self.jobs.values():
+            state = "running" if job.running else "paused" if job.paused else "idle"
+            next_run = f"{max(0.0, job.next_run - now):.0f}s" if job.next_run is not None else "-"
+            lines.append(f"{job.name:<17} {job.schedule:<20} {state:<8} {job.runs:>6} {job.failures:>5} {job.skipped:>5} "
+                         f"{job.last_duration * 1000:>7.0f}ms {job.average_duration * 1000:>7.0f}ms "
+                         f"{job.max_duration * 1000:>7.0f}ms {job.total_duration / uptime:>6.2%} {next_run:>7}")
+            if job.last_error:
+                lines.append(f"    last error : {job.last_error[:120]}")
+        return "\n".join(lines)
+
+# Scheduler of the bot's jobs (module-level so that it survives cog reloads)
+scheduler = Scheduler()
@@ -0,0 +1,236 @@
+"""
+
+File: sqlstats.py
+
+Description: This module instruments the SQL statements executed through `database.py`.
+
+It provides:
+- `InstrumentedCursor`, a `sqlite3.Cursor` subclass used as the cursor factory of the
+  database connection, timing every `execute`/`executemany`/`executescript` call and
+  the fetches that follow it
+- Per-normalized-statement statistics: call count, total and max duration, rows returned
+- A slow query log: statements slower than a threshold are logged together with their
+  `EXPLAIN QUERY PLAN`
+- A top-N text report, used by the `/sql_stats` moderator command
+- The hook of the workload capture (`utilities.workload`)
+
+Settings are read from environment variables:
+    - GPDB_SLOW_QUERY_MS : slow query threshold in milliseconds (default 50)
+
+Author: cobalt
+
+"""
+
+# --- Standard imports ---
+from dataclasses import dataclass
+import os
+import re
+import sqlite3
+import threading
+import time
+
+# --- Local imports ---
+from utilities.applogger import AppLogger
+from utilities import workload
+
+# --- Slow query settings ---
+SLOW_QUERY_SECONDS = float(os.getenv("GPDB_SLOW_QUERY_MS", 50)) / 1000
+REPORT_SORT_KEYS = ("total", "max", "calls", "rows")
+
+# --- Application logger ---
+applogger = AppLogger()
+
+_WHITESPACE = re.compile(r"\s+")
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+@dataclass
+class StatementStats:
+
+    """Aggregated statistics of one normalized statement."""
+
+    statement: str
+    calls: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    rows: int = 0
+
+_stats: dict[str, StatementStats] = {}
+_stats_lock = threading.Lock()
+
+def normalize(sql: str) -> str:
+
+    """
+
+    Normalizes a statement so that executions differing only by literals or layout
+    are aggregated together.
+
+    Example
+    -------
+    >>> normalize("SELECT *  FROM requestlayout\\n WHERE rowid = 3")
+    'SELECT * FROM requestlayout WHERE rowid = ?'
+
+    """
+
+    return _LITERALS.sub("?", _WHITESPACE.sub(" ", sql).strip())
+
+def record(statement: str, elapsed: float, rows: int = 0, calls: int = 1, execution: float = None):
+
+    """
+
+    Adds `elapsed` seconds, `rows` and `calls` to a statement's statistics.
+
+    `execution` is the cumulative duration of the current execution (execute and the
+    fetches so far), used for the max duration; it defaults to `elapsed`.
+
+    """
+
+    execution = elapsed if execution is None else execution
+    with _stats_lock:
+        stats = _stats.get(statement)
+        if stats is None:
+            stats = _stats[statement] = StatementStats(statement)
+        stats.calls += calls
+        stats.total += elapsed
+        stats.rows += rows
+        if execution > stats.max:
+            stats.max = execution
+
+def merge(entries: list[StatementStats]):
+
+    """Adds statistics gathered by another process (a maintenance worker) to this process' ones."""
+
+    with _stats_lock:
+        for entry in entries:
+            stats = _stats.get(entry.statement)
+            if stats is None:
+                stats = _stats[entry.statement] = StatementStats(entry.statement)
+            stats.calls += entry.calls
+            stats.total += entry.total
+            stats.rows += entry.rows
+            if entry.max > stats.max:
+                stats.max = entry.max
+
+def snapshot() -> list[StatementStats]:
+    with _stats_lock:
+        return [StatementStats(**vars(stats)) for stats in _stats.values()]
+
+def reset():
+    with _stats_lock:
+        _stats.clear()
+
+def report(top: int = 10, sort: str = "total") -> str:
+
+    """
+
+    Renders the top N statements sorted by `sort` (see `REPORT_SORT_KEYS`).
+
+    Returns
+    -------
+    str
+        A fixed-width table, one statement per entry.
+
+    """
+
+    key = {"total": lambda s: s.total, "max": lambda s: s.max, "calls": lambda s: s.calls, "rows": lambda s: s.rows}[sort]
+    entries = sorted(snapshot(), key=key, reverse=True)[:top]
+    if not entries:
+        return "No statement recorded"
+
+    lines = [f"{'calls':>8} {'total ms':>10} {'avg ms':>8} {'max ms':>8} {'rows':>8}  statement"]
+    for s in entries:
+        lines.append(f"{s.calls:>8} {s.total * 1000:>10.1f} {s.total / s.calls * 1000:>8.2f} {s.max * 1000:>8.2f} {s.rows:>8}  {s.statement}")
+    return "\n".join(lines)
+
+class InstrumentedCursor(sqlite3.Cursor):
+
+    """
+
+    Cursor recording the duration and returned rows of every statement it executes.
+
+    Fetch time is added to the duration of the statement which produced the rows, and
+    the slow query check runs once the execution plus its fetches exceed the threshold.
+
+    Example
+    -------
+    >>> cursor = connection.cursor(factory=InstrumentedCursor)
+
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._current = None
+
+    def _begin(self, sql, parameters):
+        self._current = [normalize(sql), sql, parameters, 0.0, 0, False]
+
+    def _account(self, elapsed: float, rows: int = 0, calls: int = 0):
+        current = self._current
+        if current is None:
+            return
+        current[3] += elapsed
+        current[4] += rows
+        record(current[0], elapsed, rows, calls, current[3])
+        if current[3] >= SLOW_QUERY_SECONDS and not current[5]:
+            current[5] = True
+            self._log_slow(current)
+
+    def _log_slow(self, current):
+        statement, sql, parameters, elapsed = current[0], current[1], current[2], current[3]
+        plan = ""
+        if sql.lstrip().upper().startswith(_EXPLAINABLE) and isinstance(parameters, (tuple, list, dict)):
+            try:
+                rows = self.connection.execute(f"EXPLAIN QUERY PLAN {sql}", parameters).fetchall()
+                plan = "\n" + "\n".join(f"    {row[3]}" for row in rows)
+            except sqlite3.Error as e:
+                plan = f"\n    (plan unavailable : {e})"
+        applogger.warning(f"Slow query ({elapsed * 1000:.1f}ms) : {statement}{plan}")
+
+    def execute(self, sql, parameters=()):
+        self._begin(sql, parameters)
+        if workload.active:
+            workload.capture("execute", sql, parameters)
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._account(time.perf_counter() - start, calls=1)
+
+    def executemany(self, sql, seq_of_parameters):
+        self._begin(sql, None)
+        if workload.active:
+            seq_of_parameters = list(seq_of_parameters)
+            workload.capture("executemany", sql, seq_of_parameters)
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._account(time.perf_counter() - start, calls=1)
+
+    def executescript(self, sql_script):
+        self._current = ["<script>", sql_script, None, 0.0, 0, False]
+        if workload.active:
+            workload.capture("script", sql_script)
+        start = time.perf_counter()
+        try:
+            return super().executescript(sql_script)
+        finally:
+            self._account(time.perf_counter() - start, calls=1)
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._account(time.perf_counter() - start, rows=row is not None)
+        return row
+
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._account(time.perf_counter() - start, rows=len(rows))
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._account(time.perf_counter() - start, rows=len(rows))
+        return rows
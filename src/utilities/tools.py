@@ -10,7 +10,7 @@ It includes:
 - Moderator permission checking for Discord interactions
 
 External dependencies:
-    - requests (for YouTube API calls)
+    - requests (for YouTube API calls, imported on first use to keep startup fast)
     - discord.py (for Discord interactions)
     - re, os, json, urllib, pathlib
 
@@ -20,7 +20,6 @@ Author: cobalt
 
 # --- Standard imports ---
 import re
-import requests
 from urllib.parse import urlparse, parse_qs
 import os
 import discord
@@ -145,6 +144,9 @@ def get_youtube_id(url):
 
     """
 
+    if not url:
+        return None
+
     if "youtu.be" in url:
         return url.split("/")[-1]
     
@@ -207,6 +209,8 @@ def get_yt_channel_id(url: str):
     if not url:
         raise InvalidYouTubeURL("Url is none")
 
+    import requests
+
     parsed = urlparse(url)
     path_parts = parsed.path.strip("/").split("/")
 
@@ -253,6 +257,9 @@ def get_youtube_pp(channel_id: str):
         URL of the channel's profile image.
 
     """
+
+    import requests
+
     try:
         channel_api = f"https://www.googleapis.com/youtube/v3/channels?part=snippet&id={channel_id}&key={YOUTUBE_API_KEY}"
         channel_data = requests.get(channel_api).json()
@@ -261,14 +268,128 @@ def get_youtube_pp(channel_id: str):
     except Exception as e:
         raise InvalidYouTubeURL(f"An error occured during the process : {e}")
 
+# -------------------- MODERATOR UTILITIES --------------------
+
+class ModWhitelist:
+
+    """
+
+    In-memory view of the moderator whitelist (`mod/mod_whitelist.json`).
+
+    The whitelist is parsed once into frozensets so that permission checks are
+    a plain set lookup with no file I/O. The file is only read again when its
+    inode, mtime or size changes (see `refresh`) or when explicitly reloaded.
+
+    The JSON file holds a `mods` list of Discord user IDs and an optional
+    `roles` list of Discord role IDs; members holding any of those roles are
+    granted moderator permissions as well.
+
+    Parameters
+    ----------
+    path : str | Path
+        Path of the whitelist JSON file.
+
+    Attributes
+    ----------
+    mods : frozenset[int]
+        Whitelisted Discord user IDs.
+    roles : frozenset[int]
+        Discord role IDs granting moderator permissions.
+
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.mods = frozenset()
+        self.roles = frozenset()
+        self._signature = None
+        self._loaded = False
+
+    def _stat_signature(self):
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def load(self):
+
+        """
+
+        (Re)load the whitelist from disk unconditionally.
+
+        If the file is missing or malformed, the previous whitelist is kept
+        and the error is logged.
+
+        """
+
+        signature = self._stat_signature()
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            mods = frozenset(int(uid) for uid in data.get("mods", []))
+            roles = frozenset(int(rid) for rid in data.get("roles", []))
+        except (OSError, json.JSONDecodeError, AttributeError, TypeError, ValueError) as e:
+            # The signature is still recorded, so a bad edit is reported once, not on every refresh
+            applogger.error(f"Failed to load mod whitelist {self.path} : {e}")
+            self._signature = signature
+            self._loaded = True
+            return
+
+        self.mods = mods
+        self.roles = roles
+        self._signature = signature
+        self._loaded = True
+        applogger.info(f"Mod whitelist loaded ({len(self.mods)} users, {len(self.roles)} roles)")
+
+    def refresh(self) -> bool:
+
+        """
+
+        Reload the whitelist only if the file changed on disk.
+
+        Returns
+        -------
+        bool
+            True if the whitelist was reloaded.
+
+        """
+
+        signature = self._stat_signature()
+        if self._loaded and signature == self._signature:
+            return False
+        self.load()
+        return True
+
+    def is_mod(self, user) -> bool:
+
+        """
+
+        Returns whether a Discord user (or guild member) has moderator permissions.
+
+        Role grants are resolved from the member's cached roles, so no API call is made.
+
+        """
+
+        if not self._loaded:
+            self.load()
+        if user.id in self.mods:
+            return True
+        if self.roles:
+            return any(role.id in self.roles for role in getattr(user, "roles", ()))
+        return False
+
+mod_whitelist = ModWhitelist(Path(__file__).parent.parent.parent / "mod/mod_whitelist.json")
+
 async def check_mod(interaction: discord.Interaction):
 
     """
 
     Checks if a Discord user is authorized as a moderator.
 
-    Loads a JSON file containing a whitelist of moderator user IDs.
-    If the user is not found, a response is sent and an exception is raised.
+    Looks the user up in the cached moderator whitelist (`mod_whitelist`),
+    either by user ID or through one of their guild roles.
+    If the user is not found, an exception is raised.
 
     Parameters
     ----------
@@ -282,16 +403,10 @@ async def check_mod(interaction: discord.Interaction):
 
     Side Effects
     ------------
-    - Sends an ephemeral message to the user if unauthorized.
     - Logs an error through AppLogger.
 
     """
 
-    json_file = Path(__file__).parent.parent.parent / "mod/mod_whitelist.json"
-    with open(json_file, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    if interaction.user.id not in data.get("mods", []):
+    if not mod_whitelist.is_mod(interaction.user):
         applogger.error(f" Unauthorized user {interaction.user.name} tried to use mod command {interaction.command.name} (user was not found in the whitelist)")
         raise MissingModPermissions("Interaction user was not found in the mod whitelist")
-
-        
\ No newline at end of file
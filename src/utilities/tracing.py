@@ -0,0 +1,252 @@
+"""
+
+File: tracing.py
+
+Description: This module provides lightweight end-to-end tracing, from a Discord interaction
+to the SQLite commit of the job it queued.
+
+It provides:
+- A trace per interaction, created by `TracedCommandTree` (slash commands) or `start_trace`
+  (views), stored in a context variable so every coroutine of the handler sees it
+- `TracedQueue`, the `database_queue` implementation, which attaches the current trace and
+  the enqueue time to every item so the trace survives the hop into `database_worker`
+- `span` / `record` to time stages (dispatch, command, queue wait, lock wait, SQL, commit)
+- `TracedConnection`, timing commits as their own span
+- Export of finished spans as JSON lines, written by a background listener thread
+
+Tracing is disabled by default and configured through environment variables:
+    - GPDB_TRACING : set to 1 to enable tracing
+    - GPDB_TRACE_FILE : output file (default logs/traces.jsonl, rotated like latest.log)
+
+Example of exported span
+------------------------
+{"trace_id": "5f0c...", "span": "queue_wait", "start": 1760471103.12, "duration_ms": 3.2, "command": "request_layout"}
+
+Author: cobalt
+
+"""
+
+# --- Standard imports ---
+from collections import namedtuple
+from contextlib import contextmanager
+from pathlib import Path
+import asyncio
+import atexit
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sqlite3
+import time
+import uuid
+
+# --- Third-party imports ---
+import discord
+
+# --- Local imports ---
+from utilities.applogger import DeferredQueueHandler, CompressedRotatingFileHandler
+from utilities import workload
+
+# --- Tracing settings ---
+TRACING_ENABLED = os.getenv("GPDB_TRACING", "0") == "1"
+TRACE_FILE = Path(os.getenv("GPDB_TRACE_FILE", Path(__file__).parent.parent.parent / "logs" / "traces.jsonl"))
+
+_current_trace = contextvars.ContextVar("gpdb_trace", default=None)
+_exporter = None
+
+class Trace:
+
+    """
+
+    Identifier and common attributes of one traced interaction.
+
+    Attributes
+    ----------
+    trace_id : str
+        Random hexadecimal identifier shared by every span of the trace.
+    attributes : dict
+        Attributes copied into every exported span (e.g. command name, user id).
+
+    """
+
+    __slots__ = ("trace_id", "attributes", "started_at")
+
+    def __init__(self, **attributes):
+        self.trace_id = uuid.uuid4().hex
+        self.attributes = attributes
+        self.started_at = time.time()
+
+def _export(line: str):
+    global _exporter
+    if _exporter is None:
+        TRACE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        handler = CompressedRotatingFileHandler(TRACE_FILE)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+
+        log_queue = queue.SimpleQueue()
+        _exporter = logging.getLogger("gpdb.traces")
+        _exporter.propagate = False
+        _exporter.setLevel(logging.INFO)
+        _exporter.addHandler(DeferredQueueHandler(log_queue))
+
+        listener = logging.handlers.QueueListener(log_queue, handler)
+        listener.start()
+        atexit.register(listener.stop)
+    _exporter.info(line)
+
+# -------------------- TRACE CONTEXT --------------------
+
+def start_trace(interaction: discord.Interaction = None, **attributes) -> Trace | None:
+
+    """
+
+    Starts a new trace in the current context and records the "dispatch" span
+    (time between interaction creation and the bot handling it).
+
+    Returns
+    -------
+    Trace | None
+        The new trace, or None if tracing is disabled.
+
+    """
+
+    if not TRACING_ENABLED:
+        return None
+
+    if interaction is not None:
+        attributes.setdefault("command", interaction.command.name if interaction.command else None)
+        attributes.setdefault("user_id", interaction.user.id)
+    trace = Trace(**attributes)
+    _current_trace.set(trace)
+
+    if interaction is not None:
+        created = interaction.created_at.timestamp()
+        record("dispatch", created, time.time() - created, trace)
+    return trace
+
+def end_trace(outcome: str = "ok"):
+
+    """Records the "command" span of the current trace, from `start_trace` until now."""
+
+    trace = _current_trace.get()
+    if trace is not None:
+        record("command", trace.started_at, time.time() - trace.started_at, trace, outcome=outcome)
+
+def current() -> Trace | None:
+    return _current_trace.get()
+
+def attach(trace: Trace | None) -> contextvars.Token:
+
+    """Makes `trace` the current trace (e.g. in `database_worker`); returns a token for `detach`."""
+
+    return _current_trace.set(trace)
+
+def detach(token: contextvars.Token):
+    _current_trace.reset(token)
+
+# -------------------- SPANS --------------------
+
+def record(name: str, start: float, duration: float, trace: Trace | None = None, **attributes):
+
+    """
+
+    Exports a finished span.
+
+    Parameters
+    ----------
+    name : str
+        Span name (e.g. "queue_wait").
+    start : float
+        Wall-clock start time (seconds since epoch).
+    duration : float
+        Duration in seconds.
+    trace : Trace, optional
+        Trace of the span; defaults to the current trace. Nothing is exported without one.
+
+    """
+
+    trace = trace or _current_trace.get()
+    if trace is None:
+        return
+    data = {"trace_id": trace.trace_id, "span": name, "start": round(start, 6), "duration_ms": round(duration * 1000, 3)}
+    data.update(trace.attributes)
+    data.update(attributes)
+    _export(json.dumps(data, default=str))
+
+@contextmanager
+def span(name: str, **attributes):
+
+    """
+
+    Context manager timing its body as a span of the current trace.
+
+    The yielded dict can be filled with attributes known only at the end of the span.
+    Costs a context variable lookup when there is no current trace.
+
+    """
+
+    trace = _current_trace.get()
+    if trace is None:
+        yield attributes
+        return
+    start_wall, start = time.time(), time.perf_counter()
+    try:
+        yield attributes
+    finally:
+        record(name, start_wall, time.perf_counter() - start, trace, **attributes)
+
+# -------------------- INSTRUMENTED PRIMITIVES --------------------
+
+QueueEntry = namedtuple("QueueEntry", ("item", "trace", "enqueued_at"))
+
+class TracedQueue(asyncio.Queue):
+
+    """
+
+    `asyncio.Queue` wrapping each item into a `QueueEntry` with the producer's trace
+    and enqueue time (`time.perf_counter()`).
+
+    Producers put items unchanged; the consumer (`database_worker`) receives `QueueEntry`
+    objects and uses `entry.item`.
+
+    """
+
+    def put_nowait(self, item):
+        super().put_nowait(QueueEntry(item, _current_trace.get(), time.perf_counter()))
+
+class TracedConnection(sqlite3.Connection):
+
+    """
+
+    `sqlite3.Connection` recording every commit as a "commit" span of the current trace.
+
+    Commits are also recorded by the workload capture, so that replays keep the
+    transaction boundaries of the captured traffic.
+
+    """
+
+    def commit(self):
+        if workload.active:
+            workload.capture("commit")
+        with span("commit"):
+            super().commit()
+
+class TracedCommandTree(discord.app_commands.CommandTree):
+
+    """
+
+    Command tree starting a trace for every application command.
+
+    `interaction_check` runs in the same task as the command callback, so the trace
+    set there is the current trace for the whole handler. The handler's start time is
+    also kept in `interaction.extras["handler_started"]` (a `time.perf_counter()` value,
+    used by `AppLogger.debug_command`), whether tracing is enabled or not.
+
+    """
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        interaction.extras["handler_started"] = time.perf_counter()
+        start_trace(interaction)
+        return True
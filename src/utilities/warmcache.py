@@ -0,0 +1,251 @@
+"""
+
+File: warmcache.py
+
+Description: This module keeps the hot working set of the query commands across restarts.
+
+It provides:
+- Hit counting of the entities looked up by `QueryCog` (kind, name), so the most-queried
+  entities are known at any time
+- A cache of resolved YouTube metadata (channel avatar of artists), which otherwise costs
+  two YouTube Data API round-trips per `/get_artist_by_name`
+- A compact snapshot (gzip-compressed JSON) written periodically and on shutdown, and
+  reloaded at startup: entities are looked up again (which also warms SQLite's page
+  cache) and dropped if they disappeared; YouTube entries are dropped
+  once expired or when no artist references their URL anymore
+- A prefetch of the YouTube metadata of the most-queried artists, run periodically by the
+  scheduler, so their avatars are resolved (or refreshed before they expire) off the
+  command path
+
+Settings are read from environment variables:
+    - GPDB_WARM_CACHE_FILE : snapshot file (default cache/warm_cache.json.gz)
+    - GPDB_WARM_CACHE_ENTITIES : number of most-queried entities kept (default 500)
+    - GPDB_YOUTUBE_CACHE_TTL_HOURS : lifetime of resolved YouTube metadata (default 168)
+    - GPDB_YOUTUBE_PREFETCH : artists whose YouTube metadata is prefetched per run (default 50)
+
+Author: cobalt
+
+"""
+
+# --- Standard imports ---
+from pathlib import Path
+import gzip
+import json
+import os
+import time
+
+# --- Local imports ---
+from utilities.applogger import AppLogger
+from utilities import tools
+from exceptions.custom_exceptions import DataNotFound, DatabaseServiceError, InvalidYouTubeURL, QueryBudgetExceeded
+
+# --- Warm cache settings ---
+SNAPSHOT_FILE = Path(os.getenv("GPDB_WARM_CACHE_FILE", Path(__file__).parent.parent.parent / "cache" / "warm_cache.json.gz"))
+MAX_ENTITIES = int(os.getenv("GPDB_WARM_CACHE_ENTITIES", 500))
+YOUTUBE_TTL = float(os.getenv("GPDB_YOUTUBE_CACHE_TTL_HOURS", 168)) * 3600
+YOUTUBE_PREFETCH = int(os.getenv("GPDB_YOUTUBE_PREFETCH", 50))
+SNAPSHOT_VERSION = 2
+KINDS = ("creator", "layout", "collab", "music", "artist")
+
+# --- Application logger ---
+applogger = AppLogger()
+
+# (kind, name) -> hits
+_entities: dict[tuple[str, str], int] = {}
+# YouTube URL -> (avatar URL, resolution time)
+_youtube: dict[str, tuple[str, float]] = {}
+
+def record(kind: str, name: str):
+
+    """Counts a lookup of an entity."""
+
+    _entities[(kind, name)] = _entities.get((kind, name), 0) + 1
+
+def youtube_avatar(url: str) -> str:
+
+    """
+
+    Returns the avatar of the YouTube channel at `url`, resolved through the YouTube Data
+    API on a miss and cached for `GPDB_YOUTUBE_CACHE_TTL_HOURS`.
+
+    Raises
+    ------
+    InvalidYouTubeURL
+        If the channel or its avatar could not be resolved (failures are not cached).
+
+    """
+
+    cached = _youtube.get(url)
+    if cached is not None and time.time() - cached[1] < YOUTUBE_TTL:
+        return cached[0]
+
+    avatar = tools.get_youtube_pp(tools.get_yt_channel_id(url))
+    _youtube[url] = (avatar, time.time())
+    return avatar
+
+def hot_entities(top: int = MAX_ENTITIES) -> list[tuple[tuple[str, str], int]]:
+    return sorted(_entities.items(), key=lambda item: item[1], reverse=True)[:top]
+
+# -------------------- YOUTUBE PREFETCH --------------------
+
+async def prefetch_candidates(top: int = YOUTUBE_PREFETCH) -> list[str]:
+
+    """
+
+    Returns the YouTube URLs of the most-queried artists whose metadata is not cached or
+    expires within a tenth of its lifetime, most-queried first.
+
+    Looks the artists up through `database.call`, on the event loop.
+
+    """
+
+    import database
+
+    now = time.time()
+    urls = []
+    for (kind, name), _ in hot_entities():
+        if len(urls) >= top:
+            break
+        if kind != "artist":
+            continue
+        try:
+            url = (await database.call(database.get_artist_by_name, name))[0]["yt"]
+        except DataNotFound:
+            continue
+        cached = _youtube.get(url)
+        if url and url not in urls and (cached is None or now - cached[1] > YOUTUBE_TTL * 0.9):
+            urls.append(url)
+    return urls
+
+def prefetch_youtube(urls: list[str]) -> int:
+
+    """
+
+    Resolves the YouTube metadata of `urls` (see `prefetch_candidates`) into the cache.
+
+    Makes blocking YouTube Data API calls, so it should run in a thread.
+
+    Returns
+    -------
+    int
+        The number of URLs resolved.
+
+    """
+
+    resolved = 0
+    for url in urls:
+        try:
+            _youtube[url] = (tools.get_youtube_pp(tools.get_yt_channel_id(url)), time.time())
+            resolved += 1
+        except InvalidYouTubeURL as e:
+            applogger.debug(f"YouTube prefetch of {url} failed : {e}")
+    return resolved
+
+# -------------------- SNAPSHOT --------------------
+
+def save(path: Path = None) -> Path:
+
+    """
+
+    Writes the snapshot (most-queried entities and unexpired YouTube metadata) atomically.
+
+    Returns
+    -------
+    Path
+        The snapshot file.
+
+    """
+
+    path = Path(path or SNAPSHOT_FILE)
+    now = time.time()
+    snapshot = {
+        "version": SNAPSHOT_VERSION,
+        "saved_at": now,
+        "entities": [[kind, name, hits] for (kind, name), hits in hot_entities()],
+        "youtube": {url: list(value) for url, value in _youtube.items() if now - value[1] < YOUTUBE_TTL},
+    }
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_suffix(".tmp")
+    with gzip.open(temporary, "wt", encoding="utf-8") as f:
+        json.dump(snapshot, f, separators=(",", ":"))
+    os.replace(temporary, path)
+
+    applogger.debug(f"Warm cache saved ({len(snapshot['entities'])} entities, {len(snapshot['youtube'])} YouTube entries)")
+    return path
+
+def load(path: Path = None) -> dict:
+
+    """
+
+    Reloads a snapshot and validates it against the current database.
+
+    Each entity is looked up again through `database`, which warms SQLite's page cache for
+    the hot set; missing ones are dropped. Hit counts are halved so that entities which
+    stop being queried eventually leave the hot set.
+
+    Nothing is kept if the validation cannot complete (lookup over its query budget,
+    database service unavailable): the bot then starts with a cold cache.
+
+    Must run after `database.initialize()`.
+
+    Returns
+    -------
+    dict
+        Counts of valid and dropped entities and of kept YouTube entries.
+
+    """
+
+    import database
+
+    path = Path(path or SNAPSHOT_FILE)
+    summary = {"entities": 0, "dropped": 0, "youtube": 0}
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            snapshot = json.load(f)
+    except FileNotFoundError:
+        return summary
+    except (OSError, ValueError) as e:
+        applogger.error(f"Ignoring unreadable warm cache snapshot {path} : {e}")
+        return summary
+
+    if snapshot.get("version") != SNAPSHOT_VERSION:
+        applogger.info(f"Ignoring warm cache snapshot version {snapshot.get('version')}")
+        return summary
+
+    start = time.perf_counter()
+    entities, youtube = {}, {}
+    try:
+        for kind, name, hits in snapshot.get("entities", []):
+            if kind not in KINDS:
+                continue
+            try:
+                getattr(database, f"get_{kind}_by_name")(name)
+            except DataNotFound:
+                summary["dropped"] += 1
+                continue
+            summary["entities"] += 1
+            entities[(kind, name)] = max(1, hits // 2)
+
+        now = time.time()
+        referenced = {artist["yt"] for artist in database.get_artists() if artist["yt"]}
+        for url, (avatar, resolved_at) in snapshot.get("youtube", {}).items():
+            if url in referenced and now - resolved_at < YOUTUBE_TTL:
+                youtube[url] = (avatar, resolved_at)
+                summary["youtube"] += 1
+    except (QueryBudgetExceeded, DatabaseServiceError) as e:
+        applogger.warning(f"Starting with a cold cache, the warm cache snapshot could not be validated : {e}")
+        return {key: 0 for key in summary}
+
+    for key, hits in entities.items():
+        _entities.setdefault(key, hits)
+    for url, value in youtube.items():
+        _youtube.setdefault(url, value)
+
+    applogger.info(f"Warm cache loaded in {(time.perf_counter() - start) * 1000:.0f}ms : {summary['entities']} entities valid, "
+                   f"{summary['dropped']} dropped, {summary['youtube']} YouTube entries")
+    return summary
+
+def clear():
+    _entities.clear()
+    _youtube.clear()
@@ -0,0 +1,259 @@
+"""
+
+File: workload.py
+
+Description: This module captures the SQL workload executed through `database.py`, so it
+can be replayed offline by `benchmarks.replay`.
+
+It provides:
+- Opt-in capture of every statement and parameter set run by `sqlstats.InstrumentedCursor`,
+  and of every commit, as JSON lines written by a background listener thread
+- Optional redaction of personal data: text and blob parameters, and integers in the
+  Discord snowflake range, are replaced by keyed hashes (equal values keep equal tokens
+  within a capture), and scripts are dropped
+- Starting and stopping the capture at runtime (`/capture` moderator command)
+- Forwarding of the statements of the maintenance worker processes to the capture of the
+  bot, which alone writes the capture file (see `forward_to`)
+
+Capture is disabled by default and configured through environment variables:
+    - GPDB_WORKLOAD_CAPTURE : set to 1 to capture from startup
+    - GPDB_WORKLOAD_FILE : output file (default logs/workload.jsonl, rotated like latest.log)
+    - GPDB_WORKLOAD_REDACT : set to 1 to redact parameters
+    - GPDB_WORKLOAD_REDACT_KEY : hashing key of redacted values (default random per process)
+
+Example of captured statement
+-----------------------------
+{"ts": 1760471103.12, "kind": "execute", "sql": "SELECT * FROM layout WHERE name = ?;", "params": ["Bloodbath"]}
+
+Author: cobalt
+
+"""
+
+# --- Standard imports ---
+from pathlib import Path
+import atexit
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import logging.handlers
+import multiprocessing
+import os
+import queue
+import secrets
+import threading
+import time
+
+# --- Local imports ---
+from utilities.applogger import AppLogger, DeferredQueueHandler, CompressedRotatingFileHandler
+
+# --- Capture settings ---
+CAPTURE_FILE = Path(os.getenv("GPDB_WORKLOAD_FILE", Path(__file__).parent.parent.parent / "logs" / "workload.jsonl"))
+REDACT = os.getenv("GPDB_WORKLOAD_REDACT", "0") == "1"
+REDACT_KEY = os.getenv("GPDB_WORKLOAD_REDACT_KEY", "").encode("utf-8") or secrets.token_bytes(16)
+
+# Integers from this value on are Discord snowflakes (user and guild ids), not row ids or counts
+SNOWFLAKE_MIN = 2 ** 40
+
+# --- Application logger ---
+applogger = AppLogger()
+
+# Checked by `InstrumentedCursor` before every statement, keep it a plain module attribute
+active = False
+
+_lock = threading.Lock()
+_logger = None
+_listener = None
+_redact = REDACT
+
+def _token(value: bytes) -> str:
+    return hmac.new(REDACT_KEY, value, hashlib.sha256).hexdigest()[:16]
+
+def _encode(value):
+
+    """Converts a parameter to JSON, redacting it if enabled."""
+
+    if isinstance(value, str):
+        return f"redacted:{_token(value.encode('utf-8'))}" if _redact else value
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        value = bytes(value)
+        return {"blob": _token(value) if _redact else base64.b64encode(value).decode("ascii")}
+    if isinstance(value, int) and _redact and abs(value) >= SNOWFLAKE_MIN:
+        return SNOWFLAKE_MIN + int(_token(str(value).encode("utf-8")), 16) % SNOWFLAKE_MIN
+    return value
+
+def _encode_parameters(parameters):
+    if parameters is None:
+        return None
+    if isinstance(parameters, dict):
+        return {name: _encode(value) for name, value in parameters.items()}
+    return [_encode(value) for value in parameters]
+
+def decode(value):
+
+    """Converts a captured parameter back to its Python value (used by the replay tool)."""
+
+    if isinstance(value, dict) and "blob" in value:
+        try:
+            return base64.b64decode(value["blob"], validate=True)
+        except ValueError:
+            return value["blob"].encode("ascii")
+    return value
+
+# -------------------- CAPTURE CONTROL --------------------
+
+def start(path: Path = None, redact: bool = REDACT) -> bool:
+
+    """
+
+    Starts capturing statements.
+
+    Parameters
+    ----------
+    path : Path, optional
+        Output file. Defaults to `GPDB_WORKLOAD_FILE`.
+    redact : bool, optional
+        Whether parameters are redacted. Defaults to `GPDB_WORKLOAD_REDACT`.
+
+    Returns
+    -------
+    bool
+        False if a capture was already running.
+
+    """
+
+    global active, _logger, _listener, _redact
+
+    with _lock:
+        if active:
+            return False
+
+        path = Path(path or CAPTURE_FILE)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handler = CompressedRotatingFileHandler(path)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+
+        log_queue = queue.SimpleQueue()
+        _logger = logging.getLogger("gpdb.workload")
+        _logger.propagate = False
+        _logger.setLevel(logging.INFO)
+        _logger.handlers = [DeferredQueueHandler(log_queue)]
+
+        _listener = logging.handlers.QueueListener(log_queue, handler)
+        _listener.start()
+        _redact = redact
+        active = True
+
+    applogger.info(f"Workload capture started ({'redacted' if redact else 'raw'}) : {path}")
+    return True
+
+def stop() -> bool:
+
+    """
+
+    Stops capturing statements and flushes the capture file.
+
+    Returns
+    -------
+    bool
+        False if no capture was running.
+
+    """
+
+    global active, _listener
+
+    with _lock:
+        if not active:
+            return False
+        active = False
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+        # Statements still forwarded by a worker (see `forward_to`) are dropped
+        _logger.handlers = []
+
+    applogger.info("Workload capture stopped")
+    return True
+
+def is_capturing() -> bool:
+    return active
+
+def state() -> tuple[bool, bool]:
+
+    """Returns whether a capture is running and whether it is redacted, for `follow`."""
+
+    return active, _redact
+
+def forward_to(log_queue):
+
+    """
+
+    Routes the statements captured by this (child) process to `log_queue` instead of a
+    capture file of its own; the parent writes them to its capture (see
+    `AppLogger.receive_from`). The capture is then switched on and off with `follow`.
+
+    Parameters
+    ----------
+    log_queue : multiprocessing.Queue
+        Queue shared with the parent process.
+
+    """
+
+    global _logger
+
+    _logger = logging.getLogger("gpdb.workload")
+    _logger.propagate = False
+    _logger.setLevel(logging.INFO)
+    _logger.handlers = [logging.handlers.QueueHandler(log_queue)]
+
+def follow(parent_state: tuple[bool, bool]):
+
+    """Captures, or not, like the parent process whose `state()` is given (see `forward_to`)."""
+
+    global active, _redact
+
+    active, _redact = parent_state
+
+def capture(kind: str, sql: str = None, parameters=None):
+
+    """
+
+    Records one statement.
+
+    Parameters
+    ----------
+    kind : str
+        "execute", "executemany" (`parameters` is a list of parameter sets),
+        "script" or "commit".
+    sql : str, optional
+        Statement or script. Scripts are dropped when redacting, they embed their values.
+    parameters : optional
+        Parameters of the statement.
+
+    """
+
+    if not active:
+        return
+
+    data = {"ts": round(time.time(), 6), "kind": kind}
+    if kind == "script":
+        data["sql"] = None if _redact else sql
+    elif sql is not None:
+        data["sql"] = sql
+        if kind == "executemany":
+            data["params"] = [_encode_parameters(p) for p in parameters]
+        elif parameters:
+            data["params"] = _encode_parameters(parameters)
+
+    try:
+        _logger.info(json.dumps(data))
+    except (TypeError, ValueError) as e:
+        applogger.error(f"Failed to capture statement : {e}")
+
+# Child processes (maintenance workers) forward their statements instead, see `forward_to`
+if os.getenv("GPDB_WORKLOAD_CAPTURE", "0") == "1" and multiprocessing.parent_process() is None:
+    start()
+
+atexit.register(stop)
@@ -2,6 +2,7 @@ import discord
 import database
 
 from utilities.applogger import AppLogger
+from utilities import tracing
 from exceptions.custom_exceptions import DataNotFound
 
 applogger = AppLogger()
@@ -14,11 +15,15 @@ class ReviewRequestView(discord.ui.View):
         self.request_type = request_type
         self.request_id = request_id
 
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        tracing.start_trace(interaction, command=f"review_{self.request_type}")
+        return True
+
     @discord.ui.button(label="✅ Accept", style=discord.ButtonStyle.success)
     async def accept(self, interaction: discord.Interaction, button: discord.ui.Button):
 
         try:
-            details = database.get_request_details(self.request_type, self.request_id)
+            details = await database.call(database.get_request_details, self.request_type, self.request_id)
         except DataNotFound:
             await interaction.response.edit_message(content="**Failed** to fetch request details, check traceback for more info",
                                                      embed=None,
@@ -120,13 +125,15 @@ class ReviewRequestView(discord.ui.View):
                 applogger.error(f"Unknown request type {self.request_type}")
                 return
             
-        database.delete_request(self.request_type, self.request_id)
+        await database.database_queue.put((database.delete_request, (self.request_type, self.request_id), {}))
 
         await interaction.response.edit_message(content="✅ Request **accepted** and **processed!**", embed=None, view=None)
         applogger.info(f"Request {self.request_type} ID: {self.request_id} accepted by {interaction.user}")
+        tracing.end_trace("accepted")
 
     @discord.ui.button(label="❌ Reject", style=discord.ButtonStyle.danger)
     async def reject(self, interaction: discord.Interaction, button: discord.ui.Button):
-        database.delete_request(self.request_type, self.request_id)
+        await database.database_queue.put((database.delete_request, (self.request_type, self.request_id), {}))
         await interaction.response.edit_message(content="❌ Request **rejected** and **deleted.**", embed=None, view=None)
         applogger.warning(f"Request {self.request_type} #{self.request_id} rejected by {interaction.user}")
+        tracing.end_trace("rejected")